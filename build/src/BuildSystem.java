@@ -42,6 +42,22 @@ public class BuildSystem {
     addFile("diagnostic.py");
     addFile("check-for-unread.py");
     addFile("sequence.py");
+    addFile("buffer-decoder.py");
+    addFile("lazy.py");
+    addFile("tokenizer.py");
+    addFile("async-decoder.py");
+    addFile("parallel.py");
+    addFile("validate.py");
+    addFile("zero-copy.py");
+    addFile("projection.py");
+    addFile("push-decoder.py");
+    addFile("key-cache.py");
+    addFile("native.py");
+    addFile("schema.py");
+    addFile("chunk-sink.py");
+    addFile("decoder-stats.py");
+    addFile("encode-to.py");
+    addFile("freeze.py");
     addFile("clone.py");
     addFile("cotx.py");
     addFile("miscellaneous.py");
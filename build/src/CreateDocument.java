@@ -637,6 +637,41 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
       This is only meaningful in conjunction with
       <a href='#common.checkforunread'>check_for_unread()</a>.""";
 
+  // encode_to()
+
+  static final String ENCODETO_DESCR = """
+      Encode <kbd>self</kbd> to a binary stream.
+      <div style='margin-top:0.5em'>
+      Unlike <a href='#common.encode'>encode()</a>, the encoding is not
+      collected in a single buffer, but is written in chunks,
+      keeping memory usage independent of the size of the object.
+      The encoding is identical to the one returned by
+      <a href='#common.encode'>encode()</a>.</div>
+      <div style='margin-top:0.5em'>
+      See also <a href='#decoder.cbor.initsequencewriter'>CBOR.init_sequence_writer()</a>.</div>""";
+
+  static final String ENCODETO_P1_DESCR = """
+      Stream having a <code>write()</code> method, like a file
+      opened in binary mode.""";
+
+  static final String CHUNKSIZE_P_DESCR = """
+      Optional: approximate size of each <code>write()</code>.
+      The default setting is <code>0x10000</code>.""";
+
+  static final String ENCODETO_RETURN_DESCR = """
+      The number of bytes written.""";
+
+  // freeze()
+
+  static final String FREEZE_DESCR = """
+      Make <kbd>self</kbd> as well as possible child objects immutable.
+      <div style='margin-top:0.5em'>
+      Frozen arrays, maps, and tags keep their encoding, which is reused by
+      <a href='#common.encode'>encode()</a>, <a href='#common.equals'>equals()</a>,
+      <a href='#common.clone'>clone()</a>, and by enclosing objects.
+      Any attempt to update a frozen object causes a
+      <a href='#main.errors'>CBOR.Exception</a> to be thrown.</div>""";
+
   // check_for_unread()
 
   static final String CHECK4_DESCR = """
@@ -929,7 +964,23 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
       <a href='#main.deterministic'>Deterministic&nbsp;Encoding</a> rules.
       <div>The <kbd>CBOR.LENIENT_NUMBER_DECODING</kbd> option makes the decoder
       accept different representations of CBOR <code>int/bigint</code>
-      and <code>float</code> objects, only limited by ${RFC8949}.</div></div>""";
+      and <code>float</code> objects, only limited by ${RFC8949}.</div></div>
+      <div id='CBOR.LAZY_DECODING' style='margin-top:0.8em'>
+      <kbd>CBOR.LAZY_DECODING</kbd>:</div>
+      <div style='padding:0.2em 0 0 1.2em'>By default, the decoder decodes
+      the entire CBOR object.
+      <div>The <kbd>CBOR.LAZY_DECODING</kbd> option makes the decoder
+      only verify the framing of array and map elements, which are decoded
+      when accessed.
+      This option requires a decoder operating on a buffer.</div></div>
+      <div id='CBOR.ZERO_COPY_DECODING' style='margin-top:0.8em'>
+      <kbd>CBOR.ZERO_COPY_DECODING</kbd>:</div>
+      <div style='padding:0.2em 0 0 1.2em'>By default, byte strings are
+      copied from the input.
+      <div>The <kbd>CBOR.ZERO_COPY_DECODING</kbd> option makes
+      <code>get_bytes()</code> return <code>memoryview</code> objects
+      referring to the input buffer, which thus must not be updated
+      while decoded objects are in use.</div></div>""";
 
   static final String INITEXT_RETURN_DESCR = """
       Decoder object to be used with
@@ -956,7 +1007,11 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
       <div style='margin:0.3em 0 0 1.2em'>
       <code style='white-space:nowrap'>CBOR.init_decoder(<i>cbor</i>, <i>options</i>)<br>
       &nbsp;&nbsp;.set_max_nesting_level(20)<br>
-      &nbsp;&nbsp;.decode_with_options()</code></div>""";
+      &nbsp;&nbsp;.decode_with_options()</code></div>
+      <div style='margin-top:0.5em'>
+      Note that the limit only applies to decoding.
+      Encoding and printing objects that are nested deeper than permitted by the
+      Python recursion limit cause a <a href='#main.errors'>CBOR.Exception</a> to be thrown.</div>""";
 
   static final String SETMAXNESTINGLEVEL_P1_DESCR = """
       Maximum nesting level.  The default setting is <code>100</code>.""";
@@ -1000,6 +1055,204 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
 
   static final String DIAGDECSEQ_RETURN_DESCR = "JavaScript array holding zero or more objects.";
 
+  // CBOR.decode_lazy()
+
+  static final String DECODELAZY_DESCR = """
+      Decode CBOR data using the <a href='#CBOR.LAZY_DECODING'>CBOR.LAZY_DECODING</a> option.
+      <div style='margin-top:0.5em'>
+      The returned object is equivalent to the one returned by
+      <a href='#decoder.cbor.decode'>CBOR.decode()</a>,
+      but the elements of arrays and maps are only decoded when accessed.</div>""";
+
+  // CBOR.decode_native()
+
+  static final String DECODENATIVE_DESCR = """
+      Decode CBOR data into native Python objects.
+      <div style='margin-top:0.5em'>
+      Integers, floating-point numbers, text strings, byte strings, booleans, and
+      <code>null</code> are returned as <code>int</code>, <code>float</code>,
+      <code>str</code>, <code>bytes</code>, <code>bool</code>, and <code>None</code>,
+      while arrays and maps are returned as <code>list</code> and <code>dict</code> objects.
+      Map keys that are not hashable in Python are returned as <code>tuple</code> and
+      <code>CBOR.FrozenMap</code> objects.
+      Tags, simple values, and non-finite numbers are returned as
+      <code>CBOR.NativeTag</code>, <code>CBOR.NativeSimple</code>, and
+      <code>CBOR.NativeNonFinite</code> objects respectively.</div>
+      <div style='margin-top:0.5em'>
+      The decoder performs the same checks as
+      <a href='#decoder.cbor.decode'>CBOR.decode()</a>.</div>""";
+
+  static final String DECODENATIVE_RETURN_DESCR = """
+      Native Python object.""";
+
+  // CBOR.decode_projection()
+
+  static final String DECODEPROJECTION_DESCR = """
+      Decode selected parts of CBOR data.
+      <div style='margin-top:0.5em'>
+      Map keys on the way to selected objects are decoded and checked,
+      while other data is just skipped, which only verifies its framing.</div>
+      <div style='margin-top:0.5em'>
+      See also <a href='#decoder.decoder.decodeprojection'><i>Decoder</i>.decode_projection()</a>.</div>""";
+
+  static final String DECODEPROJECTION_P1_DESCR = """
+      List of paths, where each path is a list of <code>CBOR.*</code>
+      map keys and (integer) array indices.""";
+
+  static final String DECODEPROJECTION_RETURN_DESCR = """
+      List holding the selected objects, or <code>None</code> for paths
+      that do not match the data.""";
+
+  // CBOR.compile_schema()
+
+  static final String COMPILESCHEMA_DESCR = """
+      Compile a declaration of an expected message structure.
+      <div style='margin-top:0.5em'>
+      Schemas are built using <code>CBOR.SchemaMap()</code> with the methods
+      <code>required(<i>key</i>, <i>schema</i>)</code> and
+      <code>optional(<i>key</i>, <i>schema</i>)</code>, and
+      <code>CBOR.SchemaArray(<i>schema</i>)</code>.
+      Leaf types are given by the names of the typed accessors without
+      <code>get_</code>, like <code>"int32"</code>, <code>"string"</code>, or
+      <code>"date_time"</code>.
+      In addition, <code>"null"</code> and <code>"any"</code> are supported.</div>""";
+
+  static final String COMPILESCHEMA_P1_DESCR = """
+      Schema object.""";
+
+  static final String COMPILESCHEMA_RETURN_DESCR = """
+      Function taking CBOR data (bytes) as argument, which decodes and validates the data
+      in a single pass.
+      Maps are returned as <code>dict</code> objects indexed by native keys,
+      and arrays as <code>list</code> objects.
+      Data not matching the schema causes a <a href='#main.errors'>CBOR.Exception</a> to be thrown.""";
+
+  // CBOR.init_async_decoder()
+
+  static final String INITASYNC_DESCR = """
+      Create a CBOR decoder for <code>asyncio.StreamReader</code> input.
+      <div style='margin-top:0.5em'>
+      The decoder supports the same options as
+      <a href='#decoder.cbor.initdecoder'>CBOR.init_decoder()</a>, as well as the
+      <code>set_max_nesting_level()</code>, <code>get_byte_count()</code>, and
+      <code>set_stats()</code> methods, but
+      <a href='#decoder.decoder.decodewithoptions'><i>Decoder</i>.decode_with_options()</a>
+      must be called using <code>await</code>.
+      In <a href='#CBOR.SEQUENCE_MODE'>CBOR.SEQUENCE_MODE</a>, the decoder
+      may also be used with <code>async&nbsp;for</code>.
+      The stream is never read beyond the end of the current object.</div>""";
+
+  static final String INITASYNC_P1_DESCR = """
+      <code>asyncio.StreamReader</code> holding the CBOR data.""";
+
+  static final String MAXLENGTH_P_DESCR = """
+      Maximum number of bytes to read.""";
+
+  // CBOR.init_push_decoder()
+
+  static final String INITPUSH_DESCR = """
+      Create a CBOR decoder for data arriving in arbitrary fragments,
+      like from non-blocking sockets.
+      <div style='margin-top:0.5em'>
+      Data is supplied by calling <code>feed(<i>data</i>)</code>, which returns
+      a list holding the CBOR objects completed by <i>data</i>.
+      After the last fragment, <code>close()</code> must be called,
+      which causes a <a href='#main.errors'>CBOR.Exception</a> to be thrown
+      if the data ends in the middle of an object.
+      The decoder also supports the <code>set_max_nesting_level()</code>,
+      <code>get_byte_count()</code>, and <code>set_stats()</code> methods.</div>""";
+
+  static final String INITPUSH_RETURN_DESCR = """
+      Push decoder object.""";
+
+  // CBOR.init_sequence_writer()
+
+  static final String INITSEQUENCEWRITER_DESCR = """
+      Create a writer of CBOR sequences.
+      <div style='margin-top:0.5em'>
+      Objects are encoded by calling <code>write(<i>object</i>)</code>,
+      while <code>flush()</code> writes pending data to the stream.
+      <code>get_byte_count()</code> returns the number of bytes of the sequence.</div>""";
+
+  static final String INITSEQUENCEWRITER_RETURN_DESCR = """
+      Sequence writer object.""";
+
+  // Decoder.set_key_cache()
+
+  static final String SETKEYCACHE_DESCR = """
+      Set a cache for decoded map keys.
+      <div style='margin-top:0.5em'>
+      Keys are looked up using their encoding, avoiding decoding and allocating
+      keys that have been seen before.
+      A <code>CBOR.KeyCache(<i>max_entries</i>)</code> object may be shared
+      between decoders, while <code>get_hits()</code>, <code>get_misses()</code>,
+      and <code>clear()</code> provide cache management.
+      The cache is only used by decoders operating on buffers in the default
+      (deterministic) mode.</div>""";
+
+  static final String SETKEYCACHE_P1_DESCR = """
+      Key cache, or <code>None</code> for no cache.""";
+
+  // Decoder.set_chunk_sink()
+
+  static final String SETCHUNKSINK_DESCR = """
+      Set a receiver of large byte and text strings.
+      <div style='margin-top:0.5em'>
+      For strings holding at least <i>threshold</i> bytes, the
+      <code>start(<i>text</i>, <i>length</i>)</code> method of a
+      <code>CBOR.ChunkSink</code> subclass is called, followed by
+      <code>write(<i>chunk</i>)</code> calls holding the data.
+      The CBOR object returned by <code>finish()</code>
+      replaces the string in the decoded data.
+      Map keys, big integers, and the contents of date tags are never
+      passed to the sink.</div>""";
+
+  static final String SETCHUNKSINK_P1_DESCR = """
+      Chunk sink, or <code>None</code> for no sink.""";
+
+  static final String SETCHUNKSINK_P2_DESCR = """
+      Optional: minimum string length.
+      The default setting is <code>0x10000</code>.""";
+
+  static final String SETCHUNKSINK_P3_DESCR = """
+      Optional: maximum size of each chunk.
+      The default setting is <code>0x10000</code>.""";
+
+  // Decoder.set_stats()
+
+  static final String SETSTATS_DESCR = """
+      Set a collector of decoder statistics.
+      <div style='margin-top:0.5em'>
+      The counters of a <code>CBOR.DecoderStats</code> object accumulate over
+      <a href='#decoder.decoder.decodewithoptions'><i>Decoder</i>.decode_with_options()</a>
+      calls until <code>clear()</code> is called, and are read by
+      <code>get_object_count(<i>major_type</i>)</code>, <code>get_byte_count()</code>,
+      <code>get_max_depth()</code>, <code>get_decode_count()</code>,
+      <code>get_decode_time()</code>, and <code>get_last_decode_time()</code>.
+      Subclasses may override <code>on_limit(<i>limit</i>, <i>value</i>)</code>,
+      which is called before an exceeded limit causes a
+      <a href='#main.errors'>CBOR.Exception</a> to be thrown.</div>""";
+
+  static final String SETSTATS_P1_DESCR = """
+      Statistics object, or <code>None</code> for no statistics.""";
+
+  // Decoder.reset()
+
+  static final String RESET_DESCR = """
+      Reuse the decoder for new CBOR data, keeping options and limits.""";
+
+  // Decoder.decode_projection()
+
+  static final String DECODERPROJECTION_DESCR = """
+      Decode selected parts of CBOR data, see
+      <a href='#decoder.cbor.decodeprojection'>CBOR.decode_projection()</a>.
+      <div style='margin-top:0.5em'>
+      This method requires a decoder operating on a buffer.</div>""";
+
+  static final String INITEXT_P2_SHORT_DESCR = """
+      The decoder options, see
+      <a href='#decoder.cbor.initdecoder'>CBOR.init_decoder()</a>.""";
+
   static final String INTRO = "${INTRO}";
 
   static final String WRAPPER_INTRO = "${WRAPPER_INTRO}";
@@ -1100,6 +1353,8 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
 
   enum DataTypes {
     ExtendedDecoder("<i>Decoder</i>"),
+    PushDecoder("<i>PushDecoder</i>"),
+    SequenceWriter("<i>SequenceWriter</i>"),
 
     CBOR_Any("CBOR.<i>Wrapper</i>"),
 
@@ -1114,6 +1369,10 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
     CBOR_MAP("CBOR.Map"),
     CBOR_TAG("CBOR.Tag"),
     CBOR_SIMPLE("CBOR.Simple"),
+    CBOR_KEYCACHE("CBOR.KeyCache"),
+    CBOR_CHUNKSINK("CBOR.ChunkSink"),
+    CBOR_DECODERSTATS("CBOR.DecoderStats"),
+    CBOR_SCHEMA("CBOR.SchemaMap"),
 
     JS_THIS("self"),
 
@@ -1123,6 +1382,10 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
     JS_DATE("Date"),
     JS_BOOLEAN("Boolean"),
     JS_STRING("str"),
+    JS_STREAM("stream"),
+    JS_OBJECT("object"),
+    JS_LIST("list"),
+    JS_FUNCTION("function"),
     JS_DYNAMIC("function|=&gt;"),
     JS_UINT8ARRAY("bytes");
 
@@ -2077,6 +2340,14 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
     addCommonMethod("scan", SCAN_DESCR)
         .setReturn(DataTypes.JS_THIS, CURRENT_RETURN_DESCR);
 
+    addCommonMethod("encode_to", ENCODETO_DESCR)
+        .addParameter("stream", DataTypes.JS_STREAM, ENCODETO_P1_DESCR)
+        .addParameter("chunk_size", DataTypes.JS_INT, CHUNKSIZE_P_DESCR)
+        .setReturn(DataTypes.JS_INT, ENCODETO_RETURN_DESCR);
+
+    addCommonMethod("freeze", FREEZE_DESCR)
+        .setReturn(DataTypes.JS_THIS, CURRENT_RETURN_DESCR);
+
     // CBOR.decode()
 
     addDecoderMethod("CBOR.decode", DECODE_DESCR)
@@ -2118,6 +2389,85 @@ CBOR.NonFinite.create_payload()</a>.</div>""";
         .addParameter("cbor_text", DataTypes.JS_STRING, DIAGDECSEQ_P1_DESCR)
         .setReturn(DataTypes.JS_ARRAY, DIAGDECSEQ_RETURN_DESCR);
 
+    // CBOR.decode_lazy()
+
+    addDecoderMethod("CBOR.decode_lazy", DECODELAZY_DESCR)
+        .addParameter("cbor", DataTypes.JS_UINT8ARRAY, DECODE_P1_DESCR)
+        .setReturn(DataTypes.CBOR_Any, DECODE_RETURN_DESCR);
+
+    // CBOR.decode_native()
+
+    addDecoderMethod("CBOR.decode_native", DECODENATIVE_DESCR)
+        .addParameter("cbor", DataTypes.JS_UINT8ARRAY, DECODE_P1_DESCR)
+        .setReturn(DataTypes.JS_OBJECT, DECODENATIVE_RETURN_DESCR);
+
+    // CBOR.decode_projection()
+
+    addDecoderMethod("CBOR.decode_projection", DECODEPROJECTION_DESCR)
+        .addParameter("cbor", DataTypes.JS_UINT8ARRAY, DECODE_P1_DESCR)
+        .addParameter("paths", DataTypes.JS_LIST, DECODEPROJECTION_P1_DESCR)
+        .setReturn(DataTypes.JS_LIST, DECODEPROJECTION_RETURN_DESCR);
+
+    // CBOR.compile_schema()
+
+    addDecoderMethod("CBOR.compile_schema", COMPILESCHEMA_DESCR)
+        .addParameter("schema", DataTypes.CBOR_SCHEMA, COMPILESCHEMA_P1_DESCR)
+        .setReturn(DataTypes.JS_FUNCTION, COMPILESCHEMA_RETURN_DESCR);
+
+    // CBOR.init_async_decoder()
+
+    addDecoderMethod("CBOR.init_async_decoder", INITASYNC_DESCR)
+        .addParameter("stream_reader", DataTypes.JS_STREAM, INITASYNC_P1_DESCR)
+        .addParameter("options", DataTypes.JS_INT, INITEXT_P2_SHORT_DESCR)
+        .addParameter("max_length", DataTypes.JS_INT, MAXLENGTH_P_DESCR)
+        .setReturn(DataTypes.ExtendedDecoder, INITEXT_RETURN_DESCR);
+
+    // CBOR.init_push_decoder()
+
+    addDecoderMethod("CBOR.init_push_decoder", INITPUSH_DESCR)
+        .addParameter("options", DataTypes.JS_INT, INITEXT_P2_SHORT_DESCR)
+        .addParameter("max_length", DataTypes.JS_INT, MAXLENGTH_P_DESCR)
+        .setReturn(DataTypes.PushDecoder, INITPUSH_RETURN_DESCR);
+
+    // CBOR.init_sequence_writer()
+
+    addDecoderMethod("CBOR.init_sequence_writer", INITSEQUENCEWRITER_DESCR)
+        .addParameter("stream", DataTypes.JS_STREAM, ENCODETO_P1_DESCR)
+        .addParameter("chunk_size", DataTypes.JS_INT, CHUNKSIZE_P_DESCR)
+        .setReturn(DataTypes.SequenceWriter, INITSEQUENCEWRITER_RETURN_DESCR);
+
+    // Decoder.set_key_cache()
+
+    addDecoderMethod("<i>Decoder</i>.set_key_cache", SETKEYCACHE_DESCR)
+        .addParameter("key_cache", DataTypes.CBOR_KEYCACHE, SETKEYCACHE_P1_DESCR)
+        .setReturn(DataTypes.ExtendedDecoder, INITEXT_RETURN_DESCR);
+
+    // Decoder.set_chunk_sink()
+
+    addDecoderMethod("<i>Decoder</i>.set_chunk_sink", SETCHUNKSINK_DESCR)
+        .addParameter("chunk_sink", DataTypes.CBOR_CHUNKSINK, SETCHUNKSINK_P1_DESCR)
+        .addParameter("threshold", DataTypes.JS_INT, SETCHUNKSINK_P2_DESCR)
+        .addParameter("chunk_size", DataTypes.JS_INT, SETCHUNKSINK_P3_DESCR)
+        .setReturn(DataTypes.ExtendedDecoder, INITEXT_RETURN_DESCR);
+
+    // Decoder.set_stats()
+
+    addDecoderMethod("<i>Decoder</i>.set_stats", SETSTATS_DESCR)
+        .addParameter("stats", DataTypes.CBOR_DECODERSTATS, SETSTATS_P1_DESCR)
+        .setReturn(DataTypes.ExtendedDecoder, INITEXT_RETURN_DESCR);
+
+    // Decoder.reset()
+
+    addDecoderMethod("<i>Decoder</i>.reset", RESET_DESCR)
+        .addParameter("cbor", DataTypes.JS_UINT8ARRAY, INITEXT_P1_DESCR)
+        .setReturn(DataTypes.ExtendedDecoder, INITEXT_RETURN_DESCR);
+
+    // Decoder.decode_projection()
+
+    addDecoderMethod("<i>Decoder</i>.decode_projection", DECODERPROJECTION_DESCR)
+        .addParameter("paths", DataTypes.JS_LIST, DECODEPROJECTION_P1_DESCR)
+        .setReturn(DataTypes.JS_LIST, DECODEPROJECTION_RETURN_DESCR);
+
      // CBOR.create_date_time()
 
     addUtilityMethod("CBOR.create_date_time", CREATE_DATETIME_DESCR)
@@ -2,6 +2,10 @@ from org.webpki.cbor import CBOR
 import math
 import struct
 import io
+import asyncio
+import os
+import tempfile
+import datetime
 
 def assert_true(text, expression):
   if not expression:
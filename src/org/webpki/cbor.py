@@ -5,17 +5,28 @@
 # Author: Anders Rundgren (anders.rundgren.net@gmail.com)      #
 # Repository: https://github.com/cyberphone/CBOR.py.           #
 #                                                              #
-# Note: this is a "Reference Implementation", not optimized    #
-# for maximum performance.  It is assumed that a productified  #
-# version of CBOR.py would be rewritten in C.                  #
+# Note: this is a "Reference Implementation" in pure Python.   #
+# Performance-oriented features like buffer, lazy, zero-copy,  #
+# and native decoding are provided as options, while the       #
+# default API remains that of the CBOR::Core specification.    #
 ################################################################
 
 import struct
 import math
 import io
+import os
+import mmap
+import asyncio
+import collections
+import collections.abc
+import concurrent.futures
 import base64
+import codecs
 import datetime
 import re
+import sys
+import threading
+import time
 
 class CBOR:
         
@@ -55,10 +66,28 @@ class CBOR:
         0,   0,   0,   0,   0,   0,   0,   0,
         0,   0,   0,   0,  92]
 
+    """
+    Encoded headers for arguments 0..255, indexed by major type and
+    argument, see _generic_header().
+    """
+    _SMALL_HEADERS = [[bytes([major | argument]) if argument < 24 
+                       else bytes([major | 24, argument])
+                       for argument in range(256)] 
+                      for major in range(0, 256, 32)]
+
+    """ For CBOR.ZERO_COPY_DECODING. """
+    _NON_ASCII = re.compile(b'[\x80-\xff]')
+
+    """ Per-thread default decoder, see CBOR.decode(). """
+    _thread_local = threading.local()
+
     def __init__(self):
         CBOR._error("Invalid operation")
 
     class _CborObject:
+        """ Set for frozen objects, see freeze(). """
+        _encoding = None
+
         def __init__(self):
             self._read_flag = False
             self._immutable_flag = False
@@ -94,7 +123,8 @@ class CBOR:
         
         def _immutable_test(self):
             if self._immutable_flag:
-                CBOR._error('Map keys are immutable') 
+                CBOR._error('Map keys are immutable' if self._encoding is None
+                            else 'Frozen objects are immutable') 
 
         def _check_type_get_value(self, expected):
             if type(self).__name__ != expected:
@@ -217,7 +247,58 @@ class CBOR:
             return self._check_type_get_value('NonFinite')
 
         def encode(self):
-            return self._internal_encode()
+            """
+            Single-pass encoding: every object appends its encoding to
+            the same buffer, where containers call _encode_into() of
+            their elements.
+            """
+            buffer = bytearray()
+            try:
+                self._encode_into(buffer)
+            except RecursionError:
+                CBOR._recursion_error()
+            return buffer
+
+        def freeze(self):
+            """
+            Makes the object and its elements immutable.  Frozen arrays,
+            maps, and tags keep their encoding, which is reused by
+            encode(), equals(), clone(), and by enclosing objects.
+            Changing a mutable container holding frozen objects only
+            requires re-encoding the non-frozen parts.
+            """
+            if self._encoding is None:
+                self._immutable_flag = True
+                match type(self).__name__:
+                    case "Map":
+                        self._materialize()
+                        for entry in self._entries:
+                            entry._object.freeze()
+
+                    case "Array":
+                        self._materialize()
+                        for object in self._objects:
+                            object.freeze()
+
+                    case "Tag":
+                        self._object.freeze()
+                """ Elements are frozen, their encoding is reused. """
+                buffer = bytearray()
+                self._encode_into(buffer)
+                self._encoding = bytes(buffer)
+            return self
+
+        def encode_to(self, stream, chunk_size=0x10000):
+            """
+            Writes the encoded object to stream in chunks of about 
+            chunk_size bytes.  Returns the number of bytes written.
+            """
+            buffer = CBOR._ChunkedBuffer(stream, chunk_size)
+            try:
+                self._encode_into(buffer)
+            except RecursionError:
+                CBOR._recursion_error()
+            return buffer._flush()
         
         def check_for_unread(self):
             self._traverse(None, True)
@@ -233,6 +314,7 @@ class CBOR:
                         self.get(entry._key)._traverse(entry._key, check)
 
                 case "Array":
+                    self._materialize()
                     for object in self._objects:
                         object._traverse(self, check)
                 
@@ -263,7 +345,10 @@ class CBOR:
         def to_diagnostic(self, pretty_print):
             cbor_printer = CBOR._CborPrinter(
                 CBOR._check_bool_argument(pretty_print))
-            self._internal_to_string(cbor_printer)
+            try:
+                self._internal_to_string(cbor_printer)
+            except RecursionError:
+                CBOR._recursion_error()
             return cbor_printer.buffer
 
         def to_string(self):
@@ -348,13 +433,13 @@ class CBOR:
                                     0, 
                                     0xffffffffffffffffffffffffffffffff)
 
-        def _internal_encode(self):
+        def _encode_into(self, buffer):
             tag = CBOR._MT_UNSIGNED
             value = self._value
             if value < 0:
                 tag = CBOR._MT_NEGATIVE
                 value = ~value
-            return CBOR._generic_header(tag, value)
+            buffer += CBOR._generic_header(tag, value)
         
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append(str(self._value))
@@ -366,6 +451,9 @@ class CBOR:
     #       CBOR.Float       #
     ##########################
     class Float(_CborObject):
+        """ The encoding is computed on first use, see _get_encoded(). """
+        _encoded = None
+
         def __init__(self, value):
             super().__init__()
             self._value = CBOR._check_argument_type(value, 'float')
@@ -375,112 +463,55 @@ class CBOR:
             """
             if not math.isfinite(value):
                 CBOR._error("Not permitted: 'NaN/Infinity'")
-            """ 
-            Get the 8 bytes representing the IEEE-754 double. 
+
+        """ Preferred encodings of common values, see _shortest(). """
+        _COMMON_VALUES = {float(value) / scale: 
+                              struct.pack('!e', float(value) / scale)
+                          for value in range(-64, 65) if value
+                          for scale in (1, 2, 4, 10)
+                          if struct.unpack('!e', struct.pack(
+                              '!e', float(value) / scale))[0] == 
+                                  float(value) / scale}
+
+        @staticmethod
+        def _shortest(value):
             """
-            f64b = struct.pack('!d', value)
-            """ 
-            Deal with 0.0 and -0.0 separately.
+            The shortest IEEE-754 representation holding the exact value.
+            Conversions are exact for subnormal numbers as well, so a
+            successful round-trip means that no bits were lost.
             """
             if value == 0:
-                self._encoded = f64b[0:2]
-                return
-            while True:
-                f64bin = CBOR._bytes_to_uint(f64b)
-                """
-                Exponent bias difference: 1023 - 127
-                """
-                f32exp = ((f64bin & 0x7ff0000000000000) >> 52) - 0x380
-                """
-                Don't go into the non-finite space or underflow. 
-                """
-                if f32exp <= -23 or f32exp > 0xfe: break
-                f32signif = f64bin & 0xfffffffffffff
-                """ 
-                The bits to be discarded must all be zero.
-                Significand size difference: 52 - 23
-                """
-                if f32signif & 0x1fffffff: break
-                """
-                No bits dropped. Put significand in position.
-                """
-                f32signif >>= 29
-                """ Finally, do we need to denormalize the number? """
-                if f32exp <= 0:
-                    """
-                    Losing significand bits is not an option.
-                    """
-                    if f32signif & ((1 << (1 - f32exp)) - 1): break
-                    """
-                    No bits dropped. Denormalize. The implicit "1"
-                    becomes explicit using subnormal representation.
-                    """
-                    f32signif += 0x800000
-                    """
-                    Put significand in position.
-                    """
-                    f32signif >>= (1 - f32exp)
-                    """
-                    Denormalized exponents are always zero.
-                    """
-                    f32exp = 0
-                """
-                Maybe we are done but we need to check
-                if float16 is possible as well.
-                """
-                while True:
-                    """
-                    Exponent bias difference: 127 - 15
-                    """
-                    f16exp = f32exp - 0x70
-                    """
-                    Don't go into the non-finite space or underflow.
-                    """
-                    if f16exp <= -10 or f16exp > 0x1e: break
-                    """
-                    The bits to be discarded must all be zero.
-                    Significand size difference: 23 - 10
-                    """
-                    if f32signif & 0x1fff: break
-                    """
-                    No bits dropped. Put significand in position.
-                    """
-                    f16signif = f32signif >> 13
-                    if f16exp <= 0:
-                        """
-                        Losing significand bits is not an option.
-                        """
-                        if f16signif & ((1 << (1 - f16exp)) - 1): break
-                        """
-                        No bits dropped. Denormalize. The implicit "1"
-                        becomes explicit using subnormal representation.
-                        """
-                        f16signif += 0x400
-                        """
-                        Put significand in position.
-                        """
-                        f16signif >>= (1 - f16exp)
-                        """
-                        Denormalized exponents are always zero.
-                        """
-                        f16exp = 0
-                    """
-                    Reached the end of the rope => float16.
-                    """
-                    self._encoded = CBOR._encode_16_bits(
-                        ((f64b[0] & 0x80) << 8) + (f16exp << 10) + f16signif)
-                    return
-                """
-                Exited inner loop  => float32.
-                """
-                f32bin = ((f64b[0] & 0x80) << 24) + (f32exp << 23) + f32signif
-                self._encoded = (CBOR._encode_16_bits(f32bin >> 16) + 
-                                 CBOR._encode_16_bits(f32bin & 0xffff))
-                return
+                """ Deal with 0.0 and -0.0 separately. """
+                return b'\x80\x00' if math.copysign(1, value) < 0 else bytes(2)
+            encoded = CBOR.Float._COMMON_VALUES.get(value)
+            if encoded is not None:
+                return encoded
+            magnitude = abs(value)
+            if magnitude <= 3.4028234663852886e+38:
+                encoded = struct.pack('!f', value)
+                if struct.unpack('!f', encoded)[0] == value:
+                    if magnitude <= 65504.0:
+                        f16 = struct.pack('!e', value)
+                        if struct.unpack('!e', f16)[0] == value:
+                            return f16
+                    return encoded
+            return struct.pack('!d', value)
+
+        def _get_encoded(self):
+            if self._encoded is None:
+                self._encoded = CBOR.Float._shortest(self._value)
+            return self._encoded
+
+        @staticmethod
+        def _create_decoded(value, encoded):
             """
-            Exited outer loop => float64.
+            For decoders: the encoding is already known to be preferred.
             """
-            self._encoded = f64b
+            cbor_float = CBOR.Float.__new__(CBOR.Float)
+            CBOR._CborObject.__init__(cbor_float)
+            cbor_float._value = value
+            cbor_float._encoded = encoded
+            return cbor_float
 
         @staticmethod
         def create_extended_float(value):
@@ -503,8 +534,12 @@ class CBOR:
         def create_float16(value):
             return CBOR._return_converted(True, value)
 
-        def _internal_encode(self):
-            return bytes([0xf9 + (len(self._encoded) >> 2)]) + self._encoded
+        def _encode_into(self, buffer):
+            encoded = self._encoded
+            if encoded is None:
+                encoded = self._get_encoded()
+            buffer.append(0xf9 + (len(encoded) >> 2))
+            buffer += encoded
         
         def _internal_to_string(self, cbor_printer):
             textual = str(self._value)
@@ -514,7 +549,7 @@ class CBOR:
             cbor_printer.append(textual)
 
         def _length(self):
-            return len(self._encoded)
+            return len(self._get_encoded())
         
         def _get(self):
             return self._value
@@ -526,10 +561,33 @@ class CBOR:
         def __init__(self, text_string):
             super().__init__()
             self._string = CBOR._check_argument_type(text_string, 'str')
+            self._utf8 = None
+
+        @staticmethod
+        def _create_decoded(utf8):
+            """
+            For CBOR.ZERO_COPY_DECODING: ASCII strings are converted to 'str'
+            on first access, other strings are decoded (and thus validated)
+            immediately.
+            """
+            cbor_string = CBOR.String.__new__(CBOR.String)
+            CBOR._CborObject.__init__(cbor_string)
+            cbor_string._utf8 = utf8
+            if CBOR._NON_ASCII.search(utf8):
+                cbor_string._string = str(utf8, 'utf-8')
+            return cbor_string
+
+        def __getattr__(self, name):
+            """ Only called for a deferred '_string'. """
+            if name != '_string' or self.__dict__.get('_utf8') is None:
+                raise AttributeError(name)
+            self._string = str(self._utf8, 'ascii')
+            return self._string
 
-        def _internal_encode(self):
-            return CBOR._encode_string(
-                CBOR._MT_STRING, self._string.encode())
+        def _encode_into(self, buffer):
+            utf8 = self._string.encode() if self._utf8 is None else self._utf8
+            buffer += CBOR._generic_header(CBOR._MT_STRING, len(utf8))
+            buffer += utf8
         
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append('"')
@@ -558,8 +616,20 @@ class CBOR:
             super().__init__()
             self._string = CBOR._check_bytes_argument(byte_string)
 
-        def _internal_encode(self):
-            return CBOR._encode_string(CBOR._MT_BYTES, self._string)
+        @staticmethod
+        def _create_decoded(view):
+            """ 
+            For CBOR.ZERO_COPY_DECODING: the contents is a 'memoryview' 
+            slice of the input buffer. 
+            """
+            cbor_bytes = CBOR.Bytes.__new__(CBOR.Bytes)
+            CBOR._CborObject.__init__(cbor_bytes)
+            cbor_bytes._string = view
+            return cbor_bytes
+
+        def _encode_into(self, buffer):
+            buffer += CBOR._generic_header(CBOR._MT_BYTES, len(self._string))
+            buffer += self._string
         
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append("h'").append(self._string.hex()).append("'")
@@ -575,9 +645,9 @@ class CBOR:
             super().__init__()
             self._value = CBOR._check_bool_argument(value)
 
-        def _internal_encode(self):
-            return bytes(
-                [CBOR._SIMPLE_TRUE if self._value else CBOR._SIMPLE_FALSE])
+        def _encode_into(self, buffer):
+            buffer.append(
+                CBOR._SIMPLE_TRUE if self._value else CBOR._SIMPLE_FALSE)
         
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append("true" if self._value else "false")
@@ -592,8 +662,8 @@ class CBOR:
         def __init__(self):
             super().__init__()
 
-        def _internal_encode(self):
-            return bytes([CBOR._SIMPLE_NULL])
+        def _encode_into(self, buffer):
+            buffer.append(CBOR._SIMPLE_NULL)
         
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append("null")
@@ -605,6 +675,7 @@ class CBOR:
         def __init__(self):
             super().__init__()
             self._objects = list()
+            self._lazy = None
 
         def add(self, object):
             self._immutable_test()
@@ -613,11 +684,17 @@ class CBOR:
         
         def get(self, index):
             self._read_flag = True
-            return self._objects[self._index_check(
-                index, len(self._objects) - 1)]
+            index = self._index_check(index, len(self._objects) - 1)
+            object = self._objects[index]
+            if object is None:
+                """ Lazily decoded element, see CBOR.decode_lazy(). """
+                object = self._objects[index] = self._lazy.decode(
+                    self._lazy._offsets[index])
+            return object
         
         def insert(self, index, object):
             self._immutable_test()
+            self._materialize()
             self._objects.insert(
                 self._index_check(index, len(self._objects)),
                 CBOR._cbor_argument_check(object))
@@ -625,6 +702,7 @@ class CBOR:
 
         def update(self, index, object):
             self._immutable_test()
+            self._materialize()
             self._index_check(index, len(self._objects) - 1)
             previous = self._objects[index]
             self._objects[index] = CBOR._cbor_argument_check(object)
@@ -632,10 +710,12 @@ class CBOR:
 
         def remove(self, index):
             self._immutable_test()
+            self._materialize()
             return self._objects.pop(
                 self._index_check(index, len(self._objects) - 1))
 
         def to_array(self):
+            self._materialize()
             array = list()
             for object in self._objects:
                 array.append(object)
@@ -646,19 +726,36 @@ class CBOR:
                 CBOR._error("Index out of range: " + str(index))
             return index
         
-        def _encode_body(self, header):
+        def _materialize(self):
+            if self._lazy:
+                for index in range(len(self._objects)):
+                    if self._objects[index] is None:
+                        self._objects[index] = self._lazy.decode(
+                            self._lazy._offsets[index])
+                self._lazy = None
+
+        def _encode_elements(self, buffer):
+            self._materialize()
             for object in self._objects:
-                header += object._internal_encode()
-            return header
+                object._encode_into(buffer)
 
         def encode_as_sequence(self):
-            return self._encode_body(bytearray())
+            buffer = bytearray()
+            try:
+                self._encode_elements(buffer)
+            except RecursionError:
+                CBOR._recursion_error()
+            return buffer
                 
-        def _internal_encode(self):
-            return self._encode_body(
-                CBOR._generic_header(CBOR._MT_ARRAY, len(self._objects)))
+        def _encode_into(self, buffer):
+            if self._encoding is not None:
+                buffer += self._encoding
+                return
+            buffer += CBOR._generic_header(CBOR._MT_ARRAY, len(self._objects))
+            self._encode_elements(buffer)
         
         def _internal_to_string(self, cbor_printer):
+            self._materialize()
             if cbor_printer.arrayFolding(self):
                 cbor_printer.beginList('[')
                 not_first = False
@@ -691,10 +788,14 @@ class CBOR:
             self._entries = list()
             self._pre_sorted_keys = False
             self._last_lookup = 0
+            self._lazy = None
 
         def set(self, key, object):
             self._immutable_test()
-            new_entry = CBOR._Entry(key, object)
+            return self._insert(CBOR._Entry(key, object))
+
+        def _insert(self, new_entry):
+            key = new_entry._key
             self._make_immutable(key)
             insert_index = len(self._entries)
             if insert_index:
@@ -763,7 +864,7 @@ class CBOR:
             self._immutable_test()
             entry = self._lookup(key, existing)
             if entry:
-                previous = entry._object
+                previous = self._value_of(entry)
                 entry._object = CBOR._cbor_argument_check(object)
             else:
                 previous = None
@@ -774,13 +875,14 @@ class CBOR:
             self._immutable_test()
             if not isinstance(map, CBOR.Map):
                 CBOR._error("Argument must be of type CBOR.Map")
+            map._materialize()
             for entry in map._entries:
                 self.set(entry._key, entry._object)
             return self
 
         def get(self, key):
             self._read_flag = True
-            return self._lookup(key, True)._object
+            return self._value_of(self._lookup(key, True))
    
         def get_conditionally(self, key, default_object=None):
             entry = self._lookup(key, False)
@@ -788,7 +890,7 @@ class CBOR:
             if default_object is not None: CBOR._cbor_argument_check(default_object)
             if entry:
                 self._read_flag = True
-                return entry._object
+                return self._value_of(entry)
             return default_object
 
         def get_keys(self):
@@ -801,18 +903,35 @@ class CBOR:
             self._immutable_test()
             target_entry = self._lookup(key, True)
             self._entries.pop(self._last_lookup)
-            return target_entry._object
+            return self._value_of(target_entry)
 
         def contains_key(self, key):
             return self._lookup(key, False) != None
 
-        def _internal_encode(self):
-            encoded = CBOR._generic_header(CBOR._MT_MAP, len(self._entries))
+        def _value_of(self, entry):
+            if entry._object is None:
+                """ Lazily decoded value, see CBOR.decode_lazy(). """
+                entry._object = self._lazy.decode(entry._offset)
+            return entry._object
+
+        def _materialize(self):
+            if self._lazy:
+                for entry in self._entries:
+                    self._value_of(entry)
+                self._lazy = None
+
+        def _encode_into(self, buffer):
+            if self._encoding is not None:
+                buffer += self._encoding
+                return
+            self._materialize()
+            buffer += CBOR._generic_header(CBOR._MT_MAP, len(self._entries))
             for entry in self._entries:
-                encoded += entry._encoded_key + entry._object.encode()
-            return encoded
+                buffer += entry._encoded_key
+                entry._object._encode_into(buffer)
 
         def _internal_to_string(self, cbor_printer):
+            self._materialize()
             not_first = False
             cbor_printer.beginList("{")
             for entry in self._entries:
@@ -832,9 +951,11 @@ class CBOR:
         def _make_immutable(self, object):
             object._immutable_flag = True
             if isinstance(object, CBOR.Map):
+                object._materialize()
                 for entry in object._entries:
                     self._make_immutable(entry._object)
             elif isinstance(object, CBOR.Array):
+                object._materialize()
                 for value in object._objects:
                     self._make_immutable(value)
 
@@ -843,9 +964,11 @@ class CBOR:
 
     """ Support class to CBOR.Map. """    
     class _Entry:
-        def __init__(self, key, object):
+        def __init__(self, key, object, encoded_key=None):
             self._key = CBOR._cbor_argument_check(key)
-            self._encoded_key = key.encode() # Yes, keys are immutable.
+            if encoded_key is None:
+                encoded_key = key.encode() # Yes, keys are immutable.
+            self._encoded_key = encoded_key
             self._object = CBOR._cbor_argument_check(object)
 
         def _compare(self, encoded_key):
@@ -857,6 +980,46 @@ class CBOR:
                 CBOR._error("Duplicate key: " + str(self._key))
             return diff > 0
 
+    """ Support class to lazily decoded CBOR.Map objects. """
+    class _LazyEntry(_Entry):
+        def __init__(self, key, encoded_key, offset):
+            self._key = key
+            self._encoded_key = encoded_key
+            self._object = None
+            self._offset = offset
+
+    """
+    Support class to lazily decoded CBOR.Array and CBOR.Map objects.
+    Holds the decoder and the nesting level of the container, so that
+    elements can be decoded (including all checks) when first accessed.
+    """
+    class _LazyContent:
+        def __init__(self, decoder, offsets=None):
+            self._decoder = decoder
+            self._offsets = offsets
+            self._nesting_level = decoder._nesting_level
+            """ The decoder may be reset() to other input. """
+            self._buffer = decoder._buffer
+            self._limit = decoder._limit
+
+        def decode(self, offset):
+            decoder = self._decoder
+            position = decoder._position
+            nesting_level = decoder._nesting_level
+            buffer = decoder._buffer
+            limit = decoder._limit
+            decoder._position = offset
+            decoder._nesting_level = self._nesting_level
+            decoder._buffer = self._buffer
+            decoder._limit = self._limit
+            try:
+                return decoder._get_object()
+            finally:
+                decoder._position = position
+                decoder._nesting_level = nesting_level
+                decoder._buffer = buffer
+                decoder._limit = limit
+
     ##########################
     #       CBOR.Tag         #
     ##########################
@@ -913,9 +1076,12 @@ class CBOR:
         def _error_in_object(self, message):
             CBOR._error(message + self.to_diagnostic(False))
 
-        def _internal_encode(self):
-            return (CBOR._generic_header(CBOR._MT_TAG, self._tag_number) +
-                    self._object.encode())
+        def _encode_into(self, buffer):
+            if self._encoding is not None:
+                buffer += self._encoding
+                return
+            buffer += CBOR._generic_header(CBOR._MT_TAG, self._tag_number)
+            self._object._encode_into(buffer)
 
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append(str(self._tag_number)).append('(')
@@ -960,8 +1126,8 @@ class CBOR:
             if value < 0 or value > 255 or (value > 23 and value < 32):
                 CBOR._error("Simple value out of range: " + str(value))
 
-        def _internal_encode(self):
-            return CBOR._generic_header(CBOR._MT_SIMPLE, self._value)
+        def _encode_into(self, buffer):
+            buffer += CBOR._generic_header(CBOR._MT_SIMPLE, self._value)
 
         def _internal_to_string(self, cbor_printer):
             cbor_printer.append("simple(" + str(self._value) + ")")
@@ -1027,6 +1193,7 @@ class CBOR:
             return self._value in [0x7e00 , 0x7c00 , 0xfc00]
 
         def set_sign(self, sign):
+            self._immutable_test()
             mask = 1 << (len(self._ieee754) * 8 - 1)
             self._create_det_enc(
                 (self._value & (mask - 1)) | (mask if sign else 0))
@@ -1069,8 +1236,9 @@ class CBOR:
                                      else 0) + CBOR._reverse_payload(
                 self.get_non_finite64() & 0xfffffffffffff)
 
-        def _internal_encode(self):
-            return bytes([0xf9 + (len(self._ieee754) >> 2)]) + self._ieee754
+        def _encode_into(self, buffer):
+            buffer.append(0xf9 + (len(self._ieee754) >> 2))
+            buffer += self._ieee754
 
         def _internal_to_string(self, cbor_printer): 
             if self.is_simple():
@@ -1089,6 +1257,54 @@ class CBOR:
                 case 4: return self._to_non_finite64(23)
             return self._value
 
+    #=======================#  
+    #  Native Value Types   #
+    #=======================#
+
+    """
+    Native Python representation of CBOR items lacking a direct Python
+    counterpart.  Used by CBOR.decode_native() and CBOR.decode_parallel()
+    with native=True.  CBOR.Int, CBOR.Float, CBOR.String, CBOR.Bytes, 
+    CBOR.Boolean, CBOR.Null, CBOR.Array, and CBOR.Map map to int, float,
+    str, bytes, bool, None, list, and dict respectively.  Arrays and maps
+    used as map keys (or inside keys) are returned as tuple and
+    CBOR.FrozenMap.  Map keys that are distinct in CBOR but equal as
+    Python values (like 1, 1.0, and true) are rejected.
+    """
+    class NativeTag(collections.namedtuple('NativeTag', 
+                                           ['tag_number', 'object'])):
+        __slots__ = ()
+
+    class NativeSimple(collections.namedtuple('NativeSimple', ['value'])):
+        __slots__ = ()
+
+    """
+    NaN, Infinity, and -Infinity are returned as "float".  Other 
+    non-finite numbers hold their IEEE-754 bits (see get_non_finite()).
+    """
+    class NativeNonFinite(collections.namedtuple('NativeNonFinite', 
+                                                 ['value'])):
+        __slots__ = ()
+
+    class FrozenMap(collections.abc.Mapping):
+        def __init__(self, mapping):
+            self._dict = dict(mapping)
+
+        def __getitem__(self, key):
+            return self._dict[key]
+
+        def __iter__(self):
+            return iter(self._dict)
+
+        def __len__(self):
+            return len(self._dict)
+
+        def __hash__(self):
+            return hash(frozenset(self._dict.items()))
+
+        def __repr__(self):
+            return 'CBOR.FrozenMap(' + repr(self._dict) + ')'
+
     #======================#  
     #     CBOR Decoder     #
     #======================#
@@ -1096,38 +1312,184 @@ class CBOR:
     SEQUENCE_MODE           = 0x1
     LENIENT_MAP_DECODING    = 0x2
     LENIENT_NUMBER_DECODING = 0x4
+    LAZY_DECODING           = 0x8
+    ZERO_COPY_DECODING      = 0x10
+
+    """
+    Interning cache for decoded map keys, shareable between decoders.
+    Keys are looked up using their raw (deterministic) encoding, avoiding
+    decoding and allocating keys that have been seen before.  The cache 
+    holds at most max_entries keys; when full, new keys are not added.
+    Only used by buffer decoders in deterministic (default) mode.
+    """
+    class KeyCache:
+        def __init__(self, max_entries=1000):
+            self._max_entries = CBOR._check_int_argument(max_entries)
+            self._keys = dict()
+            self._hits = 0
+            self._misses = 0
+
+        def _lookup(self, raw_key):
+            key = self._keys.get(raw_key)
+            if key is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return key
+
+        def _add(self, raw_key, key):
+            if (raw_key[0] < CBOR._MT_ARRAY and 
+                len(self._keys) < self._max_entries):
+                key._immutable_flag = True
+                self._keys.setdefault(raw_key, key)
+
+        def get_hits(self):
+            return self._hits
+
+        def get_misses(self):
+            return self._misses
+
+        def clear(self):
+            self._keys.clear()
+            self._hits = 0
+            self._misses = 0
+            return self
+
+        def __len__(self):
+            return len(self._keys)
+
+    """
+    Receiver of large byte and text strings, see 
+    Decoder.set_chunk_sink().  start() is called with a flag telling
+    if the data is a text string and the total length, followed by 
+    write() calls holding the data in chunks.  The CBOR object returned
+    by finish() replaces the string in the decoded data.  Text strings
+    are validated as UTF-8 before chunks are written.
+    """
+    class ChunkSink:
+        def start(self, text, length):
+            pass
+
+        def write(self, chunk):
+            pass
+
+        def finish(self):
+            return CBOR.Null()
+
+    """
+    Decoder statistics, see Decoder.set_stats().  Counters accumulate
+    over decode_with_options() calls until clear() is called.  The
+    object counts cover decoded objects per major type, where big
+    integers count as tags.  on_limit() is called with the name
+    ("max_length" or "max_nesting_level") and value of an exceeded
+    limit, before the decoder raises an exception.
+    """
+    class DecoderStats:
+        def __init__(self):
+            self._object_counts = [0] * 8
+            self.clear()
+
+        def _measure(self, decoder):
+            byte_count = decoder.get_byte_count()
+            start = time.perf_counter()
+            try:
+                return decoder._decode_object()
+            finally:
+                self._last_decode_time = time.perf_counter() - start
+                self._decode_time += self._last_decode_time
+                self._decode_count += 1
+                self._byte_count += decoder.get_byte_count() - byte_count
+
+        def on_limit(self, limit, value):
+            pass
+
+        def get_object_count(self, major_type):
+            if CBOR._check_int_argument(major_type) not in range(8):
+                CBOR._error("Invalid major type: " + str(major_type))
+            return self._object_counts[major_type]
+
+        def get_byte_count(self):
+            return self._byte_count
+
+        def get_max_depth(self):
+            return self._max_depth
+
+        def get_decode_count(self):
+            return self._decode_count
+
+        def get_decode_time(self):
+            return self._decode_time
+
+        def get_last_decode_time(self):
+            return self._last_decode_time
+
+        def clear(self):
+            """ Counters are shared with the decoders, reset in place. """
+            self._object_counts[:] = [0] * 8
+            self._byte_count = 0
+            self._max_depth = 0
+            self._decode_count = 0
+            self._decode_time = 0.0
+            self._last_decode_time = 0.0
+            return self
 
     class _Decoder:
-        def __init__(self, cbor_stream, options, max_length):
+        def __init__(self, cbor_input, options, max_length):
             CBOR._check_int_argument(max_length)
             CBOR._check_int_argument(options)
-            if not isinstance(cbor_stream, io.BufferedIOBase):
-                CBOR._error("Unexpected stream type: " + 
-                            type(cbor_stream).__name__)
-            self._cbor_stream = cbor_stream
             self._sequence_mode = options & CBOR.SEQUENCE_MODE
             self._strict_maps = not (options & CBOR.LENIENT_MAP_DECODING)
             self._strict_numbers = not (options & CBOR.LENIENT_NUMBER_DECODING)
+            self._lazy_mode = options & CBOR.LAZY_DECODING
+            self._zero_copy = options & CBOR.ZERO_COPY_DECODING
+            self._raw_keys = False
+            self._key_cache = None
+            self._chunk_sink = None
+            self._decoding_key = False
+            self._stats = None
             self._max_length = max_length
             self._max_nesting_level = 100
 
             self._byte_count = 0
             self._nesting_level = 0
+            self._at_first_byte = False
+            self._set_input(cbor_input)
+
+        def _set_input(self, cbor_stream):
+            if not isinstance(cbor_stream, io.BufferedIOBase):
+                CBOR._error("Unexpected stream type: " + 
+                            type(cbor_stream).__name__)
+            if self._lazy_mode:
+                CBOR._error("LAZY_DECODING requires buffer input")
+            if self._zero_copy:
+                CBOR._error("ZERO_COPY_DECODING requires buffer input")
+            self._cbor_stream = cbor_stream
+
+        def _at_end_of_data(self):
+            return not self._cbor_stream.read(1)
         
         def _out_of_limit_test(self, length):
             self._byte_count += length
             if self._byte_count > self._max_length:
-                CBOR._error("Exceeded set limit: max_length={:n}".format(
-                    self._max_length))
+                self._max_length_error()
     
+        def _max_length_error(self):
+            if self._stats is not None:
+                self._stats.on_limit("max_length", self._max_length)
+            CBOR._error("Exceeded set limit: max_length={:n}".format(
+                self._max_length))
+
         def _eof_error(self):
             CBOR._error("Malformed CBOR, trying to read past EOF")
 
         def _enter_level(self):
             self._nesting_level += 1
             if self._nesting_level > self._max_nesting_level:
+                if self._stats is not None:
+                    self._stats.on_limit("max_nesting_level",
+                                         self._max_nesting_level)
                 CBOR._error("Structure nesting level exceeding: " + 
-                            self._max_nesting_level)
+                            str(self._max_nesting_level))
 
         def _read_byte(self):
             one_byte = self._cbor_stream.read(1)
@@ -1158,154 +1520,1637 @@ class CBOR:
                     CBOR._SIMPLE_FLOAT16 + (len(decoded) >> 2),
                     decoded.hex()))
 
-        def _decode_float(self, length, mask, prefix):
-            decoded = self._read_bytes(length)
-            value = CBOR._bytes_to_uint(decoded)
+        """ 
+        Unpack format, exponent mask, and significand bits that must be
+        non-zero for a non-finite number to be in its shortest form.
+        """
+        _FLOAT_FORMATS = {
+            2: ('!e', 0x7c00,             0),
+            4: ('!f', 0x7f800000,         0x1fff),
+            8: ('!d', 0x7ff0000000000000, 0x1fffffff)
+        }
+
+        def _read_float_value(self, length):
             """
-            Is it a non-finite number?
+            Returns the raw IEEE-754 bytes, the value (None for non-finite
+            numbers), and a preferred serialization flag.  Preferred 
+            serialization is verified on the raw bits and through struct
+            round-trips rather than by re-encoding the value.
             """
-            if (value & mask) == mask:
+            prefix, mask, reducible = CBOR._Decoder._FLOAT_FORMATS[length]
+            decoded = self._read_bytes(length)
+            if length == 2:
+                value = struct.unpack(prefix, decoded)[0]
+                return (decoded, value if math.isfinite(value) else None, True)
+            bits = int.from_bytes(decoded, 'big')
+            if (bits & mask) == mask:
+                preferred = bits & reducible != 0
+                value = None
+            else:
+                value = struct.unpack(prefix, decoded)[0]
                 """
-                Yes, deal with it as a distinct data type.
+                The value must not fit in the next shorter format.  
+                Note that float16 values always fit in float32.
                 """
-                non_finite = CBOR.NonFinite(value)
-                if self._strict_numbers and non_finite._value != value:
-                    self._print_float_det_err(decoded)
-                return non_finite
-            """
-            No, it is a "regular" number.
-            """
-            cbor_float = CBOR.Float(struct.unpack(prefix, decoded)[0])
-            if self._strict_numbers and cbor_float._encoded != decoded:
+                shorter = '!e' if length == 4 else '!f'
+                try:
+                    preferred = struct.unpack(
+                        shorter, struct.pack(shorter, value))[0] != value
+                except OverflowError:
+                    preferred = True
+            if self._strict_numbers and not preferred:
                 self._print_float_det_err(decoded)
-            return cbor_float
+            return (decoded, value, preferred)
 
-        def _get_object(self):
-            tag = self._read_byte()
-            """ 
-            Begin with CBOR types that are uniquely defined by the tag byte.
+        def _decode_float(self, length):
+            decoded, value, preferred = self._read_float_value(length)
+            if value is None:
+                """
+                Non-finite numbers are dealt with as a distinct data type.
+                """
+                return CBOR.NonFinite(CBOR._bytes_to_uint(decoded))
+            if preferred:
+                return CBOR.Float._create_decoded(value, decoded)
             """
-            match tag:
-                case CBOR._TAG_BIG_NEGATIVE | CBOR._TAG_BIG_UNSIGNED:
-                    position = self._byte_count
-                    byte_array = self._get_object().get_bytes()
-                    if (self._strict_numbers and 
-                        (len(byte_array) <= 8 or not byte_array[0])):
-                        CBOR._error(
-                            "Non-deterministically encoded \"bigint\" " +
-                            "(tag={:02x}, argument={:s})".format(
-                                tag, byte_array.hex()))
-                    value = CBOR._bytes_to_uint(byte_array)
-                    return CBOR.Int(value if tag == CBOR._TAG_BIG_UNSIGNED
-                                          else ~value)
-
-                case CBOR._SIMPLE_FLOAT16:
-                    return self._decode_float(2, 0x7c00, "!e")
-
-                case CBOR._SIMPLE_FLOAT32:
-                    return self._decode_float(4, 0x7f800000, "!f")
-
-                case CBOR._SIMPLE_FLOAT64:
-                    return self._decode_float(8, 0x7ff0000000000000, "!d")
-
-                case CBOR._SIMPLE_NULL:
-                    return CBOR.Null()
+            Lenient mode: let CBOR.Float find the preferred serialization.
+            """
+            return CBOR.Float(value)
 
-                case CBOR._SIMPLE_TRUE | CBOR._SIMPLE_FALSE:
-                    return CBOR.Boolean(tag == CBOR._SIMPLE_TRUE)
-            """ 
-            Then decode CBOR types that blend length of data in the tag byte.
+        def _use_chunk_sink(self, n, stack):
             """
+            Map keys, including their elements, are never replaced.
+            Neither are big integer data, nor the contents of tags
+            verified by CBOR.Tag.
+            """
+            if n < self._chunk_threshold or self._decoding_key:
+                return False
+            for frame in stack:
+                if frame[0] == CBOR._Decoder._MAP and frame[3] is None:
+                    return False
+            if stack:
+                frame = stack[-1]
+                match frame[0]:
+                    case CBOR._Decoder._BIGINT:
+                        return False
+
+                    case CBOR._Decoder._TAG:
+                        if frame[1] in CBOR._Validator._CHECKED_TAGS:
+                            return False
+
+                    case CBOR._Decoder._ARRAY:
+                        """ The id of CBOR.Tag.TAG_COTX. """
+                        if (not frame[1]._objects and len(stack) > 1 and
+                            stack[-2] == [CBOR._Decoder._TAG, 
+                                          CBOR.Tag.TAG_COTX]):
+                            return False
+            return True
+
+        def _write_chunks(self, text, length):
+            sink = self._chunk_sink
+            sink.start(text, length)
+            utf8 = codecs.getincrementaldecoder('utf-8')() if text else None
+            while length:
+                chunk = self._read_bytes(min(length, self._chunk_size))
+                length -= len(chunk)
+                if utf8:
+                    utf8.decode(chunk)
+                sink.write(chunk)
+            if utf8:
+                """ Catch truncated UTF-8 sequences. """
+                utf8.decode(bytes(), True)
+            return CBOR._cbor_argument_check(sink.finish())
+
+        def _bigint_value(self, tag, byte_array):
+            if (self._strict_numbers and 
+                (len(byte_array) <= 8 or not byte_array[0])):
+                CBOR._error(
+                    "Non-deterministically encoded \"bigint\" " +
+                    "(tag={:02x}, argument={:s})".format(
+                        tag, byte_array.hex()))
+            value = CBOR._bytes_to_uint(byte_array)
+            return value if tag == CBOR._TAG_BIG_UNSIGNED else ~value
+
+        def _read_argument(self, tag):
             n = tag & 0x1f
             if n > 27:
                 self._unsupported_tag(tag)
             if n > 23:
-                """ 
-                For 1, 2, 4, and 8 byte N.
-                """
-                q = 1 << (n - 24)
-                mask = 0xffffffff << ((q >> 1) * 8)
-                n = 0
-                while (q := q - 1) >= 0:
-                    n <<= 8
-                    n += self._read_byte()
+                n = self._read_long_argument(tag, 1 << (n - 24))
+            return n
+
+        def _read_long_argument(self, tag, length):
+            """ 
+            For 1, 2, 4, and 8 byte N.
+            """
+            argument = self._cbor_stream.read(length) or bytes()
+            """ Like byte-wise reading: max_length errors take precedence. """
+            self._out_of_limit_test(len(argument))
+            if len(argument) < length:
+                self._eof_error()
+            return self._check_long_argument(tag, length, 
+                                             int.from_bytes(argument))
+
+        def _check_long_argument(self, tag, length, n):
+            """
+            If the upper half (for 2, 4, 8 byte N) of N or a single byte
+            N is zero, a shorter variant should have been used.
+            In addition, N must be > 23. 
+            """
+            if self._strict_numbers and (
+                n < 24 or not (n & (0xffffffff << ((length >> 1) * 8)))):
+                CBOR._error("Non-deterministically encoded primitive. " +
+                            "Initial byte: 0x{:02x}".format(tag))
+            return n
+
+        """ Kinds of containers under construction, see _get_object(). """
+        _ARRAY  = 0
+        _MAP    = 1
+        _TAG    = 2
+        _BIGINT = 3
+
+        """
+        Initial byte handlers, see _DISPATCH.  Handlers return the decoded
+        object, or None if a container was pushed on the stack.
+        """
+        def _decode_unsigned(self, tag, n, stack):
+            return CBOR.Int(n)
+
+        def _decode_negative(self, tag, n, stack):
+            return CBOR.Int(~n)
+
+        def _decode_bytes(self, tag, n, stack):
+            if self._chunk_sink is not None and self._use_chunk_sink(n, stack):
+                return self._write_chunks(False, n)
+            if self._zero_copy:
+                return CBOR.Bytes._create_decoded(self._read_view(n))
+            return CBOR.Bytes(self._read_bytes(n))
+
+        def _decode_string(self, tag, n, stack):
+            if self._chunk_sink is not None and self._use_chunk_sink(n, stack):
+                return self._write_chunks(True, n)
+            if self._zero_copy:
+                return CBOR.String._create_decoded(self._read_view(n))
+            return CBOR.String(self._read_bytes(n).decode())
+
+        def _decode_array(self, tag, n, stack):
+            """ The id of CBOR.Tag.TAG_COTX is needed right away. """
+            if self._lazy_mode and (not stack or stack[-1] != 
+                    [CBOR._Decoder._TAG, CBOR.Tag.TAG_COTX]):
+                return self._lazy_array(n)
+            self._enter_level()
+            cbor_array = CBOR.Array()
+            if n:
+                stack.append([CBOR._Decoder._ARRAY, cbor_array, n])
+                return None
+            self._nesting_level -= 1
+            return cbor_array
+
+        def _decode_map(self, tag, n, stack):
+            if self._lazy_mode:
+                return self._lazy_map(n)
+            self._enter_level()
+            cbor_map = CBOR.Map()
+            if n:
+                frame = [CBOR._Decoder._MAP, 
+                         cbor_map.set_sorting_mode(self._strict_maps), 
+                         n, None, 
+                         self._position if self._raw_keys else None]
+                if self._key_cache is not None and self._raw_keys:
+                    self._intern_key(frame)
+                stack.append(frame)
+                return None
+            self._nesting_level -= 1
+            return cbor_map
+
+        def _decode_tag(self, tag, n, stack):
+            self._enter_level()
+            stack.append([CBOR._Decoder._TAG, n])
+            return None
+
+        def _decode_bigint(self, tag, n, stack):
+            stack.append([CBOR._Decoder._BIGINT, tag])
+            return None
+
+        def _decode_simple(self, tag, n, stack):
+            return CBOR.Simple(n)
+
+        def _decode_false(self, tag, n, stack):
+            return CBOR.Boolean(False)
+
+        def _decode_true(self, tag, n, stack):
+            return CBOR.Boolean(True)
+
+        def _decode_null(self, tag, n, stack):
+            return CBOR.Null()
+
+        def _decode_float16(self, tag, n, stack):
+            return self._decode_float(2)
+
+        def _decode_float32(self, tag, n, stack):
+            return self._decode_float(4)
+
+        def _decode_float64(self, tag, n, stack):
+            return self._decode_float(8)
+
+        def _decode_unsupported(self, tag, n, stack):
+            self._unsupported_tag(tag)
+
+        @staticmethod
+        def _major_type(handler, unsupported):
+            """
+            Dispatch entries for a major type: N in the initial byte,
+            followed by 1, 2, 4, and 8 byte N, and the unsupported 28-31.
+            """
+            return ([(handler, 0)] * 24 + 
+                    [(handler, 1), (handler, 2), (handler, 4), (handler, 8)] +
+                    [(unsupported, 0)] * 4)
+
+        """
+        Handler and argument length for each of the 256 initial bytes.
+        Argument length 0 means that N (if any) is a part of the initial
+        byte or that the handler reads data by itself.
+        """
+        _DISPATCH = (
+            _major_type(_decode_unsigned, _decode_unsupported) +
+            _major_type(_decode_negative, _decode_unsupported) +
+            _major_type(_decode_bytes,    _decode_unsupported) +
+            _major_type(_decode_string,   _decode_unsupported) +
+            _major_type(_decode_array,    _decode_unsupported) +
+            _major_type(_decode_map,      _decode_unsupported) +
+            _major_type(_decode_tag,      _decode_unsupported)[0:2] +
+            [(_decode_bigint, 0)] * 2 +
+            _major_type(_decode_tag,      _decode_unsupported)[4:] +
+            [(_decode_simple, 0)] * 20 + 
+            [(_decode_false, 0), (_decode_true, 0), (_decode_null, 0),
+             (_decode_simple, 0), (_decode_simple, 1),
+             (_decode_float16, 0), (_decode_float32, 0), (_decode_float64, 0)] +
+            [(_decode_unsupported, 0)] * 4)
+
+        def __init_subclass__(cls):
+            """ Subclasses may override handlers of the dispatch table. """
+            cls._DISPATCH = [(getattr(cls, handler.__name__), length)
+                             for handler, length in cls._DISPATCH]
+
+        @staticmethod
+        def _counted(handler, stats, major_type):
+            """
+            Dispatch entry wrapper used by set_stats().  Decoders without
+            statistics use the unwrapped class table and are not affected.
+            """
+            counts = stats._object_counts
+            if (major_type in (4, 5) or 
+                (major_type == 6 and handler.__name__ != '_decode_bigint')):
+                def counted(decoder, tag, n, stack):
+                    counts[major_type] += 1
+                    depth = decoder._nesting_level + 1
+                    cbor_object = handler(decoder, tag, n, stack)
+                    if depth > stats._max_depth:
+                        stats._max_depth = depth
+                    return cbor_object
+            else:
+                def counted(decoder, tag, n, stack):
+                    """ Skip the zero returned at the end of a sequence. """
+                    if not decoder._at_first_byte:
+                        counts[major_type] += 1
+                    return handler(decoder, tag, n, stack)
+            return counted
+
+        def _get_object(self):
+            """
+            Iterative decoder.  Containers under construction are kept in
+            an explicit stack holding [kind, container, remaining elements,
+            pending map key, raw map key] items.  The depth of a CBOR 
+            object is thus only limited by set_max_nesting_level().
+            """
+            dispatch = self._DISPATCH
+            stack = list()
+            while True:
+                tag = self._read_byte()
+                handler, length = dispatch[tag]
+                cbor_object = handler(self, tag, 
+                    self._read_long_argument(tag, length) if length 
+                                                          else tag & 0x1f,
+                    stack)
+                if cbor_object is None:
+                    continue
                 """
-                If the upper half (for 2, 4, 8 byte N) of N or a single byte
-                N is zero, a shorter variant should have been used.
-                In addition, N must be > 23. 
+                An object is complete, add it to the enclosing containers
+                and close those that are complete as well.
                 """
-                if self._strict_numbers and (n < 24 or not (mask & n)):
-                    CBOR._error("Non-deterministically encoded primitive. " +
-                                "Initial byte: 0x{:02x}".format(tag))
+                while stack:
+                    frame = stack[-1]
+                    match frame[0]:
+                        case CBOR._Decoder._ARRAY:
+                            """ No need for the checks performed by add(). """
+                            frame[1]._objects.append(cbor_object)
+                            frame[2] -= 1
+                            if frame[2]:
+                                break
+                            cbor_object = frame[1]
+
+                        case CBOR._Decoder._MAP:
+                            if frame[3] is None:
+                                frame[3] = cbor_object
+                                if self._raw_keys:
+                                    frame[4] = bytes(self._buffer[
+                                        frame[4]:self._position])
+                                    """ Zero-copy keys refer to the input. """
+                                    if (self._key_cache is not None and 
+                                        not self._zero_copy):
+                                        self._key_cache._add(frame[4], 
+                                                             cbor_object)
+                                break
+                            frame[1]._insert(
+                                CBOR._Entry(frame[3], cbor_object, frame[4]))
+                            frame[3] = None
+                            frame[2] -= 1
+                            if frame[2]:
+                                if self._raw_keys:
+                                    """ Start of the next key. """
+                                    frame[4] = self._position
+                                    if self._key_cache is not None:
+                                        self._intern_key(frame)
+                                break
+                            """ 
+                            Programmatically added elements sort automatically. 
+                            """
+                            cbor_object = frame[1].set_sorting_mode(False)
+
+                        case CBOR._Decoder._TAG:
+                            cbor_object = CBOR.Tag(frame[1], cbor_object)
+
+                        case CBOR._Decoder._BIGINT:
+                            cbor_object = CBOR.Int(self._bigint_value(
+                                frame[1], cbor_object.get_bytes()))
+                            stack.pop()
+                            continue
+                    stack.pop()
+                    self._nesting_level -= 1
+                if not stack:
+                    return cbor_object
+
+        #====================================#
+        #  Public _Decoder instance methods  #
+        #====================================#
+
+        def _decode_object(self):
+            self._at_first_byte = True
+            cbor_object = self._get_object()
+            if self._sequence_mode:
+                if self._at_first_byte:
+                    return None
+            elif not self._at_end_of_data():
+                CBOR._error("Unexpected data found after CBOR object")
+            return cbor_object
+
+        def decode_with_options(self):
+            if self._stats is not None:
+                return self._stats._measure(self)
+            return self._decode_object()
+
+        def decode_projection(self, paths):
+            CBOR._error("decode_projection() requires buffer input")
+
+        def set_key_cache(self, key_cache):
+            if key_cache is not None and not isinstance(key_cache, 
+                                                        CBOR.KeyCache):
+                CBOR._error("Expected 'CBOR.KeyCache' argument, got '" +
+                            type(key_cache).__name__ + "'")
+            self._key_cache = key_cache
+            return self
+
+        def set_stats(self, stats):
+            if stats is not None and not isinstance(stats, 
+                                                    CBOR.DecoderStats):
+                CBOR._error("Expected 'CBOR.DecoderStats' argument, got '" +
+                            type(stats).__name__ + "'")
+            self._stats = stats
+            if stats is None:
+                self.__dict__.pop('_DISPATCH', None)
+            else:
+                """ Instance-level table shadowing the class table. """
+                self._DISPATCH = [
+                    (CBOR._Decoder._counted(handler, stats, tag >> 5), length)
+                    for tag, (handler, length) in 
+                        enumerate(type(self)._DISPATCH)]
+            return self
+
+        def set_chunk_sink(self, chunk_sink, threshold=0x10000, 
+                           chunk_size=0x10000):
+            if chunk_sink is not None and not isinstance(chunk_sink, 
+                                                         CBOR.ChunkSink):
+                CBOR._error("Expected 'CBOR.ChunkSink' argument, got '" +
+                            type(chunk_sink).__name__ + "'")
+            self._chunk_threshold = CBOR._check_int_argument(threshold)
+            if CBOR._check_int_argument(chunk_size) < 1:
+                CBOR._error("Invalid chunk size: " + str(chunk_size))
+            self._chunk_size = chunk_size
+            self._chunk_sink = chunk_sink
+            return self
+
+        def reset(self, cbor_input):
+            """
+            Reuse the decoder for new input, keeping options and limits.
+            """
+            self._byte_count = 0
+            self._nesting_level = 0
+            self._at_first_byte = False
+            self._set_input(cbor_input)
+            return self
+
+        def get_byte_count(self):
+            return self._byte_count
+        
+        def set_max_nesting_level(self, max_level):
+            self._max_nesting_level = CBOR._check_int_argument(max_level)
+            return self
+
+    """
+    Decoder operating directly on "bytes", "bytearray", or "memoryview"
+    data.  Instead of calling stream.read() for every item, the decoder
+    indexes the buffer using an integer cursor, while byte and text strings
+    are extracted by slicing.  Non-"bytes" buffers are accessed through a
+    "memoryview" to avoid copying the input.
+    """
+    class _BufferDecoder(_Decoder):
+        def _set_input(self, cbor_buffer):
+            self._buffer = CBOR._check_buffer_argument(cbor_buffer)
+            """
+            Deterministically encoded keys are identical to their
+            re-encoding.  Then the raw input is used for map key
+            ordering checks and lookups.
+            """
+            self._raw_keys = self._strict_maps and self._strict_numbers
+            if self._zero_copy and isinstance(self._buffer, bytes):
+                """ Slicing 'bytes' would create copies. """
+                self._buffer = memoryview(self._buffer)
+            self._position = 0
+            self._limit = min(len(self._buffer), self._max_length)
+
+        def _at_end_of_data(self):
+            return self._position == len(self._buffer)
+
+        def _read_byte(self):
+            position = self._position
+            if position < self._limit:
+                self._position = position + 1
+                self._at_first_byte = False
+                return self._buffer[position]
+            if position == len(self._buffer):
+                if self._sequence_mode and self._at_first_byte:
+                    return 0
+                self._eof_error()
+            self._max_length_error()
+
+        def _skip_bytes(self, length):
+            position = self._position
+            end = position + length
+            if end > self._limit:
+                if end > self._max_length:
+                    self._max_length_error()
+                self._eof_error()
+            self._position = end
+            return position
+
+        def _read_long_argument(self, tag, length):
+            position = self._position
+            end = position + length
+            if end > self._limit:
+                """ Like byte-wise reading: the first error encountered. """
+                if self._limit == len(self._buffer):
+                    self._eof_error()
+                self._max_length_error()
+            self._position = end
+            return self._check_long_argument(tag, length, int.from_bytes(
+                self._buffer[position:end]))
+
+        def _read_bytes(self, length):
+            position = self._skip_bytes(length)
+            """ Note: bytes(bytes) returns the original object. """
+            return bytes(self._buffer[position:self._position])
+
+        def _read_view(self, length):
+            position = self._skip_bytes(length)
+            return self._buffer[position:self._position]
+
+        def _skip_object(self):
+            """
+            Move the cursor past a complete CBOR object without creating
+            any wrapper objects.  Only the framing is verified here, the
+            remaining checks are performed if the object is decoded.
+            """
+            pending = 1
+            while pending:
+                pending -= 1
+                tag = self._read_byte()
+                n = tag & 0x1f
+                if n > 23:
+                    if n > 27:
+                        self._unsupported_tag(tag)
+                    position = self._skip_bytes(1 << (n - 24))
+                    n = CBOR._bytes_to_uint(
+                        self._buffer[position:self._position])
+                match tag & 0xe0:
+                    case CBOR._MT_BYTES | CBOR._MT_STRING:
+                        self._skip_bytes(n)
+
+                    case CBOR._MT_ARRAY:
+                        pending += n
+
+                    case CBOR._MT_MAP:
+                        pending += n * 2
+
+                    case CBOR._MT_TAG:
+                        pending += 1
+
+        def _lazy_array(self, length):
+            self._enter_level()
+            cbor_array = CBOR.Array()
+            offsets = list()
+            for q in range(length):
+                offsets.append(self._position)
+                self._skip_object()
+            cbor_array._objects = [None] * length
+            cbor_array._lazy = CBOR._LazyContent(self, offsets)
+            self._nesting_level -= 1
+            return cbor_array
+
+        def _lazy_map(self, length):
+            """
+            Keys are decoded as usual since they are needed for lookups.
+            Containers in keys are decoded (and thus checked) as well,
+            since the raw key serves as encoding.
+            """
+            self._enter_level()
+            cbor_map = CBOR.Map().set_sorting_mode(self._strict_maps)
+            cbor_map._lazy = CBOR._LazyContent(self)
+            for q in range(length):
+                key_start = self._position
+                self._lazy_mode = False
+                self._decoding_key = True
+                try:
+                    key = self._get_object()
+                finally:
+                    self._lazy_mode = CBOR.LAZY_DECODING
+                    self._decoding_key = False
+                cbor_map._insert(CBOR._LazyEntry(key, 
+                    bytes(self._buffer[key_start:self._position]) 
+                        if self._raw_keys else key.encode(), 
+                    self._position))
+                self._skip_object()
+            self._nesting_level -= 1
+            return cbor_map.set_sorting_mode(False)
+
+        def _intern_key(self, frame):
+            """
+            Look up the next map key in the key cache using its raw bytes.
+            Only integers, byte strings, and text strings are considered.
+            """
+            buffer = self._buffer
+            position = self._position
+            if position >= self._limit:
+                return
+            tag = buffer[position]
+            n = tag & 0x1f
+            if tag >= CBOR._MT_ARRAY or n > 27:
+                return
+            length = 1
+            if n > 23:
+                length += 1 << (n - 24)
+                if position + length > self._limit:
+                    return
+                n = CBOR._bytes_to_uint(buffer[position + 1:position + length])
+            if tag >= CBOR._MT_BYTES:
+                length += n
+            end = position + length
+            if end > self._limit:
+                return
+            raw_key = bytes(buffer[position:end])
+            key = self._key_cache._lookup(raw_key)
+            if key is not None:
+                self._position = end
+                frame[3] = key
+                frame[4] = raw_key
+                if self._stats is not None:
+                    """ Bypasses the dispatch table. """
+                    self._stats._object_counts[tag >> 5] += 1
+
+        @staticmethod
+        def _projection_tree(paths):
             """
-            N successfully decoded, now switch on major type
-            (upper three bits).
+            Merge paths into a tree of [path indices, children, map key]
+            nodes.  Children are indexed by array index or encoded map key.
             """
+            root = [[], {}, None]
+            for index, path in enumerate(paths):
+                node = root
+                for step in path:
+                    key = None
+                    if isinstance(step, CBOR._CborObject):
+                        key = step
+                        step = bytes(step.encode())
+                    elif (type(step).__name__ != 'int' or step < 0):
+                        CBOR._error("Path elements must be CBOR.* map keys " +
+                                    "or array indices, got: " + str(step))
+                    node = node[1].setdefault(step, [[], {}, key])
+                node[0].append(index)
+            return root
+
+        @staticmethod
+        def _select(cbor_object, children, results):
+            """ For paths continuing inside a decoded object. """
+            for step, node in children.items():
+                key = node[2]
+                if key is None:
+                    if (not isinstance(cbor_object, CBOR.Array) or 
+                        step >= cbor_object.length):
+                        continue
+                    value = cbor_object.get(step)
+                else:
+                    if (not isinstance(cbor_object, CBOR.Map) or
+                        not cbor_object.contains_key(key)):
+                        continue
+                    value = cbor_object.get(key)
+                for index in node[0]:
+                    results[index] = value
+                CBOR._BufferDecoder._select(value, node[1], results)
+
+        def _project(self, node, results):
+            if node[0]:
+                """ Selected object: decode it. """
+                cbor_object = self._get_object()
+                for index in node[0]:
+                    results[index] = cbor_object
+                CBOR._BufferDecoder._select(cbor_object, node[1], results)
+                return
+            if node[1] and self._position < self._limit:
+                major_type = self._buffer[self._position] & 0xe0
+                if major_type in [CBOR._MT_ARRAY, CBOR._MT_MAP]:
+                    n = self._read_argument(self._read_byte())
+                    self._enter_level()
+                    previous_key = None
+                    for index in range(n):
+                        step = index
+                        if major_type == CBOR._MT_MAP:
+                            key_start = self._position
+                            key = self._get_object()
+                            step = (bytes(self._buffer[key_start:
+                                                       self._position]) 
+                                if self._raw_keys else bytes(key.encode()))
+                            if self._strict_maps and previous_key:
+                                if step == previous_key:
+                                    CBOR._error("Duplicate key: " + str(key))
+                                if step < previous_key:
+                                    CBOR._error(
+                                        "Non-deterministic order for key: " +
+                                        str(key))
+                            previous_key = step
+                        child = node[1].get(step)
+                        if child:
+                            self._project(child, results)
+                        else:
+                            self._skip_object()
+                    self._nesting_level -= 1
+                    return
+            """ Not selected or not a container. """
+            self._skip_object()
+
+        def decode_projection(self, paths):
+            """
+            Decode the objects addressed by paths, where each path is a
+            list of CBOR.* map keys and (integer) array indices.  Returns
+            a list with the selected objects, or None for paths that do
+            not match the data.  Map keys on the way to selected objects
+            are decoded and checked, other data is just skipped, which
+            only verifies its framing.
+            """
+            root = CBOR._BufferDecoder._projection_tree(paths)
+            results = [None] * len(paths)
+            self._at_first_byte = True
+            self._project(root, results)
+            if self._sequence_mode:
+                if self._at_first_byte:
+                    return None
+            elif not self._at_end_of_data():
+                CBOR._error("Unexpected data found after CBOR object")
+            return results
+
+        def get_byte_count(self):
+            return self._position
+
+    """
+    Buffer decoder returning native Python values, see CBOR.decode_native().
+    Uses the initial byte dispatch table of _Decoder, where handlers for
+    containers return _PENDING after pushing [kind, container, remaining
+    elements, ...] on the stack.  Always strict.
+    """
+    class _NativeDecoder(_BufferDecoder):
+        _PENDING = object()
+
+        def _decode_unsigned(self, tag, n, stack):
+            return n
+
+        def _decode_negative(self, tag, n, stack):
+            return ~n
+
+        def _decode_bytes(self, tag, n, stack):
+            return self._read_bytes(n)
+
+        def _decode_string(self, tag, n, stack):
+            return self._read_bytes(n).decode()
+
+        def _decode_array(self, tag, n, stack):
+            self._enter_level()
+            if n:
+                stack.append([CBOR._Decoder._ARRAY, list(), n])
+                return CBOR._NativeDecoder._PENDING
+            self._nesting_level -= 1
+            return list()
+
+        def _decode_map(self, tag, n, stack):
+            self._enter_level()
+            if n:
+                """ Pending key, raw key start, and previous raw key. """
+                stack.append([CBOR._Decoder._MAP, dict(), n, 
+                              CBOR._NativeDecoder._PENDING, 
+                              self._position, None])
+                return CBOR._NativeDecoder._PENDING
+            self._nesting_level -= 1
+            return dict()
+
+        def _decode_tag(self, tag, n, stack):
+            self._enter_level()
+            stack.append([CBOR._Decoder._TAG, n, self._position])
+            return CBOR._NativeDecoder._PENDING
+
+        def _decode_bigint(self, tag, n, stack):
+            header = self._read_byte()
+            if header & 0xe0 != CBOR._MT_BYTES:
+                CBOR._error("Expected 'CBOR.Bytes' after tag: " + 
+                            str(tag & 0x1f))
+            return self._bigint_value(tag, 
+                self._read_bytes(self._read_argument(header)))
+
+        def _decode_simple(self, tag, n, stack):
+            return CBOR.NativeSimple(CBOR.Simple(n)._value)
+
+        def _decode_false(self, tag, n, stack):
+            return False
+
+        def _decode_true(self, tag, n, stack):
+            return True
+
+        def _decode_null(self, tag, n, stack):
+            return None
+
+        def _decode_float16(self, tag, n, stack):
+            return self._native_float(2)
+
+        def _decode_float32(self, tag, n, stack):
+            return self._native_float(4)
+
+        def _decode_float64(self, tag, n, stack):
+            return self._native_float(8)
+
+        def _native_float(self, length):
+            decoded, value, preferred = self._read_float_value(length)
+            if value is None:
+                value = CBOR._bytes_to_uint(decoded)
+                match value:
+                    case 0x7e00: return math.nan
+                    case 0x7c00: return math.inf
+                    case 0xfc00: return -math.inf
+                return CBOR.NativeNonFinite(value)
+            return value
+
+        @staticmethod
+        def _hashable(value):
+            """ Arrays and maps used as map keys. """
+            match type(value).__name__:
+                case 'list':
+                    return tuple(CBOR._NativeDecoder._hashable(element)
+                                 for element in value)
+                case 'dict':
+                    return CBOR.FrozenMap(
+                        {key: CBOR._NativeDecoder._hashable(object) 
+                         for key, object in value.items()})
+                case 'NativeTag':
+                    return CBOR.NativeTag(value.tag_number,
+                        CBOR._NativeDecoder._hashable(value.object))
+            return value
+
+        def _native_key(self, frame, key):
+            raw_key = bytes(self._buffer[frame[4]:self._position])
+            previous = frame[5]
+            if previous is not None and raw_key <= previous:
+                if raw_key == previous:
+                    CBOR._error("Duplicate key: " + str(CBOR.decode(raw_key)))
+                CBOR._error("Non-deterministic order for key: " + 
+                            str(CBOR.decode(raw_key)))
+            frame[5] = raw_key
+            key = CBOR._NativeDecoder._hashable(key)
+            if key in frame[1]:
+                """ Like 1, 1.0, and true. """
+                CBOR._error("Map key not distinct as Python value: " +
+                            str(CBOR.decode(raw_key)))
+            return key
+
+        def _decode_native(self):
+            dispatch = self._DISPATCH
+            pending = CBOR._NativeDecoder._PENDING
+            stack = list()
+            while True:
+                tag = self._read_byte()
+                handler, length = dispatch[tag]
+                value = handler(self, tag, 
+                    self._read_long_argument(tag, length) if length 
+                                                          else tag & 0x1f,
+                    stack)
+                if value is pending:
+                    continue
+                while stack:
+                    frame = stack[-1]
+                    match frame[0]:
+                        case CBOR._Decoder._ARRAY:
+                            frame[1].append(value)
+                            frame[2] -= 1
+                            if frame[2]:
+                                break
+                            value = frame[1]
+
+                        case CBOR._Decoder._MAP:
+                            if frame[3] is pending:
+                                frame[3] = self._native_key(frame, value)
+                                break
+                            frame[1][frame[3]] = value
+                            frame[3] = pending
+                            frame[2] -= 1
+                            if frame[2]:
+                                frame[4] = self._position
+                                break
+                            value = frame[1]
+
+                        case CBOR._Decoder._TAG:
+                            if frame[1] in CBOR._Validator._CHECKED_TAGS:
+                                """ Let CBOR.Tag verify the tagged object. """
+                                CBOR.Tag(frame[1], CBOR.decode(
+                                    self._buffer[frame[2]:self._position]))
+                            value = CBOR.NativeTag(frame[1], value)
+                    stack.pop()
+                    self._nesting_level -= 1
+                if not stack:
+                    return value
+
+    #======================#  
+    #    CBOR Tokenizer    #
+    #======================#
+
+    TOKEN_INT         = 0
+    TOKEN_FLOAT       = 1
+    TOKEN_NON_FINITE  = 2
+    TOKEN_STRING      = 3
+    TOKEN_BYTES       = 4
+    TOKEN_BOOLEAN     = 5
+    TOKEN_NULL        = 6
+    TOKEN_SIMPLE      = 7
+    TOKEN_TAG         = 8
+    TOKEN_START_ARRAY = 9
+    TOKEN_START_MAP   = 10
+    TOKEN_END         = 11
+
+    """
+    Pull parser returning (token, value) tuples instead of wrapper objects.
+    Containers are reported as TOKEN_START_ARRAY/TOKEN_START_MAP with the
+    number of elements/pairs as value, followed by the elements and a
+    TOKEN_END.  TOKEN_TAG is followed by the tagged object.  Big integers
+    are returned as TOKEN_INT, while non-finite numbers are returned as
+    TOKEN_NON_FINITE holding the IEEE-754 bits (see get_non_finite()).
+    Argument and float serialization as well as nesting levels are
+    checked like in the decoder, but not map key order nor tag contents.
+    Containers are kept in an explicit stack, making memory usage
+    independent of the length of the input.
+    """
+    class _Tokenizer:
+        def __init__(self, cbor_input, options, max_length):
+            self._decoder = CBOR.init_decoder(cbor_input, options, max_length)
+
+        def __iter__(self):
+            return self._tokens()
+
+        def _read_float(self, tag):
+            decoded, value, preferred = self._decoder._read_float_value(
+                2 << (tag - CBOR._SIMPLE_FLOAT16))
+            if value is None:
+                bits = CBOR._bytes_to_uint(decoded)
+                return (CBOR.TOKEN_NON_FINITE, 
+                        bits if preferred else CBOR.NonFinite(bits)._value)
+            return (CBOR.TOKEN_FLOAT, value)
+
+        def _read_token(self, tag):
+            decoder = self._decoder
+            match tag:
+                case CBOR._TAG_BIG_NEGATIVE | CBOR._TAG_BIG_UNSIGNED:
+                    header = decoder._read_byte()
+                    if header & 0xe0 != CBOR._MT_BYTES:
+                        CBOR._error("Expected 'CBOR.Bytes' after tag: " + 
+                                    str(tag & 0x1f))
+                    return (CBOR.TOKEN_INT, decoder._bigint_value(tag,
+                        decoder._read_bytes(decoder._read_argument(header))))
+
+                case (CBOR._SIMPLE_FLOAT16 | 
+                      CBOR._SIMPLE_FLOAT32 | 
+                      CBOR._SIMPLE_FLOAT64):
+                    return self._read_float(tag)
+
+                case CBOR._SIMPLE_NULL:
+                    return (CBOR.TOKEN_NULL, None)
+
+                case CBOR._SIMPLE_TRUE | CBOR._SIMPLE_FALSE:
+                    return (CBOR.TOKEN_BOOLEAN, tag == CBOR._SIMPLE_TRUE)
+            n = decoder._read_argument(tag)
             match tag & 0xe0:
                 case CBOR._MT_SIMPLE:
-                    return CBOR.Simple(n)
+                    if n > 23 and n < 32:
+                        CBOR._error("Simple value out of range: " + str(n))
+                    return (CBOR.TOKEN_SIMPLE, n)
 
                 case CBOR._MT_TAG:
-                    self._enter_level()
-                    cborTag = CBOR.Tag(n, self._get_object())
-                    self._nesting_level -= 1
-                    return cborTag
+                    if n == 2 or n == 3:
+                        CBOR._error("Tag number reserved for 'bigint'")
+                    return (CBOR.TOKEN_TAG, n)
 
                 case CBOR._MT_UNSIGNED:
-                    return CBOR.Int(n)
+                    return (CBOR.TOKEN_INT, n)
 
                 case CBOR._MT_NEGATIVE:
-                    return CBOR.Int(~n)
+                    return (CBOR.TOKEN_INT, ~n)
 
                 case CBOR._MT_BYTES:
-                    return CBOR.Bytes(self._read_bytes(n))
+                    return (CBOR.TOKEN_BYTES, decoder._read_bytes(n))
 
                 case CBOR._MT_STRING:
-                    return CBOR.String(self._read_bytes(n).decode())
+                    return (CBOR.TOKEN_STRING, decoder._read_bytes(n).decode())
 
                 case CBOR._MT_ARRAY:
-                    self._enter_level()
-                    cborArray = CBOR.Array()
-                    for q in range(n):
-                        cborArray.add(self._get_object())
-                    self._nesting_level -= 1
-                    return cborArray
+                    return (CBOR.TOKEN_START_ARRAY, n)
 
                 case CBOR._MT_MAP:
-                    self._enter_level()
-                    cborMap = CBOR.Map().set_sorting_mode(self._strict_maps)
-                    for q in range(n):
-                        cborMap.set(self._get_object(), self._get_object())
-                    self._nesting_level -= 1
-                    """ 
-                    Programmatically added elements sort automatically. 
-                    """
-                    return cborMap.set_sorting_mode(False)
+                    return (CBOR.TOKEN_START_MAP, n)
 
-                case _:
-                    self._unsupported_tag(tag)
+        def _tokens(self):
+            decoder = self._decoder
+            while True:
+                decoder._at_first_byte = True
+                tag = decoder._read_byte()
+                if decoder._at_first_byte:
+                    """ Sequence mode and no more data. """
+                    return
+                """ Remaining elements of open containers. """
+                stack = list()
+                while True:
+                    token = self._read_token(tag)
+                    yield token
+                    match token[0]:
+                        case CBOR.TOKEN_START_ARRAY | CBOR.TOKEN_START_MAP:
+                            decoder._enter_level()
+                            count = token[1] * (2 if token[0] == 
+                                                CBOR.TOKEN_START_MAP else 1)
+                            if count:
+                                stack.append([count, True])
+                                tag = decoder._read_byte()
+                                continue
+                            decoder._nesting_level -= 1
+                            yield (CBOR.TOKEN_END, None)
 
-        #====================================#
-        #  Public _Decoder instance methods  #
-        #====================================#
+                        case CBOR.TOKEN_TAG:
+                            decoder._enter_level()
+                            stack.append([1, False])
+                            tag = decoder._read_byte()
+                            continue
+                    """ An object is complete, update enclosing containers. """
+                    while stack:
+                        top = stack[-1]
+                        top[0] -= 1
+                        if top[0]:
+                            break
+                        stack.pop()
+                        decoder._nesting_level -= 1
+                        if top[1]:
+                            yield (CBOR.TOKEN_END, None)
+                    if not stack:
+                        break
+                    tag = decoder._read_byte()
+                if not decoder._sequence_mode:
+                    if not decoder._at_end_of_data():
+                        CBOR._error("Unexpected data found after CBOR object")
+                    return
 
-        def decode_with_options(self):
-            self._at_first_byte = True
-            cbor_object = self._get_object()
-            if self._sequence_mode:
-                if self._at_first_byte:
+        #======================================#
+        #  Public _Tokenizer instance methods  #
+        #======================================#
+
+        def get_byte_count(self):
+            return self._decoder.get_byte_count()
+        
+        def set_max_nesting_level(self, max_level):
+            self._decoder.set_max_nesting_level(max_level)
+            return self
+
+    """
+    Applies the complete set of decoder checks, but without creating
+    wrapper objects.  Map keys are checked using their encoded form in
+    the input buffer.  Exceptions: keys decoded in the 
+    LENIENT_NUMBER_DECODING mode (which need to be normalized),
+    and the tagged objects of CBOR.Tag.TAG_DATE_TIME, 
+    CBOR.Tag.TAG_EPOCH_TIME, and CBOR.Tag.TAG_COTX (which are verified 
+    by CBOR.Tag).
+    """
+    class _Validator(_Tokenizer):
+        _CHECKED_TAGS = [0, 1, 1010]
+
+        def _check_key(self, frame):
+            decoder = self._decoder
+            key = bytes(decoder._buffer[frame[1]:decoder._position])
+            if not decoder._strict_numbers:
+                key = bytes(CBOR._BufferDecoder(key, 
+                    CBOR.LENIENT_NUMBER_DECODING | CBOR.LENIENT_MAP_DECODING,
+                    len(key)).decode_with_options().encode())
+            if decoder._strict_maps:
+                previous = frame[2]
+                if previous is not None and key <= previous:
+                    if key == previous:
+                        CBOR._error("Duplicate key: " + 
+                                    str(CBOR.decode(previous)))
+                    CBOR._error("Non-deterministic order for key: " + 
+                                str(CBOR.decode(key)))
+                frame[2] = key
+            else:
+                if key in frame[2]:
+                    CBOR._error("Duplicate key: " + str(CBOR.decode(key)))
+                frame[2].add(key)
+
+        def validate(self):
+            decoder = self._decoder
+            while True:
+                decoder._at_first_byte = True
+                tag = decoder._read_byte()
+                if decoder._at_first_byte:
+                    """ Sequence mode and no more data. """
+                    return
+                """ 
+                Open containers: [remaining elements, key start, map keys].
+                """
+                stack = list()
+                while True:
+                    token, value = self._read_token(tag)
+                    match token:
+                        case CBOR.TOKEN_START_ARRAY | CBOR.TOKEN_START_MAP:
+                            decoder._enter_level()
+                            if value:
+                                if token == CBOR.TOKEN_START_MAP:
+                                    stack.append([value * 2, decoder._position,
+                                        None if decoder._strict_maps 
+                                             else set()])
+                                else:
+                                    stack.append([value, None, None])
+                                tag = decoder._read_byte()
+                                continue
+                            decoder._nesting_level -= 1
+
+                        case CBOR.TOKEN_TAG:
+                            decoder._enter_level()
+                            if value in CBOR._Validator._CHECKED_TAGS:
+                                CBOR.Tag(value, decoder._get_object())
+                                decoder._nesting_level -= 1
+                            else:
+                                stack.append([1, None, None])
+                                tag = decoder._read_byte()
+                                continue
+                    """ An object is complete, update enclosing containers. """
+                    while stack:
+                        frame = stack[-1]
+                        frame[0] -= 1
+                        if frame[1] is not None:
+                            if frame[0] & 1:
+                                self._check_key(frame)
+                            else:
+                                frame[1] = decoder._position
+                        if frame[0]:
+                            break
+                        stack.pop()
+                        decoder._nesting_level -= 1
+                    if not stack:
+                        break
+                    tag = decoder._read_byte()
+                if not decoder._sequence_mode:
+                    if not decoder._at_end_of_data():
+                        CBOR._error("Unexpected data found after CBOR object")
+                    return
+
+    #============================#  
+    #  CBOR Incremental Framing  #
+    #============================#
+
+    """
+    Framing of CBOR objects arriving in parts, shared by the async and 
+    push decoders.  Data is appended to the buffer, while _next_object()
+    continues framing the current object, keeping its state between
+    calls so that every byte is only scanned once.  Limits are checked 
+    as by the other decoders, before the data they cover is needed.
+    Complete objects are decoded from their collected bytes.
+    """
+    class _IncrementalFramer(_Decoder):
+        def __init__(self, options, max_length):
+            CBOR._check_int_argument(max_length)
+            CBOR._check_int_argument(options)
+            self._options = options & ~CBOR.SEQUENCE_MODE
+            self._sequence_mode = options & CBOR.SEQUENCE_MODE
+            self._stats = None
+            self._max_length = max_length
+            self._max_nesting_level = 100
+
+            self._byte_count = 0
+            self._nesting_level = 0
+            self._buffer = bytearray()
+            """ Start of the current object and framing position. """
+            self._start = 0
+            self._scan = 0
+            """ Remaining bytes of a byte or text string. """
+            self._remaining = 0
+            """ Remaining elements of open containers. """
+            self._stack = list()
+
+        def _next_object(self):
+            """
+            Continue framing the current object.  Returns zero when the
+            object is complete, otherwise the number of bytes needed to
+            continue.
+            """
+            buffer = self._buffer
+            stack = self._stack
+            while True:
+                if self._remaining:
+                    chunk = min(self._remaining, len(buffer) - self._scan)
+                    self._scan += chunk
+                    self._remaining -= chunk
+                    if self._remaining:
+                        return self._remaining
+                else:
+                    available = len(buffer) - self._scan
+                    if not available:
+                        return 1
+                    tag = buffer[self._scan]
+                    n = tag & 0x1f
+                    if n > 27:
+                        self._unsupported_tag(tag)
+                    length = 1 + (1 << (n - 24) if n > 23 else 0)
+                    if available < length:
+                        """ Incomplete argument. """
+                        return length - available
+                    self._out_of_limit_test(length)
+                    if n > 23:
+                        n = CBOR._bytes_to_uint(
+                            buffer[self._scan + 1:self._scan + length])
+                    self._scan += length
+                    match tag & 0xe0:
+                        case CBOR._MT_BYTES | CBOR._MT_STRING:
+                            if n:
+                                self._out_of_limit_test(n)
+                                self._remaining = n
+                                continue
+
+                        case CBOR._MT_ARRAY | CBOR._MT_MAP | CBOR._MT_TAG:
+                            """ "bigint" is not counted as a level. """
+                            level = tag not in [CBOR._TAG_BIG_UNSIGNED, 
+                                                CBOR._TAG_BIG_NEGATIVE]
+                            if level:
+                                self._enter_level()
+                            match tag & 0xe0:
+                                case CBOR._MT_ARRAY: count = n
+                                case CBOR._MT_MAP:   count = n * 2
+                                case CBOR._MT_TAG:   count = 1
+                            if count:
+                                stack.append([count, level])
+                                continue
+                            self._nesting_level -= 1
+                """ An object is complete, update enclosing containers. """
+                while stack:
+                    top = stack[-1]
+                    top[0] -= 1
+                    if top[0]:
+                        break
+                    stack.pop()
+                    if top[1]:
+                        self._nesting_level -= 1
+                if not stack:
+                    return 0
+
+        def _decode_framed(self):
+            cbor_object = self._buffer[self._start:self._scan]
+            self._start = self._scan
+            decoder = CBOR._BufferDecoder(cbor_object, self._options, 
+                                          len(cbor_object))
+            decoder.set_max_nesting_level(self._max_nesting_level)
+            return decoder.set_stats(self._stats).decode_with_options()
+
+        def _compact(self):
+            """ Drop decoded data. """
+            del self._buffer[:self._start]
+            self._scan -= self._start
+            self._start = 0
+
+    #========================#  
+    #   CBOR Async Decoder   #
+    #========================#
+
+    """
+    Decoder for asyncio.StreamReader input.  The bytes of a CBOR object
+    are collected using exact-length reads guided by the framer, after 
+    which the object is decoded from the collected buffer.  The stream
+    is thus never read beyond the end of the current object.
+    """
+    class _AsyncDecoder:
+        def __init__(self, stream_reader, options, max_length):
+            self._framer = CBOR._IncrementalFramer(options, max_length)
+            if not isinstance(stream_reader, asyncio.StreamReader):
+                CBOR._error("Unexpected stream type: " + 
+                            type(stream_reader).__name__)
+            self._stream_reader = stream_reader
+
+        #=========================================#
+        #  Public _AsyncDecoder instance methods  #
+        #=========================================#
+
+        async def decode_with_options(self):
+            framer = self._framer
+            first_byte = await self._stream_reader.read(1)
+            if not first_byte:
+                if framer._sequence_mode:
                     return None
-            elif self._cbor_stream.read(1):
+                framer._eof_error()
+            framer._buffer += first_byte
+            needed = framer._next_object()
+            while needed:
+                try:
+                    framer._buffer += await self._stream_reader.readexactly(
+                        needed)
+                except asyncio.IncompleteReadError:
+                    framer._eof_error()
+                needed = framer._next_object()
+            cbor_object = framer._decode_framed()
+            framer._compact()
+            if not framer._sequence_mode and await self._stream_reader.read(1):
                 CBOR._error("Unexpected data found after CBOR object")
             return cbor_object
 
+        def __aiter__(self):
+            if not self._framer._sequence_mode:
+                CBOR._error("Iteration requires SEQUENCE_MODE")
+            return self
+
+        async def __anext__(self):
+            cbor_object = await self.decode_with_options()
+            if cbor_object is None:
+                raise StopAsyncIteration
+            return cbor_object
+
         def get_byte_count(self):
-            return self._byte_count
+            return self._framer.get_byte_count()
         
         def set_max_nesting_level(self, max_level):
-            self._max_nesting_level = CBOR._check_int_argument(max_level)
+            self._framer.set_max_nesting_level(max_level)
+            return self
+
+        def set_stats(self, stats):
+            self._framer.set_stats(stats)
+            return self
+
+    #========================#  
+    #   CBOR Push Decoder    #
+    #========================#
+
+    """
+    Decoder for data arriving in arbitrary fragments, like from
+    non-blocking sockets.  feed() frames objects incrementally, where
+    complete objects are decoded as soon as their last byte arrives.
+    """
+    class _PushDecoder:
+        def __init__(self, options, max_length):
+            self._framer = CBOR._IncrementalFramer(options, max_length)
+            self._decoded = False
+
+        #========================================#
+        #  Public _PushDecoder instance methods  #
+        #========================================#
+
+        def feed(self, data):
+            framer = self._framer
+            framer._buffer += CBOR._check_buffer_argument(data)
+            cbor_objects = list()
+            while framer._scan < len(framer._buffer):
+                if self._decoded and not framer._sequence_mode:
+                    CBOR._error("Unexpected data found after CBOR object")
+                if framer._next_object():
+                    break
+                cbor_objects.append(framer._decode_framed())
+                self._decoded = True
+            framer._compact()
+            return cbor_objects
+
+        def close(self):
+            framer = self._framer
+            if framer._buffer or not (self._decoded or framer._sequence_mode):
+                framer._eof_error()
+
+        def get_byte_count(self):
+            return self._framer.get_byte_count()
+        
+        def set_max_nesting_level(self, max_level):
+            self._framer.set_max_nesting_level(max_level)
+            return self
+
+        def set_stats(self, stats):
+            self._framer.set_stats(stats)
+            return self
+
+    #========================#  
+    #  CBOR Stream Encoding  #
+    #========================#
+
+    """
+    Output buffer for encode_to() and the sequence writer.  The
+    encoders append to it like to any bytearray, while the data is
+    written to the stream each time chunk_size is reached.  Large
+    byte and text strings are written as they are.
+    """
+    class _ChunkedBuffer(bytearray):
+        def __init__(self, stream, chunk_size):
+            super().__init__()
+            if not isinstance(stream, io.BufferedIOBase):
+                CBOR._error("Unexpected stream type: " + 
+                            type(stream).__name__)
+            if CBOR._check_int_argument(chunk_size) < 1:
+                CBOR._error("Invalid chunk size: " + str(chunk_size))
+            self._stream = stream
+            self._chunk_size = chunk_size
+            self._byte_count = 0
+
+        def __iadd__(self, data):
+            if len(data) >= self._chunk_size:
+                self._flush()
+                self._stream.write(data)
+                self._byte_count += len(data)
+                return self
+            super().__iadd__(data)
+            if len(self) >= self._chunk_size:
+                self._flush()
+            return self
+
+        def append(self, byte):
+            """ Used for single-byte objects and float headers. """
+            super().append(byte)
+            if len(self) >= self._chunk_size:
+                self._flush()
+
+        def _flush(self):
+            if self:
+                self._stream.write(bytes(self))
+                self._byte_count += len(self)
+                del self[:]
+            return self._byte_count
+
+    """
+    Writer of CBOR sequences, see CBOR.init_sequence_writer().
+    """
+    class _SequenceWriter:
+        def __init__(self, stream, chunk_size):
+            self._buffer = CBOR._ChunkedBuffer(stream, chunk_size)
+
+        #===========================================#
+        #  Public _SequenceWriter instance methods  #
+        #===========================================#
+
+        def write(self, cbor_object):
+            try:
+                CBOR._cbor_argument_check(cbor_object)._encode_into(
+                    self._buffer)
+            except RecursionError:
+                CBOR._recursion_error()
+            return self
+
+        def flush(self):
+            self._buffer._flush()
+            self._buffer._stream.flush()
+            return self
+
+        def get_byte_count(self):
+            return self._buffer._byte_count + len(self._buffer)
+
+    #========================#  
+    #      CBOR Schema       #
+    #========================#
+
+    """
+    Declarations of expected message structures for CBOR.compile_schema().
+    Leaf types are given by the names of the typed accessors without 
+    "get_", like "int32", "string", or "date_time".  In addition, "null"
+    and "any" (any object, returned as by CBOR.decode_native()) are
+    supported.
+    """
+    class SchemaMap:
+        def __init__(self):
+            self._entries = list()
+
+        def _add(self, key, schema, required):
+            CBOR._cbor_argument_check(key)
+            self._entries.append((key, schema, required))
             return self
 
+        def required(self, key, schema):
+            return self._add(key, schema, True)
+
+        def optional(self, key, schema):
+            return self._add(key, schema, False)
+
+    class SchemaArray:
+        def __init__(self, schema):
+            self._schema = schema
+
+    _SCHEMA_INT_RANGES = {
+        'int8':    (-0x80, 0x7f),
+        'uint8':   (0, 0xff),
+        'int16':   (-0x8000, 0x7fff),
+        'uint16':  (0, 0xffff),
+        'int32':   (-0x80000000, 0x7fffffff),
+        'uint32':  (0, 0xffffffff),
+        'int53':   (-9007199254740991, 9007199254740991),
+        'int64':   (-0x8000000000000000, 0x7fffffffffffffff),
+        'uint64':  (0, 0xffffffffffffffff),
+        'int128':  (-0x80000000000000000000000000000000,
+                    0x7fffffffffffffffffffffffffffffff),
+        'uint128': (0, 0xffffffffffffffffffffffffffffffff)
+    }
+
+    _SCHEMA_FLOAT_LENGTHS = {'float16': 2, 'float32': 4, 'float64': 8}
+
+    @staticmethod
+    def _schema_type_name(tag, value):
+        """ Name of a decoded object's CBOR.* type for error messages. """
+        match tag & 0xe0:
+            case CBOR._MT_UNSIGNED | CBOR._MT_NEGATIVE: return 'Int'
+            case CBOR._MT_BYTES: return 'Bytes'
+            case CBOR._MT_STRING: return 'String'
+            case CBOR._MT_ARRAY: return 'Array'
+            case CBOR._MT_MAP: return 'Map'
+            case CBOR._MT_TAG:
+                return ('Int' if tag in [CBOR._TAG_BIG_UNSIGNED, 
+                                         CBOR._TAG_BIG_NEGATIVE] else 'Tag')
+        match tag:
+            case CBOR._SIMPLE_FALSE | CBOR._SIMPLE_TRUE: return 'Boolean'
+            case CBOR._SIMPLE_NULL: return 'Null'
+            case (CBOR._SIMPLE_FLOAT16 | 
+                  CBOR._SIMPLE_FLOAT32 | 
+                  CBOR._SIMPLE_FLOAT64):
+                """ NaN with payload is returned as CBOR.NativeNonFinite. """
+                return ('Float' if isinstance(value, float) and 
+                                   math.isfinite(value) else 'NonFinite')
+        return 'Simple'
+
+    @staticmethod
+    def _schema_type_error(expected, tag, value):
+        CBOR._error("Expected 'CBOR." + expected + "', got 'CBOR." +
+                    CBOR._schema_type_name(tag, value) + "'")
+
+    @staticmethod
+    def _compile_leaf(name):
+        """ Returns a function decoding a leaf object at the cursor. """
+        if name in CBOR._SCHEMA_INT_RANGES:
+            min, max = CBOR._SCHEMA_INT_RANGES[name]
+            def parse(decoder):
+                start = decoder._position
+                value = decoder._decode_native()
+                if type(value).__name__ != 'int':
+                    CBOR._schema_type_error('Int', 
+                                            decoder._buffer[start], value)
+                return CBOR._int_range_check(value, min, max)
+            return parse
+        if name in CBOR._SCHEMA_FLOAT_LENGTHS:
+            length = CBOR._SCHEMA_FLOAT_LENGTHS[name]
+            def parse(decoder):
+                start = decoder._position
+                value = decoder._decode_native()
+                tag = decoder._buffer[start]
+                if (tag < CBOR._SIMPLE_FLOAT16 or tag > CBOR._SIMPLE_FLOAT64
+                    or not isinstance(value, float) 
+                    or not math.isfinite(value)):
+                    CBOR._schema_type_error('Float', tag, value)
+                if 2 << (tag - CBOR._SIMPLE_FLOAT16) > length:
+                    CBOR._range_error(name, str(value))
+                return value
+            return parse
+        simple_types = {
+            'bigint':  ('Int',     'int'),
+            'string':  ('String',  'str'),
+            'bytes':   ('Bytes',   'bytes'),
+            'boolean': ('Boolean', 'bool'),
+            'null':    ('Null',    'NoneType')
+        }
+        if name in simple_types:
+            expected, native_type = simple_types[name]
+            def parse(decoder):
+                start = decoder._position
+                value = decoder._decode_native()
+                if type(value).__name__ != native_type:
+                    CBOR._schema_type_error(expected, 
+                                            decoder._buffer[start], value)
+                return value
+            return parse
+        if name == 'any':
+            return lambda decoder: decoder._decode_native()
+        getter = 'get_' + str(name)
+        if not hasattr(CBOR._CborObject, getter):
+            CBOR._error("Unknown schema type: " + str(name))
+        def parse(decoder):
+            """ 
+            Other accessors work on the decoded object, which may
+            override them, like CBOR.Tag.get_date_time().
+            """
+            start = decoder._position
+            decoder._skip_object()
+            return getattr(CBOR.decode(decoder._buffer[start:
+                                                       decoder._position]),
+                           getter)()
+        return parse
+
+    @staticmethod
+    def _compile_schema(schema):
+        if isinstance(schema, CBOR.SchemaArray):
+            element = CBOR._compile_schema(schema._schema)
+            def parse(decoder):
+                start = decoder._position
+                tag = decoder._read_byte()
+                if tag & 0xe0 != CBOR._MT_ARRAY:
+                    decoder._position = start
+                    CBOR._schema_type_error('Array', tag, 
+                                            decoder._decode_native())
+                n = decoder._read_argument(tag)
+                decoder._enter_level()
+                values = [element(decoder) for q in range(n)]
+                decoder._nesting_level -= 1
+                return values
+            return parse
+        if not isinstance(schema, CBOR.SchemaMap):
+            return CBOR._compile_leaf(schema)
+        """ Entries indexed by their encoded keys. """
+        entries = dict()
+        required = list()
+        for key, value_schema, is_required in schema._entries:
+            raw_key = bytes(key.encode())
+            if raw_key in entries:
+                CBOR._error("Duplicate key: " + str(key))
+            native_key = CBOR.decode_native(raw_key)
+            entries[raw_key] = (native_key, 
+                                CBOR._compile_schema(value_schema),
+                                is_required)
+            if is_required:
+                required.append((native_key, key))
+        def parse(decoder):
+            start = decoder._position
+            tag = decoder._read_byte()
+            if tag & 0xe0 != CBOR._MT_MAP:
+                decoder._position = start
+                CBOR._schema_type_error('Map', tag, decoder._decode_native())
+            n = decoder._read_argument(tag)
+            decoder._enter_level()
+            values = dict()
+            previous = None
+            found = 0
+            for q in range(n):
+                key_start = decoder._position
+                decoder._skip_object()
+                raw_key = bytes(decoder._buffer[key_start:decoder._position])
+                if previous is not None and raw_key <= previous:
+                    if raw_key == previous:
+                        CBOR._error("Duplicate key: " + 
+                                    str(CBOR.decode(raw_key)))
+                    CBOR._error("Non-deterministic order for key: " + 
+                                str(CBOR.decode(raw_key)))
+                previous = raw_key
+                entry = entries.get(raw_key)
+                if entry is None:
+                    """ Also catches non-deterministic keys. """
+                    CBOR._error("Unexpected map key: " + 
+                                str(CBOR.decode(raw_key)))
+                values[entry[0]] = entry[1](decoder)
+                found += entry[2]
+            decoder._nesting_level -= 1
+            if found < len(required):
+                for native_key, key in required:
+                    if native_key not in values:
+                        CBOR._error("Missing key: " + str(key))
+            return values
+        return parse
+
 
     #==============================#
     #  Diagnostic Notation Parser  #
@@ -1744,18 +3589,160 @@ class CBOR:
 
    ###################################
     #          CBOR.decode()         #
+    #        CBOR.decode_lazy()      #
+    #      CBOR.decode_sequence()    #
     #       CBOR.init_decoder()      #
     ##################################
 
     @staticmethod
     def decode(cbor_bytes):
-        CBOR._check_bytes_argument(cbor_bytes)
-        return CBOR.init_decoder(io.BytesIO(cbor_bytes), 
-                                 0, len(cbor_bytes)).decode_with_options()
+        cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+        """
+        The per-thread decoder is detached while in use, making nested
+        calls (from other threads as well) create decoders of their own.
+        """
+        thread_local = CBOR._thread_local
+        decoder = getattr(thread_local, 'decoder', None)
+        if decoder is None:
+            decoder = CBOR._BufferDecoder(cbor_buffer, 0, len(cbor_buffer))
+        else:
+            thread_local.decoder = None
+            decoder._max_length = len(cbor_buffer)
+            decoder.reset(cbor_buffer)
+        try:
+            return decoder.decode_with_options()
+        finally:
+            """ Do not keep the input alive. """
+            decoder._buffer = None
+            thread_local.decoder = decoder
+
+    @staticmethod
+    def decode_native(cbor_bytes):
+        cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+        decoder = CBOR._NativeDecoder(cbor_buffer, 0, len(cbor_buffer))
+        value = decoder._decode_native()
+        if not decoder._at_end_of_data():
+            CBOR._error("Unexpected data found after CBOR object")
+        return value
 
     @staticmethod
-    def init_decoder(cbor_stream, options, max_length):
-        return CBOR._Decoder(cbor_stream, options, max_length)
+    def decode_lazy(cbor_bytes):
+        cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+        return CBOR._BufferDecoder(cbor_buffer, CBOR.LAZY_DECODING, 
+                                   len(cbor_buffer)).decode_with_options()
+
+    @staticmethod
+    def decode_projection(cbor_bytes, paths):
+        cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+        return CBOR._BufferDecoder(cbor_buffer, 0, 
+                                   len(cbor_buffer)).decode_projection(paths)
+
+    @staticmethod
+    def decode_sequence(cbor_bytes, offsets=False):
+        cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+        return CBOR._sequence_generator(
+            CBOR._BufferDecoder(cbor_buffer, CBOR.SEQUENCE_MODE, 
+                                len(cbor_buffer)),
+            CBOR._check_bool_argument(offsets))
+
+    ###################################
+    #         CBOR.validate()         #
+    ###################################
+
+    @staticmethod
+    def validate(cbor_bytes, options):
+        cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+        CBOR._Validator(cbor_buffer, 
+                        CBOR._check_int_argument(options) & 
+                            ~CBOR.LAZY_DECODING, 
+                        len(cbor_buffer)).validate()
+
+    ###################################
+    #      CBOR.decode_parallel()     #
+    ###################################
+
+    @staticmethod
+    def decode_parallel(cbor_input, native=False, max_workers=None):
+        """
+        Decode a CBOR sequence held in a buffer or in a file (given by
+        its path), using a process pool.  Item boundaries are first found
+        by skipping over the items, after which the items are split into
+        shards that are decoded in parallel.  Returns a list holding the
+        encoded items, or native values if "native" is True.
+        """
+        CBOR._check_bool_argument(native)
+        shard_count = (max_workers or os.cpu_count() or 1) * 4
+        if isinstance(cbor_input, (str, os.PathLike)):
+            source = os.fspath(cbor_input)
+            with open(source, 'rb') as file:
+                if not os.fstat(file.fileno()).st_size:
+                    return list()
+                with (mmap.mmap(file.fileno(), 0, 
+                                access=mmap.ACCESS_READ) as mapped_file,
+                      memoryview(mapped_file) as cbor_buffer):
+                    shards = CBOR._sequence_shards(cbor_buffer, shard_count)
+        else:
+            cbor_buffer = CBOR._check_buffer_argument(cbor_input)
+            source = None
+            shards = CBOR._sequence_shards(cbor_buffer, shard_count)
+        results = list()
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            jobs = list()
+            for start, end in shards:
+                jobs.append(executor.submit(CBOR._decode_shard, 
+                    source or bytes(cbor_buffer[start:end]), 
+                    start, end, native))
+            for job in jobs:
+                results += job.result()
+        return results
+
+    @staticmethod
+    def init_decoder(cbor_input, options, max_length):
+        if isinstance(cbor_input, (bytes, bytearray, memoryview)):
+            return CBOR._BufferDecoder(cbor_input, options, max_length)
+        return CBOR._Decoder(cbor_input, options, max_length)
+
+    ###################################
+    #      CBOR.init_tokenizer()      #
+    ###################################
+
+    @staticmethod
+    def init_tokenizer(cbor_input, options, max_length):
+        return CBOR._Tokenizer(cbor_input, options, max_length)
+
+    ###################################
+    #    CBOR.init_async_decoder()    #
+    ###################################
+
+    @staticmethod
+    def init_async_decoder(stream_reader, options, max_length):
+        return CBOR._AsyncDecoder(stream_reader, options, max_length)
+
+    @staticmethod
+    def init_push_decoder(options, max_length):
+        return CBOR._PushDecoder(options, max_length)
+
+    @staticmethod
+    def init_sequence_writer(stream, chunk_size=0x10000):
+        return CBOR._SequenceWriter(stream, chunk_size)
+
+    @staticmethod
+    def compile_schema(schema):
+        """
+        Returns a function that decodes and validates CBOR according to
+        schema (see CBOR.SchemaMap) in a single pass.  Maps are returned
+        as dict objects indexed by native keys, holding the entries
+        present, and arrays as list objects.
+        """
+        parse = CBOR._compile_schema(schema)
+        def decode(cbor_bytes):
+            cbor_buffer = CBOR._check_buffer_argument(cbor_bytes)
+            decoder = CBOR._NativeDecoder(cbor_buffer, 0, len(cbor_buffer))
+            value = parse(decoder)
+            if not decoder._at_end_of_data():
+                CBOR._error("Unexpected data found after CBOR object")
+            return value
+        return decode
 
     ###################################
     #      CBOR.from_diagnostic()     #
@@ -1870,6 +3857,66 @@ class CBOR:
     def _error(msg):
         raise CBOR.Exception(msg)
 
+    @staticmethod
+    def _recursion_error():
+        """
+        Unlike decoding, encoding and printing are recursive, and thus
+        limited by the Python recursion limit rather than by 
+        Decoder.set_max_nesting_level().
+        """
+        CBOR._error("Nesting exceeds the Python recursion limit: " +
+                    str(sys.getrecursionlimit()))
+
+    @staticmethod
+    def _sequence_shards(cbor_buffer, shard_count):
+        """
+        Split a CBOR sequence into (start, end) ranges of whole items,
+        without creating wrapper objects.
+        """
+        decoder = CBOR._BufferDecoder(cbor_buffer, CBOR.SEQUENCE_MODE, 
+                                      len(cbor_buffer))
+        try:
+            length = len(decoder._buffer)
+            target = max(length // shard_count, 1)
+            shards = list()
+            start = 0
+            while decoder._position < length:
+                decoder._skip_object()
+                if decoder._position - start >= target:
+                    shards.append((start, decoder._position))
+                    start = decoder._position
+            if start < length:
+                shards.append((start, length))
+            return shards
+        finally:
+            """ Permits closing memory mapped files. """
+            if isinstance(decoder._buffer, memoryview):
+                decoder._buffer.release()
+
+    @staticmethod
+    def _decode_shard(source, start, end, native):
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                file.seek(start)
+                source = file.read(end - start)
+        if native:
+            results = list()
+            decoder = CBOR._NativeDecoder(source, CBOR.SEQUENCE_MODE, 
+                                          len(source))
+            while not decoder._at_end_of_data():
+                results.append(decoder._decode_native())
+            return results
+        return [cbor_object.encode() 
+                for cbor_object in CBOR.decode_sequence(source)]
+
+    @staticmethod
+    def _sequence_generator(decoder, offsets):
+        start = 0
+        while (cbor_object := decoder.decode_with_options()) is not None:
+            end = decoder._position
+            yield (cbor_object, start, end) if offsets else cbor_object
+            start = end
+
     @staticmethod
     def _encode_string(tag, binary):
         return CBOR._generic_header(tag, len(binary)) + binary
@@ -1877,41 +3924,25 @@ class CBOR:
     @staticmethod
     def _generic_header(tag, value):
         """
-        Convert unsigned integer to bytearray (but with a twist).
+        Convert unsigned integer to header (but with a twist).
+        Arguments 0..255 come from a table, while longer arguments use
+        the shortest of 2, 4, and 8 bytes.
         """
-        array = bytearray()
-        while True:
-            array += bytes([value & 0xff])
-            value >>= 8
-            if value == 0: break
-        length = len(array)
-        """
-        Prepare for "int" encoding (1, 2, 4, 8). 
-        Only 3, 5, 6, and 7 need an action.
-        """
-        while length < 8 and length > 2 and length != 4:
-            array += bytes([0])
-            length += 1 
-        array.reverse() # Make it big endian.
-        """
-        Does this number qualify as a "bigint"?
-        """
-        if length <= 8:
-            """
-            Apparently not, encode it as "int".
-            """
-            if length == 1 and array[0] <= 23:
-                return bytearray([array[0] | tag]) # Header-only int
-            modifier = 24
-            while length := length >> 1:
-                modifier += 1
-            return bytearray([tag | modifier]) + array
+        if value < 0x100:
+            return CBOR._SMALL_HEADERS[tag >> 5][value]
+        if value < 0x10000:
+            return struct.pack('!BH', tag | 25, value)
+        if value < 0x100000000:
+            return struct.pack('!BI', tag | 26, value)
+        if value < 0x10000000000000000:
+            return struct.pack('!BQ', tag | 27, value)
         """
         True "bigint".
         """
-        return (bytearray([CBOR._TAG_BIG_UNSIGNED if tag == CBOR._MT_UNSIGNED
-                          else CBOR._TAG_BIG_NEGATIVE]) + 
-                CBOR._encode_string(CBOR._MT_BYTES, array))
+        return (bytes([CBOR._TAG_BIG_UNSIGNED if tag == CBOR._MT_UNSIGNED
+                      else CBOR._TAG_BIG_NEGATIVE]) + 
+                CBOR._encode_string(CBOR._MT_BYTES, value.to_bytes(
+                    (value.bit_length() + 7) >> 3)))
 
     @staticmethod
     def _return_converted(float16_flag, value):
@@ -1961,11 +3992,23 @@ class CBOR:
 
     @staticmethod
     def _check_bytes_argument(byte_string):  
+        """ Accepts the 'memoryview' returned by zero-copy decoding. """
+        if type(byte_string).__name__ == 'memoryview':
+            return byte_string.cast('B')
         if type(byte_string).__name__ not in ['bytes', 'bytearray']:
-            CBOR._error("Expected 'bytes' or 'bytearray' argument, got '" +
-                        type(byte_string).__name__ + "'")
+            CBOR._error("Expected 'bytes', 'bytearray' or 'memoryview' " +
+                        "argument, got '" + type(byte_string).__name__ + "'")
         return byte_string
     
+    @staticmethod
+    def _check_buffer_argument(cbor_buffer):
+        if isinstance(cbor_buffer, bytes):
+            return cbor_buffer
+        if type(cbor_buffer).__name__ not in ['bytearray', 'memoryview']:
+            CBOR._error("Expected 'bytes', 'bytearray' or 'memoryview' " +
+                        "argument, got '" + type(cbor_buffer).__name__ + "'")
+        return memoryview(cbor_buffer).cast('B')
+    
     @staticmethod
     def _cbor_argument_check(object):
         if isinstance(object, CBOR._CborObject):
@@ -1998,20 +4041,17 @@ class CBOR:
 
     @staticmethod
     def _bytes_to_uint(byte_array):
-        value = 0
-        for v in byte_array:
-            value <<= 8
-            value += v
-        return value
+        return int.from_bytes(byte_array)
     
     @staticmethod
     def _compare_byte_arrays(a, b):
-        min_index = min(len(a), len(b))
-        for i in range(min_index):
-            diff = a[i] - b[i]
-            if diff != 0:
-                return diff
-        return len(a) - len(b)
+        """
+        Python's ordering of 'bytes' and 'bytearray' objects matches
+        the CBOR map key ordering: bytewise lexicographic, where a
+        shorter array is smaller than a longer array having the same
+        leading bytes.
+        """
+        return (a > b) - (a < b)
 
     @staticmethod
     def _check_time_parameters(instant, millis, utc):
@@ -0,0 +1,78 @@
+# Testing the asyncio decoder
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import asyncio
+
+cbor = CBOR.Map().set(CBOR.Int(1), CBOR.Array().add(CBOR.String("Hi!"))
+                                               .add(CBOR.Tag(9, CBOR.Float(2.5)))
+                                               .add(CBOR.Int(1 << 70)))\
+                 .set(CBOR.Int(2), CBOR.Bytes(bytes(300))).encode()
+
+def reader_for(data, chunk_size=7):
+  reader = asyncio.StreamReader()
+  for i in range(0, len(data), chunk_size):
+    reader.feed_data(data[i:i + chunk_size])
+  reader.feed_eof()
+  return reader
+
+async def run_single():
+  decoder = CBOR.init_async_decoder(reader_for(cbor), 0, 1000)
+  object = await decoder.decode_with_options()
+  assert_true("single", object.encode() == cbor)
+  assert_true("count", decoder.get_byte_count() == len(cbor))
+
+async def run_sequence():
+  sequence = cbor + bytes([0x05]) + cbor
+  decoder = CBOR.init_async_decoder(reader_for(sequence), CBOR.SEQUENCE_MODE, 10000)
+  total = bytearray()
+  async for object in decoder:
+    total += object.encode()
+  assert_true("sequence", total == sequence)
+  assert_true("seqcount", decoder.get_byte_count() == len(sequence))
+
+async def run_remainder():
+  # The stream must not be read beyond the object
+  reader = reader_for(bytes([0x82, 0x01, 0x02]) + b'raw data')
+  decoder = CBOR.init_async_decoder(reader, CBOR.SEQUENCE_MODE, 100)
+  assert_true("rem1", (await decoder.decode_with_options()).to_diagnostic(False) == '[1,2]')
+  assert_true("rem2", await reader.read() == b'raw data')
+
+async def run_bad(data, options, max_length, error, max_level=None):
+  try:
+    decoder = CBOR.init_async_decoder(reader_for(data), options, max_length)
+    if max_level:
+      decoder.set_max_nesting_level(max_level)
+    await decoder.decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+async def run_all():
+  await run_single()
+  await run_sequence()
+  await run_remainder()
+  await run_bad(cbor[:-1], 0, 1000, 'EOF')
+  await run_bad(bytes(), 0, 1000, 'EOF')
+  await run_bad(cbor, 0, len(cbor) - 1, 'max_length')
+  await run_bad(cbor + bytes([0]), 0, 1000, 'Unexpected data')
+  await run_bad(bytes([0x18, 0x01]), 0, 100, 'Non-deterministically')
+  await run_bad(bytes([0x81, 0x81, 0x80]), 0, 100, 'nesting level', 2)
+  await run_bad(bytes([0x1f]), 0, 100, 'Unsupported tag')
+  try:
+    CBOR.init_async_decoder(reader_for(cbor), 0, 100).__aiter__()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'SEQUENCE_MODE')
+  try:
+    CBOR.init_async_decoder(cbor, 0, 100)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'Unexpected stream')
+  # Nested "bigint" at the maximum nesting level
+  nested = CBOR.Array().add(CBOR.Array().add(CBOR.Int(1 << 70))).encode()
+  decoder = CBOR.init_async_decoder(reader_for(nested), 0, 100).set_max_nesting_level(2)
+  assert_true("bigint", (await decoder.decode_with_options()).encode() == nested)
+
+asyncio.run(run_all())
+
+success()
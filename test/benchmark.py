@@ -0,0 +1,74 @@
+# benchmark.py
+
+from org.webpki.cbor import CBOR
+import io
+import timeit
+
+# Decoder microbenchmark.  Not a part of test-all.py.
+# Usage: test.sh benchmark.py
+
+ROUNDS = 200
+REPEAT = 7
+
+def payload(name, cbor_object):
+  cbor_bytes = cbor_object.encode()
+  return (name, cbor_bytes)
+
+def int_heavy():
+  cbor_array = CBOR.Array()
+  for i in range(1000):
+    cbor_array.add(CBOR.Int(i * 7919 - 3000000 if i & 1 else i % 24))
+  return cbor_array
+
+def string_heavy():
+  cbor_array = CBOR.Array()
+  for i in range(1000):
+    cbor_array.add(CBOR.String("item-{:d}".format(i) * (1 + i % 5)))
+  return cbor_array
+
+def float_heavy():
+  cbor_array = CBOR.Array()
+  for i in range(1000):
+    cbor_array.add(CBOR.Float(i / 7 if i & 1 else i + 0.5))
+  return cbor_array
+
+def mixed():
+  cbor_map = CBOR.Map()
+  for i in range(200):
+    cbor_map.set(CBOR.String("key{:d}".format(i)), CBOR.Array()
+        .add(CBOR.Int(i))
+        .add(CBOR.Float(i + 0.5))
+        .add(CBOR.Bytes(bytes(i % 16)))
+        .add(CBOR.Boolean(i & 1 == 0)))
+  return cbor_map
+
+# The stream decoder reads every item through stream.read(), like the
+# original decoder did, and serves as the baseline for the others.
+# The factors are speedups relative to the baseline.
+def stream_decode(cbor_bytes):
+  return CBOR.init_decoder(io.BytesIO(cbor_bytes), 0, 
+                           len(cbor_bytes)).decode_with_options()
+
+DECODERS = [
+  ("stream", stream_decode),
+  ("buffer", CBOR.decode),
+  ("lazy", CBOR.decode_lazy),
+  ("native", CBOR.decode_native)
+]
+
+def measure(decoder, cbor_bytes):
+  return min(timeit.repeat(lambda: decoder(cbor_bytes),
+                           number=ROUNDS, repeat=REPEAT)) / ROUNDS * 1e6
+
+print(("{:14s} {:>12s}".format("us/decode", "") + 
+       "".join("{:>9s}{:8s}".format(name, "") for name, _ in DECODERS))
+      .rstrip())
+for name, cbor_bytes in [payload("integer-heavy", int_heavy()),
+                         payload("string-heavy", string_heavy()),
+                         payload("float-heavy", float_heavy()),
+                         payload("mixed", mixed())]:
+  times = [measure(decoder, cbor_bytes) for _, decoder in DECODERS]
+  print("{:14s} {:6d} bytes".format(name, len(cbor_bytes)) +
+        "".join("{:9.1f} ({:4.1f}x)".format(time, times[0] / time)
+                for time in times))
+print("Lazy decoding does not access the elements.")
@@ -0,0 +1,86 @@
+# Testing the buffer-based decoder
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+cbor = CBOR.Map().set(CBOR.Int(1), CBOR.String("Hi!"))\
+                 .set(CBOR.Int(2), CBOR.Bytes(bytes([1, 2, 3])))\
+                 .set(CBOR.Int(3), CBOR.Array().add(CBOR.Float(2.5))).encode()
+
+for buffer in [bytes(cbor), bytearray(cbor), memoryview(cbor)]:
+  object = CBOR.decode(buffer)
+  assert_true("buf1", object.encode() == cbor)
+  assert_true("buf2", type(object.get(CBOR.Int(2)).get_bytes()) == bytes)
+
+# memoryview slices should not need to be copied
+padded = bytes([0xff]) + cbor + bytes([0xff])
+assert_true("slice", CBOR.decode(memoryview(padded)[1:-1]).encode() == cbor)
+
+def bad_decode(cbor, options, max_length, error):
+  try:
+    CBOR.init_decoder(cbor, options, max_length).decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_decode(cbor[:-1], 0, 100, 'EOF')
+bad_decode(cbor, 0, len(cbor) - 1, 'max_length')
+bad_decode(bytes([0x59, 0x01, 0x00]), 0, 10, 'max_length')
+bad_decode(bytes([0x45, 0x01]), 0, 10, 'EOF')
+bad_decode(cbor + bytes([0]), 0, 100, 'Unexpected data')
+bad_decode(bytes(), 0, 100, 'EOF')
+bad_decode("text", 0, 100, 'Unexpected stream')
+try:
+  CBOR.decode("text")
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'memoryview')
+
+sequence = bytearray(cbor) + bytes([0x05])
+decoder = CBOR.init_decoder(memoryview(sequence), CBOR.SEQUENCE_MODE, 1000)
+assert_true("seq1", decoder.decode_with_options().encode() == cbor)
+assert_true("seq2", decoder.get_byte_count() == len(cbor))
+assert_true("seq3", decoder.decode_with_options().get_int8() == 5)
+assert_true("seq4", decoder.decode_with_options() is None)
+assert_true("seq5", decoder.get_byte_count() == len(sequence))
+
+# Reusable decoders
+decoder = CBOR.init_decoder(cbor, 0, 1000)
+assert_true("reset1", decoder.decode_with_options().encode() == cbor)
+for buffer in [bytes([0x05]), bytearray(cbor), memoryview(cbor)]:
+  assert_true("reset2", decoder.reset(buffer).decode_with_options()
+                                .encode() == bytes(buffer))
+  assert_true("reset3", decoder.get_byte_count() == len(buffer))
+try:
+  decoder.reset(cbor[:-1]).decode_with_options()
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'EOF')
+assert_true("reset4", decoder.reset(cbor).decode_with_options().encode() == cbor)
+decoder = CBOR.init_decoder(io.BytesIO(cbor), CBOR.SEQUENCE_MODE, 1000)
+assert_true("reset5", decoder.decode_with_options().encode() == cbor)
+assert_true("reset6", decoder.decode_with_options() is None)
+assert_true("reset7", decoder.reset(io.BytesIO(bytes([0x05])))
+                             .decode_with_options().get_int8() == 5)
+
+# Lazy results remain bound to their own input
+first = CBOR.from_diagnostic('[1, "hello", {"a": 2}]').encode()
+decoder = CBOR.init_decoder(first, CBOR.LAZY_DECODING, 1000)
+lazy = decoder.decode_with_options()
+assert_true("reset8", decoder.reset(CBOR.from_diagnostic('[2, 99]').encode())
+                             .decode_with_options().get(1).get_int8() == 99)
+assert_true("reset9", lazy.encode() == first)
+assert_true("reset10", lazy.get(2).get(CBOR.String("a")).get_int8() == 2)
+
+# The per-thread default decoder
+CBOR.decode(cbor)
+try:
+  CBOR.decode(cbor + bytes([0]))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Unexpected data')
+assert_true("default1", CBOR.decode(cbor).encode() == cbor)
+assert_true("default2", CBOR.decode(bytes([0x05])).get_int8() == 5)
+assert_true("default3", CBOR.decode(cbor).clone().encode() == cbor)
+
+success()
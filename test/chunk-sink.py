@@ -0,0 +1,137 @@
+# Testing chunked delivery of large strings
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+class Collector(CBOR.ChunkSink):
+  def start(self, text, length):
+    self.text = text
+    self.length = length
+    self.chunks = []
+
+  def write(self, chunk):
+    self.chunks.append(bytes(chunk))
+
+  def finish(self):
+    return CBOR.Int(len(self.chunks))
+
+blob = bytes(range(256)) * 1000
+text = "€" * 50000
+sequence = (CBOR.Array().add(CBOR.Bytes(blob)).add(CBOR.String("small"))
+    .encode() + CBOR.String(text).encode() + CBOR.Bytes(bytes(10)).encode())
+
+for buffer in [True, False]:
+  sink = Collector()
+  decoder = CBOR.init_decoder(sequence if buffer else io.BytesIO(sequence),
+                              CBOR.SEQUENCE_MODE, len(sequence))
+  decoder.set_chunk_sink(sink, 1000, 4096)
+  array = decoder.decode_with_options()
+  assert_true("bin", array.get(0).get_int32() == 63 and not sink.text)
+  assert_true("bindata", b''.join(sink.chunks) == blob and 
+              sink.length == len(blob))
+  assert_true("size", max(len(chunk) for chunk in sink.chunks) == 4096)
+  assert_true("small", array.get(1).get_string() == "small")
+  assert_true("txt", decoder.decode_with_options().get_int32() == 37)
+  assert_true("txtdata", b''.join(sink.chunks).decode() == text and sink.text)
+  assert_true("below", decoder.decode_with_options().get_bytes() == bytes(10))
+  assert_true("end", decoder.decode_with_options() is None)
+
+# Default sink returns null
+decoder = CBOR.init_decoder(CBOR.Bytes(bytes(100)).encode(), 0, 200)
+assert_true("default", decoder.set_chunk_sink(CBOR.ChunkSink(), 100)
+    .decode_with_options().equals(CBOR.Null()))
+
+# Multi-byte characters split between chunks
+split = CBOR.String("a€€").encode()
+for chunk_size in range(1, 8):
+  sink = Collector()
+  CBOR.init_decoder(split, 0, 100).set_chunk_sink(sink, 0, chunk_size)\
+      .decode_with_options()
+  assert_true("split", b''.join(sink.chunks).decode() == "a€€")
+
+# Invalid UTF-8 is detected, including truncated sequences
+for bad in ["63e282e2", "6361ff62", "6261e2"]:
+  try:
+    CBOR.init_decoder(bytes.fromhex(bad), 0, 100)\
+        .set_chunk_sink(Collector(), 0, 2).decode_with_options()
+    fail("utf8")
+  except Exception as e:
+    check_exception(e, "UnicodeDecodeError('utf-8'")
+
+# Map keys are never passed to the sink
+key = "k" * 2000
+cbor_map = CBOR.Map().set(CBOR.String(key), CBOR.Bytes(bytes(2000)))\
+    .set(CBOR.Array().add(CBOR.Bytes(bytes(3000))), CBOR.String(key))
+cbor = cbor_map.encode()
+cache = CBOR.KeyCache()
+for options, cbor_input in [(0, cbor), (0, io.BytesIO(cbor)), 
+                            (CBOR.LAZY_DECODING, cbor)]:
+  for q in range(2):
+    decoder = CBOR.init_decoder(cbor_input, options, len(cbor))
+    if options == 0 and not isinstance(cbor_input, io.BytesIO):
+      decoder.set_key_cache(cache)
+    if q == 0:
+      decoder.set_chunk_sink(Collector(), 1000)
+    decoded = decoder.decode_with_options()
+    if isinstance(cbor_input, io.BytesIO):
+      cbor_input.seek(0)
+    keys = decoded.get_keys()
+    assert_true("key", keys[0].get_string() == key and 
+                keys[1].get(0).get_bytes() == bytes(3000))
+    values = [decoded.get(key) for key in keys]
+    if q == 0:
+      assert_true("sunk", values[0].get_int32() == 1 and 
+                  values[1].get_int32() == 1)
+    else:
+      assert_true("nosink", decoded.encode() == cbor)
+
+# Big integers and the contents of verified tags are not passed either
+big = 1 << 80
+cotx_id = "https://example.com/" + "x" * 100
+cbor = CBOR.Array()\
+    .add(CBOR.Int(big))\
+    .add(CBOR.Int(-big))\
+    .add(CBOR.Tag(CBOR.Tag.TAG_DATE_TIME,
+                  CBOR.String("2025-01-01T00:00:00Z")))\
+    .add(CBOR.Tag(CBOR.Tag.TAG_EPOCH_TIME, CBOR.Int(1700000000)))\
+    .add(CBOR.Tag(CBOR.Tag.TAG_COTX,
+                  CBOR.Array().add(CBOR.String(cotx_id))
+                              .add(CBOR.Bytes(bytes(20)))))\
+    .add(CBOR.Tag(8, CBOR.String("tagged"))).encode()
+for options, cbor_input in [(0, cbor), (0, io.BytesIO(cbor)), 
+                            (CBOR.LAZY_DECODING, cbor)]:
+  decoded = CBOR.init_decoder(cbor_input, options, len(cbor))\
+      .set_chunk_sink(Collector(), 0).decode_with_options()
+  assert_true("bigint", decoded.get(0).get_bigint() == big and
+              decoded.get(1).get_bigint() == -big)
+  assert_true("date", decoded.get(2).get_date_time().year == 2025)
+  assert_true("epoch", decoded.get(3).get_epoch_time().year == 2023)
+  cotx = decoded.get(4).get()
+  assert_true("cotx", cotx.get(0).get_string() == cotx_id and
+              cotx.get(1).get_int32() == 1)
+  assert_true("tag", decoded.get(5).get().get_int32() == 1)
+
+# Arguments
+for sink, threshold, chunk_size, error in [
+    ("sink", 0, 1, "Expected 'CBOR.ChunkSink' argument, got 'str'"),
+    (Collector(), 0, 0, "Invalid chunk size: 0"),
+    (Collector(), 1.0, 1, "Expected 'int', got 'float'")]:
+  try:
+    CBOR.init_decoder(bytes(1), 0, 10).set_chunk_sink(sink, threshold, 
+                                                      chunk_size)
+    fail("arg")
+  except Exception as e:
+    check_exception(e, error)
+
+class Bad(CBOR.ChunkSink):
+  def finish(self):
+    return "text"
+
+try:
+  CBOR.init_decoder(CBOR.Bytes(bytes(5)).encode(), 0, 10)\
+      .set_chunk_sink(Bad(), 0).decode_with_options()
+  fail("finish")
+except Exception as e:
+  check_exception(e, "Expected CBOR.* argument, got 'str'")
+
+success()
@@ -0,0 +1,125 @@
+# Testing decoder statistics and limit hooks
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+import asyncio
+
+class Recorder(CBOR.DecoderStats):
+  def __init__(self):
+    super().__init__()
+    self.limits = []
+
+  def on_limit(self, limit, value):
+    self.limits.append((limit, value))
+
+# [1, -2, h'01', "s", [], {1: 1(1.5)}, 2^70, true]
+cbor = CBOR.from_diagnostic('[1, -2, h\'01\', "s", [], {1: 1(1.5)}, ' +
+                            '1180591620717411303424, true]').encode()
+
+for buffer in [True, False]:
+  stats = Recorder()
+  decoder = CBOR.init_decoder(cbor if buffer else io.BytesIO(cbor), 
+                              CBOR.SEQUENCE_MODE, 1000).set_stats(stats)
+  decoder.decode_with_options()
+  assert_true("end", decoder.decode_with_options() is None)
+  counts = [stats.get_object_count(major_type) for major_type in range(8)]
+  assert_true("counts", counts == [2, 1, 2, 1, 2, 1, 2, 2])
+  assert_true("bytes", stats.get_byte_count() == len(cbor))
+  assert_true("depth", stats.get_max_depth() == 3)
+  assert_true("calls", stats.get_decode_count() == 2)
+  assert_true("time", stats.get_decode_time() >= stats.get_last_decode_time()
+              and stats.get_last_decode_time() >= 0)
+  assert_true("nolimit", not stats.limits)
+
+  # Accumulated over decoders
+  CBOR.init_decoder(bytes.fromhex("8180"), 0, 10).set_stats(stats)\
+      .decode_with_options()
+  assert_true("acc", stats.get_object_count(4) == 4 and
+              stats.get_byte_count() == len(cbor) + 2)
+  assert_true("clear", stats.clear().get_object_count(4) == 0 and
+              stats.get_max_depth() == 0)
+  CBOR.init_decoder(bytes.fromhex("8180"), 0, 10).set_stats(stats)\
+      .decode_with_options()
+  assert_true("shared", stats.get_object_count(4) == 2 and 
+              stats.get_max_depth() == 2)
+
+# Limits
+for cbor, max_length, max_level, limit in [
+    ("818181818100", 100, 3, ("max_nesting_level", 3)),
+    ("4a00000000000000000000", 5, 100, ("max_length", 5)),
+    ("8181818100", 4, 100, ("max_length", 4))]:
+  for buffer in [True, False]:
+    stats = Recorder()
+    cbor_bytes = bytes.fromhex(cbor)
+    try:
+      CBOR.init_decoder(cbor_bytes if buffer else io.BytesIO(cbor_bytes), 0, 
+                        max_length).set_max_nesting_level(max_level)\
+          .set_stats(stats).decode_with_options()
+      fail("limit")
+    except Exception as e:
+      pass
+    assert_true("hook", stats.limits == [limit])
+    assert_true("failed", stats.get_decode_count() == 1)
+
+# Incremental decoders use the same limit checks
+async def decode_async(cbor_bytes, max_length, max_level, stats):
+  reader = asyncio.StreamReader()
+  reader.feed_data(cbor_bytes)
+  reader.feed_eof()
+  await CBOR.init_async_decoder(reader, 0, max_length)\
+      .set_max_nesting_level(max_level).set_stats(stats).decode_with_options()
+
+for cbor, max_length, max_level, limit, error in [
+    ("818181818100", 100, 3, ("max_nesting_level", 3), 
+     "Structure nesting level exceeding: 3"),
+    ("4a00000000000000000000", 5, 100, ("max_length", 5),
+     "Exceeded set limit: max_length=5")]:
+  for push in [True, False]:
+    stats = Recorder()
+    cbor_bytes = bytes.fromhex(cbor)
+    try:
+      if push:
+        CBOR.init_push_decoder(0, max_length).set_max_nesting_level(max_level)\
+            .set_stats(stats).feed(cbor_bytes)
+      else:
+        asyncio.run(decode_async(cbor_bytes, max_length, max_level, stats))
+      fail("incremental")
+    except Exception as e:
+      check_exception(e, error)
+    assert_true("inchook", stats.limits == [limit])
+stats = CBOR.DecoderStats()
+CBOR.init_push_decoder(CBOR.SEQUENCE_MODE, 100).set_stats(stats)\
+    .feed(bytes.fromhex("8180820102"))
+assert_true("inccount", stats.get_decode_count() == 2 and 
+            stats.get_object_count(4) == 3 and stats.get_byte_count() == 5)
+
+# Keys served by a key cache are counted as well
+cbor = CBOR.from_diagnostic('{1: 2, "a": 3}').encode()
+stats = CBOR.DecoderStats()
+decoder = CBOR.init_decoder(cbor, 0, 100).set_key_cache(CBOR.KeyCache())\
+    .set_stats(stats)
+for q in range(2):
+  decoder.reset(cbor).decode_with_options()
+  assert_true("cached", [stats.get_object_count(major_type) 
+      for major_type in range(8)] == [3, 0, 0, 1, 0, 1, 0, 0])
+  stats.clear()
+
+# Disabling restores the class dispatch table
+decoder = CBOR.init_decoder(bytes(1), 0, 10).set_stats(CBOR.DecoderStats())
+assert_true("table", "_DISPATCH" in decoder.__dict__)
+decoder.set_stats(None).reset(bytes(1)).decode_with_options()
+assert_true("restored", "_DISPATCH" not in decoder.__dict__)
+
+for argument, error in [(5, "Expected 'CBOR.DecoderStats' argument, got 'int'")]:
+  try:
+    decoder.set_stats(argument)
+    fail("arg")
+  except Exception as e:
+    check_exception(e, error)
+try:
+  CBOR.DecoderStats().get_object_count(8)
+  fail("major")
+except Exception as e:
+  check_exception(e, "Invalid major type: 8")
+
+success()
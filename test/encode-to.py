@@ -0,0 +1,87 @@
+# Testing streamed encoding
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+class Recorder(io.BytesIO):
+  def __init__(self):
+    super().__init__()
+    self.sizes = []
+
+  def write(self, data):
+    self.sizes.append(len(data))
+    return super().write(data)
+
+document = CBOR.Map()
+for i in range(200):
+  document.set(CBOR.Int(i), CBOR.Array()
+      .add(CBOR.String("value-{:d}".format(i)))
+      .add(CBOR.Float(i + 0.5))
+      .add(CBOR.Tag(9999, CBOR.Bytes(bytes(i))))
+      .add(CBOR.Boolean(i & 1 == 0))
+      .add(CBOR.Null()))
+document.set(CBOR.String("blob"), CBOR.Bytes(bytes(5000)))
+cbor = document.encode()
+
+for chunk_size in [1, 100, 1024, 0x10000]:
+  stream = Recorder()
+  assert_true("count", document.encode_to(stream, chunk_size) == len(cbor))
+  assert_true("data", stream.getvalue() == cbor)
+  # Chunks are bounded, except for large strings written as they are
+  assert_true("sizes", all(size < chunk_size + 256 or size == 5000
+                           for size in stream.sizes))
+stream = Recorder()
+document.encode_to(stream, 1024)
+assert_true("blob", 5000 in stream.sizes)
+# Objects encoded by single bytes
+nulls = CBOR.Array()
+for i in range(100000):
+  nulls.add(CBOR.Null())
+stream = Recorder()
+nulls.encode_to(stream, 1000)
+assert_true("leaves", max(stream.sizes) <= 1000 and 
+            stream.getvalue() == nulls.encode())
+stream = Recorder()
+CBOR.Int(5).encode_to(stream)
+assert_true("small", stream.getvalue() == bytes([5]) and stream.sizes == [1])
+
+# Zero-copy and lazy input
+for options in [CBOR.ZERO_COPY_DECODING, CBOR.LAZY_DECODING]:
+  stream = io.BytesIO()
+  CBOR.init_decoder(bytes(cbor), options, len(cbor))\
+      .decode_with_options().encode_to(stream, 64)
+  assert_true("decoded", stream.getvalue() == cbor)
+
+# Sequences
+stream = Recorder()
+writer = CBOR.init_sequence_writer(stream, 1000)
+sequence = bytearray()
+for i in range(100):
+  cbor_object = CBOR.Array().add(CBOR.Int(i)).add(CBOR.String("x" * i))
+  writer.write(cbor_object)
+  sequence += cbor_object.encode()
+assert_true("pending", writer.get_byte_count() == len(sequence))
+assert_true("written", len(stream.getvalue()) < len(sequence))
+writer.flush()
+assert_true("seq", stream.getvalue() == sequence)
+assert_true("seqsizes", max(stream.sizes) < 2000)
+assert_true("decode", [cbor_object.encode() for cbor_object in 
+    CBOR.decode_sequence(stream.getvalue())] == 
+    [cbor_object.encode() for cbor_object in CBOR.decode_sequence(sequence)])
+
+for stream, chunk_size, error in [
+    (bytearray(), 100, "Unexpected stream type: bytearray"),
+    (io.BytesIO(), 0, "Invalid chunk size: 0"),
+    (io.BytesIO(), "10", "Expected 'int', got 'str'")]:
+  try:
+    CBOR.Int(1).encode_to(stream, chunk_size)
+    fail("arg")
+  except Exception as e:
+    check_exception(e, error)
+try:
+  CBOR.init_sequence_writer(io.BytesIO()).write(5)
+  fail("seqarg")
+except Exception as e:
+  check_exception(e, "Expected CBOR.* argument, got 'int'")
+
+success()
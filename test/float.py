@@ -277,5 +277,17 @@ reducedOneTurn(False, 4, 3.4028234663852886e+38, 3.4028234663852886e+38)
 reducedOneTurn(False, 4, 3.4028235e+38, 3.4028234663852886e+38)
 reducedOneTurn(False, None, 3.40282358e+38, 3.4028234663852886e+38)
 
+# The encoding is computed on first use
+lazy = CBOR.Float(2.5)
+assert_true("lazy-0", lazy._encoded is None)
+assert_true("lazy-1", lazy.length == 2 and lazy._encoded.hex() == "4100")
+for value, expected in [(1.0, "f93c00"), (-1.0, "f9bc00"), (0.0, "f90000"),
+                        (-0.0, "f98000"), (0.5, "f93800"), (-64.0, "f9d400"),
+                        (0.1, "fb3fb999999999999a"), (65505.0, "fa477fe100"),
+                        (1.401298464324817e-45, "fa00000001"),
+                        (2.9802322387695312e-08, "fa33000000"),
+                        (3.4028234663852886e+38, "fa7f7fffff"),
+                        (3.402823466385289e+38, "fb47efffffe0000001")]:
+  assert_true("short", CBOR.Float(value).encode().hex() == expected)
 
 success()
@@ -0,0 +1,65 @@
+# Testing frozen objects and their cached encoding
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+
+def static_part():
+  cbor_map = CBOR.Map()
+  for i in range(50):
+    cbor_map.set(CBOR.String("key{:d}".format(i)), CBOR.Array()
+        .add(CBOR.Int(i)).add(CBOR.Tag(500, CBOR.Map()
+            .set(CBOR.Int(1), CBOR.Float(i + 0.5)))))
+  return cbor_map
+
+static = static_part()
+expected = static.encode()
+assert_true("same", static.freeze() is static)
+assert_true("enc", static.encode() == expected)
+assert_true("cached", static._encoding == expected)
+tag = static.get(CBOR.String("key7")).get(1)
+assert_true("nested", tag._encoding is not None and 
+            tag.get()._encoding is not None)
+assert_true("equals", static.equals(static_part()))
+clone = static.clone()
+assert_true("clone", clone.encode() == expected and clone._encoding is None)
+clone.set(CBOR.Int(0), CBOR.Null())
+
+# Mutable container holding frozen parts
+response = CBOR.Map().set(CBOR.Int(1), static)
+for counter in range(3):
+  response.update(CBOR.Int(2), CBOR.Int(counter), False)
+  assert_true("resp", response.encode() == CBOR.Map()
+      .set(CBOR.Int(1), static_part())
+      .set(CBOR.Int(2), CBOR.Int(counter)).encode())
+
+# Frozen objects cannot be changed
+def frozen(operation):
+  try:
+    operation()
+    fail("frozen")
+  except Exception as e:
+    check_exception(e, "Frozen objects are immutable")
+
+frozen(lambda: static.set(CBOR.Int(5), CBOR.Int(6)))
+frozen(lambda: static.remove(CBOR.String("key0")))
+frozen(lambda: static.update(CBOR.String("key0"), CBOR.Int(6)))
+frozen(lambda: static.merge(CBOR.Map()))
+frozen(lambda: static.get(CBOR.String("key1")).add(CBOR.Int(6)))
+frozen(lambda: static.get(CBOR.String("key1")).update(0, CBOR.Int(6)))
+frozen(lambda: tag.get().set(CBOR.Int(2), CBOR.Int(6)))
+infinity = CBOR.Array().add(CBOR.Float.create_extended_float(float("inf")))
+infinity.freeze()
+frozen(lambda: infinity.get(0).set_sign(True))
+assert_true("sign", infinity.encode().hex() == "81f97c00" and
+            str(infinity.get(0)) == "Infinity")
+try:
+  CBOR.Map().set(CBOR.Array(), CBOR.Int(1)).get_keys()[0].add(CBOR.Int(1))
+  fail("key")
+except Exception as e:
+  check_exception(e, "Map keys are immutable")
+
+# Lazily decoded and primitive objects
+lazy = CBOR.decode_lazy(expected).freeze()
+assert_true("lazy", lazy.encode() == expected and lazy._encoding == expected)
+assert_true("leaf", CBOR.Int(5).freeze().encode() == bytes([5]))
+
+success()
@@ -31,6 +31,23 @@ one_turn(18446744073709551615, '1bffffffffffffffff')
 one_turn(18446744073709551616, 'c249010000000000000000')
 one_turn(-18446744073709551616, '3bffffffffffffffff')
 one_turn(-18446744073709551617, 'c349010000000000000000')
+one_turn(23, '17')
+one_turn(24, '1818')
+one_turn(-24, '37')
+one_turn(-25, '3818')
+one_turn(65535, '19ffff')
+one_turn(65536, '1a00010000')
+one_turn(4294967295, '1affffffff')
+one_turn(4294967296, '1b0000000100000000')
+one_turn(1 << 72, 'c24a01000000000000000000')
+
+# Headers of lengths and tag numbers
+assert_true("hdr-0", CBOR.Bytes(bytes(24)).encode()[:2].hex() == '5818')
+assert_true("hdr-1", CBOR.String('x' * 256).encode()[:3].hex() == '790100')
+assert_true("hdr-2", CBOR.Tag(65536, CBOR.Null()).encode().hex() == 
+            'da00010000f6')
+assert_true("hdr-3", CBOR.Tag(0xffffffffffffffff, CBOR.Null()).encode().hex()
+            == 'dbfffffffffffffffff6')
 
 try:
   CBOR.Int(1.1)
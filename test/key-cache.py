@@ -0,0 +1,67 @@
+# Testing the map key interning cache
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+
+def message(i):
+  cbor_map = CBOR.Map()
+  for key in range(1, 31):
+    cbor_map.set(CBOR.Int(key), CBOR.Int(i + key))
+  for label in ["alpha", "beta", "gamma", "x" * 300]:
+    cbor_map.set(CBOR.String(label), CBOR.String(label + str(i)))
+  cbor_map.set(CBOR.Bytes(bytes([1, 2])), CBOR.Map().set(CBOR.Int(-1000), 
+                                                         CBOR.Null()))
+  cbor_map.set(CBOR.Int(1 << 70), CBOR.Int(i))
+  cbor_map.set(CBOR.Float(2.5), CBOR.Int(i))
+  return cbor_map.encode()
+
+messages = [message(i) for i in range(10)]
+
+cache = CBOR.KeyCache()
+assert_true("empty", len(cache) == 0)
+decoder = CBOR.init_decoder(messages[0], 0, 1000).set_key_cache(cache)
+for cbor in messages:
+  decoded = decoder.reset(cbor).decode_with_options()
+  assert_true("dec1", decoded.encode() == cbor)
+  assert_true("dec2", decoded.get(CBOR.Int(5)).get_int32() == 
+      CBOR.decode(cbor).get(CBOR.Int(5)).get_int32())
+# Bigint and float keys are not cached
+assert_true("size", len(cache) == 36)
+assert_true("hits", cache.get_hits() == 36 * 9)
+assert_true("misses", cache.get_misses() == 36)
+
+# Shared cache, keys are shared as well
+other = CBOR.init_decoder(messages[1], 0, 1000).set_key_cache(cache)
+first = decoder.reset(messages[0]).decode_with_options()
+second = other.decode_with_options()
+assert_true("shared", first.get_keys()[0] is second.get_keys()[0])
+assert_true("immutable", first.get_keys()[0]._immutable_flag)
+
+# Limited size
+small = CBOR.KeyCache(5)
+decoder.set_key_cache(small).reset(messages[0]).decode_with_options()
+assert_true("small", len(small) == 5)
+assert_true("clear", len(small.clear()) == 0 and small.get_hits() == 0)
+
+# Not used in lenient mode, errors are still detected
+lenient = CBOR.init_decoder(bytes.fromhex("a1190001f6"), 
+                            CBOR.LENIENT_NUMBER_DECODING, 100)
+lenient.set_key_cache(cache).decode_with_options()
+decoder.set_key_cache(cache)
+for bad, error in [("a2616201616101", "Non-deterministic order"),
+                   ("a2616101616101", "Duplicate key"),
+                   ("a20101", "EOF"),
+                   ("a2190001f6", "Non-deterministic")]:
+  try:
+    decoder.reset(bytes.fromhex(bad)).decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+decoder.set_key_cache(None)
+
+try:
+  decoder.set_key_cache(dict())
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'CBOR.KeyCache')
+
+success()
@@ -0,0 +1,103 @@
+# Testing lazy decoding
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+inner = CBOR.Array().add(CBOR.String("deep")).add(CBOR.Map().set(
+    CBOR.String("x"), CBOR.Float(1.5)))
+map = CBOR.Map()
+for i in range(200):
+  map.set(CBOR.Int(i), CBOR.String("v" + str(i)))
+map.set(CBOR.String("inner"), inner)
+map.set(CBOR.String("tagged"), CBOR.Tag(500, CBOR.Array().add(CBOR.Int(5))))
+cbor = map.encode()
+
+lazy = CBOR.decode_lazy(cbor)
+assert_true("lazy1", lazy.length == 202)
+assert_true("lazy2", lazy._entries[5]._object is None)
+assert_true("lazy3", lazy.get(CBOR.Int(5)).get_string() == "v5")
+assert_true("lazy4", lazy._entries[6]._object is None)
+array = lazy.get(CBOR.String("inner"))
+assert_true("lazy5", array._objects[0] is None)
+assert_true("lazy6", array.get(1).get(CBOR.String("x")).get_float64() == 1.5)
+assert_true("lazy7", lazy.get_conditionally(CBOR.Int(500), CBOR.Int(3)).get_int8() == 3)
+assert_true("lazy8", lazy.contains_key(CBOR.Int(199)))
+
+# Materialization through encoding and printing
+assert_true("enc", lazy.encode() == cbor)
+assert_true("enc2", CBOR.decode_lazy(cbor).equals(map))
+assert_true("diag", CBOR.decode_lazy(cbor).to_string() == map.to_string())
+assert_true("arr", len(CBOR.decode_lazy(cbor).get(CBOR.String("inner")).to_array()) == 2)
+
+# check_for_unread() semantics are preserved
+lazy = CBOR.decode_lazy(CBOR.Array().add(CBOR.Int(1)).add(CBOR.Int(2)).encode())
+lazy.get(0).get_int8()
+try:
+  lazy.check_for_unread()
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Array element of type=CBOR.Int with value=2 was never read')
+lazy.get(1).get_int8()
+lazy.check_for_unread()
+
+# Deterministic checks are applied on materialization
+bad = bytes([0x82, 0x01, 0x18, 0x02])
+lazy = CBOR.decode_lazy(bad)
+assert_true("first", lazy.get(0).get_int8() == 1)
+try:
+  lazy.get(1)
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Non-deterministically encoded primitive')
+try:
+  CBOR.decode_lazy(bytes.fromhex('a2026374776f01636f6e65'))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Non-deterministic order for key')
+lenient = CBOR.init_decoder(bytes.fromhex('a2026374776f01636f6e65'), 
+    CBOR.LAZY_DECODING | CBOR.LENIENT_MAP_DECODING, 100).decode_with_options()
+assert_true("lenient", lenient.to_diagnostic(False) == '{1:"one",2:"two"}')
+
+# Framing errors are still found up-front
+def bad_lazy(cbor, error):
+  try:
+    CBOR.decode_lazy(cbor)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_lazy(bytes([0x82, 0x01]), 'EOF')
+bad_lazy(bytes([0x82, 0x01, 0x41]), 'max_length')
+bad_lazy(bytes([0x81, 0x01, 0x01]), 'Unexpected data')
+bad_lazy(bytes([0x81, 0x1c]), 'Unsupported tag')
+try:
+  CBOR.init_decoder(io.BytesIO(cbor), CBOR.LAZY_DECODING, 10000)
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'requires buffer')
+
+# Nesting limits are checked at materialization
+nested = CBOR.Array()
+last = nested
+for i in range(3):
+  last.add(last := CBOR.Array())
+decoder = CBOR.init_decoder(nested.encode(), CBOR.LAZY_DECODING, 100)
+lazy = decoder.set_max_nesting_level(3).decode_with_options()
+try:
+  lazy.get(0).get(0).get(0)
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'nesting level')
+
+# Containers in map keys are decoded and checked immediately
+for hex in ['a1c581180101', 'a18118010f']:
+  try:
+    CBOR.decode_lazy(bytes.fromhex(hex))
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'Non-deterministically encoded primitive')
+key = CBOR.Tag(5, CBOR.Array().add(CBOR.Int(1)))
+lazy = CBOR.decode_lazy(CBOR.Map().set(key, CBOR.Int(1)).encode())
+assert_true("tagged key", lazy.get(key).get_int32() == 1)
+
+success()
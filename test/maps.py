@@ -1,6 +1,7 @@
 # Testing map operations
 from org.webpki.cbor import CBOR
 from assertions import assert_true, assert_false, fail, success, check_exception
+import io
 
 map = CBOR.Map().set(CBOR.Int(3), 
                      CBOR.String("three")).set(CBOR.Int(4), 
@@ -43,4 +44,35 @@ mutableValue.add(CBOR.Map())
 CBOR.Map().set(CBOR.Array().add(immutableKey2), CBOR.Int(5))
 badKey("immutableKey2.add(CBOR.Int(6))")
 
+# Decoded keys (raw input is used for ordering in deterministic mode)
+keys = [CBOR.Int(10), CBOR.Int(-1), CBOR.String("a"), CBOR.String("aa"),
+        CBOR.Float(2.5), CBOR.Array().add(CBOR.Int(1)), CBOR.Boolean(False)]
+map = CBOR.Map()
+for key in keys:
+  map.set(key, CBOR.Int(1))
+cbor = map.encode()
+for buffer in [cbor, io.BytesIO(cbor)]:
+  decoded = CBOR.init_decoder(buffer, 0, 1000).decode_with_options()
+  assert_true("raw-0", decoded.encode() == cbor)
+  for key in keys:
+    assert_true("raw-1", decoded.contains_key(key))
+  for entry in decoded._entries:
+    assert_true("raw-2", entry._encoded_key == entry._key.encode())
+
+def badMap(hex, error, options=0):
+  try:
+    CBOR.init_decoder(bytes.fromhex(hex), options, 100).decode_with_options()
+    fail("Must fail!")
+  except Exception as e:
+    check_exception(e, error)
+
+badMap("a2616201616101", "Non-deterministic order")
+badMap("a2616101616101", "Duplicate key")
+badMap("a28101018101f6", "Duplicate key")
+badMap("a219000101180101", "Duplicate key", CBOR.LENIENT_NUMBER_DECODING)
+assert_true("lenient-0", 
+    CBOR.init_decoder(bytes.fromhex("a1190001f6"), 
+                      CBOR.LENIENT_NUMBER_DECODING, 100).decode_with_options()
+        .get(CBOR.Int(1)).is_null())
+
 success()
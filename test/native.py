@@ -0,0 +1,80 @@
+# Testing decoding to native Python values
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import math
+
+cbor_map = CBOR.Map()\
+    .set(CBOR.Int(1), CBOR.Array().add(CBOR.Float(2.5))
+                                  .add(CBOR.Null())
+                                  .add(CBOR.Boolean(True))
+                                  .add(CBOR.Boolean(False)))\
+    .set(CBOR.Int(-1), CBOR.Int(-1 << 80))\
+    .set(CBOR.Int(2), CBOR.Tag(99, CBOR.Simple(99)))\
+    .set(CBOR.Int(3), CBOR.Array().add(CBOR.NonFinite(0x7e00))
+                                  .add(CBOR.NonFinite(0x7c00))
+                                  .add(CBOR.NonFinite(0xfc00))
+                                  .add(CBOR.NonFinite(0x7c01)))\
+    .set(CBOR.Int(4), CBOR.Tag(0, CBOR.String("2025-01-01T00:00:00Z")))\
+    .set(CBOR.String("bytes"), CBOR.Bytes(bytes([1, 2, 3])))\
+    .set(CBOR.String("€"), CBOR.Map())\
+    .set(CBOR.Array().add(CBOR.Int(3))
+                     .add(CBOR.Map().set(CBOR.Int(1), CBOR.Array())), 
+         CBOR.Array())\
+    .set(CBOR.Tag(7, CBOR.Array()), CBOR.Int(1 << 64))
+cbor = cbor_map.encode()
+
+native = CBOR.decode_native(cbor)
+assert_true("n1", native[1] == [2.5, None, True, False])
+assert_true("n2", native[-1] == -1 << 80)
+assert_true("n3", native[2] == CBOR.NativeTag(99, CBOR.NativeSimple(99)))
+assert_true("n4", math.isnan(native[3][0]))
+assert_true("n5", native[3][1:3] == [math.inf, -math.inf])
+assert_true("n6", native[3][3] == CBOR.NativeNonFinite(0x7c01))
+assert_true("n7", native[4] == CBOR.NativeTag(0, "2025-01-01T00:00:00Z"))
+assert_true("n8", native["bytes"] == bytes([1, 2, 3]))
+assert_true("n9", native["€"] == {})
+assert_true("n10", native[(3, CBOR.FrozenMap({1: ()}))] == [])
+assert_true("n11", native[CBOR.NativeTag(7, ())] == 1 << 64)
+assert_true("n12", list(native.keys())[0:3] == [1, 2, 3])
+assert_true("n13", CBOR.decode_native(bytes([0xf6])) is None)
+assert_true("n14", CBOR.decode_native(memoryview(CBOR.Float(-0.0).encode()))
+                       == 0.0)
+
+# Same determinism checks as CBOR.decode()
+for hex in ["a2f5010101", "a201010101", "c06161", "c24101", "c20101", 
+            "f818", "fa3fc00000", "f97e01" + "00", "1801", "8201", "0000",
+            "5b0000000000000001ff", "a10001", "c1fb7ff8000000000000",
+            "fb3ff0000000000000", "f9fe00" + "a0"]:
+  cbor = bytes.fromhex(hex)
+  try:
+    CBOR.decode_native(cbor)
+    fail("Should not: " + hex)
+  except Exception as e:
+    decode_error = None
+    try:
+      CBOR.decode(cbor)
+    except Exception as wrapper_error:
+      decode_error = wrapper_error
+    if hex in ["c20101", "a10001"]:
+      # Native-only error messages
+      continue
+    assert_true("error: " + hex, repr(e) == repr(decode_error))
+
+# Python map key collisions
+for hex in ["a20001f401", "a20100f93c0001"]:
+  try:
+    CBOR.decode_native(bytes.fromhex(hex))
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'not distinct')
+
+# Nesting
+try:
+  CBOR.decode_native(bytes([0x81] * 101 + [0x01]))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'nesting level')
+assert_true("nest", CBOR.decode_native(bytes([0x81] * 100 + [0x01])) 
+    is not None)
+
+success()
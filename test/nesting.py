@@ -25,4 +25,30 @@ nest(None, 101, False)
 nest(2, 2, True)
 nest(2, 3, False)
 
+# Deeper than the Python recursion limit
+levels = 5000
+cbor = bytes([0x81] * (levels - 1) + [0x80])
+deep = CBOR.init_decoder(io.BytesIO(cbor), 0, 10000)\
+    .set_max_nesting_level(levels).decode_with_options()
+object = deep
+while object.length:
+  object = object.get(0)
+  levels -= 1
+assert_true("deep", levels == 1)
+# Encoding and printing are recursive and not covered by the limit
+for method in [lambda: deep.encode(), lambda: deep.to_string(),
+               lambda: deep.clone(), lambda: deep.equals(deep),
+               lambda: deep.encode_to(io.BytesIO())]:
+  try:
+    method()
+    fail("recursion")
+  except Exception as e:
+    check_exception(e, "Nesting exceeds the Python recursion limit")
+object = CBOR.init_decoder(
+    bytes([0xd8, 0x40] * 3000 + [0xc2, 0x49, 1] + [0] * 8), 0, 10000)\
+    .set_max_nesting_level(3000).decode_with_options()
+while type(object).__name__ == "Tag":
+  object = object.get()
+assert_true("bigint", object.get_bigint() == 1 << 64)
+
 success()
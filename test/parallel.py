@@ -0,0 +1,59 @@
+# Testing parallel decoding of sequences
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import math
+import os
+import tempfile
+
+# Guard needed for platforms starting worker processes through "spawn"
+if __name__ == '__main__':
+  items = list()
+  for i in range(500):
+    items.append(CBOR.Map().set(CBOR.Int(1), CBOR.Int(i))
+                           .set(CBOR.Int(2), CBOR.Array().add(CBOR.String("s" + str(i)))
+                                                         .add(CBOR.Float(i + 0.5))))
+  items.append(CBOR.Map().set(CBOR.Array().add(CBOR.Int(1)), 
+                              CBOR.Tag(7, CBOR.Simple(99)))
+                         .set(CBOR.Map().set(CBOR.Int(1), CBOR.Null()), 
+                              CBOR.Array().add(CBOR.Float.create_extended_float(math.inf))
+                                          .add(CBOR.NonFinite(0x7e01))
+                                          .add(CBOR.Bytes(bytes([1])))
+                                          .add(CBOR.Boolean(True))))
+  sequence = bytearray()
+  for item in items:
+    sequence += item.encode()
+
+  encoded = CBOR.decode_parallel(sequence, max_workers=3)
+  assert_true("len", len(encoded) == len(items))
+  for i in range(len(items)):
+    assert_true("enc", encoded[i] == items[i].encode())
+
+  native = CBOR.decode_parallel(memoryview(sequence), True, 2)
+  assert_true("nat1", native[7] == {1: 7, 2: ["s7", 7.5]})
+  assert_true("nat2", native[-1] == {
+      (1,): CBOR.NativeTag(7, CBOR.NativeSimple(99)),
+      CBOR.FrozenMap({1: None}): [math.inf, CBOR.NativeNonFinite(0x7e01), bytes([1]), True]})
+
+  with tempfile.TemporaryDirectory() as directory:
+    file_name = os.path.join(directory, 'sequence.cbor')
+    with open(file_name, 'wb') as file:
+      file.write(sequence)
+    assert_true("file", CBOR.decode_parallel(file_name, max_workers=2) == encoded)
+    with open(file_name, 'wb') as file:
+      file.write(sequence + bytes([0x82, 0x01]))
+    try:
+      CBOR.decode_parallel(file_name, max_workers=2)
+      fail("Should not")
+    except Exception as e:
+      check_exception(e, 'EOF')
+    with open(file_name, 'wb') as file:
+      pass
+    assert_true("empty", CBOR.decode_parallel(file_name) == [])
+
+  try:
+    CBOR.decode_parallel(sequence + bytes([0x18, 0x01]), max_workers=2)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'Non-deterministically')
+
+success()
@@ -0,0 +1,71 @@
+# Testing projection decoding
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+HEADER = CBOR.String("header")
+ROUTE = CBOR.String("route")
+BODY = CBOR.String("body")
+
+message = CBOR.Map()\
+    .set(HEADER, CBOR.Map()
+        .set(CBOR.Int(1), CBOR.Int(500))
+        .set(ROUTE, CBOR.Array()
+            .add(CBOR.Int(7))
+            .add(CBOR.Map().set(CBOR.Int(2), CBOR.Int(-3)))))\
+    .set(BODY, CBOR.Bytes(bytes(1000)))\
+    .set(CBOR.Float(2.5), CBOR.Array().add(CBOR.String("x" * 100)))
+cbor = message.encode()
+
+results = CBOR.decode_projection(cbor, [
+    [HEADER, CBOR.Int(1)],
+    [HEADER, ROUTE, 1, CBOR.Int(2)],
+    [HEADER, ROUTE, 2],
+    [BODY, 0],
+    [CBOR.String("missing")],
+    [CBOR.Float(2.5)],
+    [CBOR.Float(2.5), 0],
+    [HEADER, ROUTE],
+    [HEADER, ROUTE, 0],
+    []])
+assert_true("p1", results[0].get_int32() == 500)
+assert_true("p2", results[1].get_int32() == -3)
+assert_true("p3", results[2] is None)
+assert_true("p4", results[3] is None)
+assert_true("p5", results[4] is None)
+assert_true("p6", results[5].get(0).get_string() == "x" * 100)
+assert_true("p7", results[6].get_string() == "x" * 100)
+assert_true("p8", results[7].length == 2)
+assert_true("p9", results[8].get_int32() == 7)
+assert_true("p10", results[9].encode() == cbor)
+assert_true("p11", CBOR.decode_projection(cbor, []) == [])
+
+# Sequences
+sequence = bytearray(cbor) + CBOR.Array().add(CBOR.Int(9)).encode()
+decoder = CBOR.init_decoder(sequence, CBOR.SEQUENCE_MODE, len(sequence))
+assert_true("seq1", decoder.decode_projection([[0]])[0] is None)
+assert_true("seq2", decoder.decode_projection([[0]])[0].get_int32() == 9)
+assert_true("seq3", decoder.decode_projection([[0]]) is None)
+
+def bad_projection(cbor, paths, error, options=0):
+  try:
+    CBOR.init_decoder(cbor, options, 2000).decode_projection(paths)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_projection(cbor[:-1], [[HEADER, CBOR.Int(1)]], 'EOF')
+bad_projection(cbor + bytes([0]), [[BODY]], 'Unexpected data')
+bad_projection(bytes.fromhex("a2616201616101"), [[CBOR.String("a")]], 
+               'Non-deterministic order')
+bad_projection(bytes.fromhex("a2616101616101"), [[CBOR.String("b")]],
+               'Duplicate key')
+bad_projection(bytes.fromhex("a1190001f6"), [[CBOR.Int(1)]], 'Non-deterministic')
+bad_projection(cbor, [["header"]], 'Path elements')
+bad_projection(cbor, [[-1]], 'Path elements')
+bad_projection(io.BytesIO(cbor), [[BODY]], 'buffer input')
+assert_true("lenient", CBOR.init_decoder(bytes.fromhex("a1190001f6"), 
+    CBOR.LENIENT_NUMBER_DECODING, 5).decode_projection([[CBOR.Int(1)]])[0]
+        .is_null())
+
+success()
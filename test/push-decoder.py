@@ -0,0 +1,63 @@
+# Testing the push-mode decoder
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+
+objects = [CBOR.Map().set(CBOR.Int(1), CBOR.String("Hi!"))
+                     .set(CBOR.Int(2), CBOR.Bytes(bytes(300))),
+           CBOR.Int(-0x1234567890abcdef1234567890),
+           CBOR.Float(2.5),
+           CBOR.Array().add(CBOR.Array()).add(CBOR.String("")),
+           CBOR.Tag(1234, CBOR.Int(5)),
+           CBOR.Int(0)]
+sequence = bytearray()
+for object in objects:
+  sequence += object.encode()
+
+def feed_all(fragment_size):
+  decoder = CBOR.init_push_decoder(CBOR.SEQUENCE_MODE, len(sequence))
+  decoded = []
+  for q in range(0, len(sequence), fragment_size):
+    decoded += decoder.feed(sequence[q:q + fragment_size])
+  decoder.close()
+  assert_true("count", decoder.get_byte_count() == len(sequence))
+  return decoded
+
+for fragment_size in [1, 2, 3, 7, 100, len(sequence)]:
+  decoded = feed_all(fragment_size)
+  assert_true("length", len(decoded) == len(objects))
+  for q in range(len(objects)):
+    assert_true("object", decoded[q].equals(objects[q]))
+
+# Fragments are only returned when complete
+decoder = CBOR.init_push_decoder(0, 100)
+cbor = CBOR.Array().add(CBOR.Int(300)).encode()
+assert_true("part1", decoder.feed(cbor[:2]) == [])
+assert_true("part2", decoder.feed(memoryview(cbor)[2:])[0].equals(
+    CBOR.Array().add(CBOR.Int(300))))
+decoder.close()
+
+def bad_feed(fragments, options, max_length, error, close=False):
+  try:
+    decoder = CBOR.init_push_decoder(options, max_length)
+    for fragment in fragments:
+      decoder.feed(fragment)
+    if close:
+      decoder.close()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_feed([bytes([0x82, 0x01])], 0, 100, 'EOF', True)
+bad_feed([bytes([0x19, 0x01])], CBOR.SEQUENCE_MODE, 100, 'EOF', True)
+bad_feed([], 0, 100, 'EOF', True)
+bad_feed([bytes([0x01]), bytes([0x01])], 0, 100, 'Unexpected data')
+bad_feed([bytes([0x1c])], 0, 100, 'Unsupported tag')
+bad_feed([bytes([0x18]), bytes([0x01])], 0, 100, 'Non-deterministic')
+bad_feed([bytes([0x59, 0x01, 0x00])], 0, 100, 'max_length')
+bad_feed([bytes([0x81] * 101)], 0, 200, 'nesting level')
+bad_feed(["text"], 0, 100, 'memoryview')
+
+# Empty sequence is fine
+CBOR.init_push_decoder(CBOR.SEQUENCE_MODE, 100).close()
+
+success()
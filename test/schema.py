@@ -0,0 +1,139 @@
+# Testing schema-compiled decoders
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import datetime
+
+ALG = CBOR.String("alg")
+KID = CBOR.String("kid")
+
+decode = CBOR.compile_schema(CBOR.SchemaMap()
+    .required(CBOR.Int(1), "string")
+    .required(CBOR.Int(2), "uint32")
+    .optional(CBOR.Int(3), CBOR.SchemaArray("string"))
+    .required(CBOR.Int(4), CBOR.SchemaMap()
+        .required(ALG, "int8")
+        .optional(KID, "bytes"))
+    .optional(CBOR.Int(5), "date_time")
+    .optional(CBOR.Int(6), "float16")
+    .optional(CBOR.Int(7), CBOR.SchemaArray(CBOR.SchemaArray("boolean")))
+    .optional(CBOR.Int(8), "any")
+    .optional(CBOR.Int(-1), "null")
+    .optional(CBOR.Int(-2), "bigint"))
+
+def token():
+  return CBOR.Map()\
+      .set(CBOR.Int(1), CBOR.String("issuer"))\
+      .set(CBOR.Int(2), CBOR.Int(1700000000))\
+      .set(CBOR.Int(4), CBOR.Map().set(ALG, CBOR.Int(-7)))
+
+assert_true("min", decode(token().encode()) == 
+    {1: "issuer", 2: 1700000000, 4: {"alg": -7}})
+
+full = token()\
+    .set(CBOR.Int(3), CBOR.Array().add(CBOR.String("a")))\
+    .set(CBOR.Int(5), CBOR.String("2025-01-01T00:00:00Z"))\
+    .set(CBOR.Int(6), CBOR.Float(2.5))\
+    .set(CBOR.Int(7), CBOR.Array().add(CBOR.Array())
+                                  .add(CBOR.Array().add(CBOR.Boolean(True))))\
+    .set(CBOR.Int(8), CBOR.Tag(5, CBOR.Map().set(CBOR.Int(1), CBOR.Null())))\
+    .set(CBOR.Int(-1), CBOR.Null())\
+    .set(CBOR.Int(-2), CBOR.Int(-1 << 70))
+full.get(CBOR.Int(4)).set(KID, CBOR.Bytes(bytes([1, 2])))
+result = decode(full.encode())
+assert_true("full1", result[3] == ["a"])
+assert_true("full2", result[4] == {"alg": -7, "kid": bytes([1, 2])})
+assert_true("full3", result[5] == 
+    datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc))
+assert_true("full4", result[6] == 2.5)
+assert_true("full5", result[7] == [[], [True]])
+assert_true("full6", result[8] == CBOR.NativeTag(5, {1: None}))
+assert_true("full7", result[-1] is None)
+assert_true("full8", result[-2] == -1 << 70)
+
+def replaced(key, object):
+  cbor_map = token()
+  cbor_map.update(key, object, False)
+  return cbor_map
+
+def bad(cbor_object, error, cbor=None):
+  try:
+    decode(cbor if cbor else cbor_object.encode())
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad(replaced(CBOR.Int(2), CBOR.Int(-1)), 'Value out of range for "uint32"')
+bad(replaced(CBOR.Int(2), CBOR.String("1")), 
+    "Expected 'CBOR.Int', got 'CBOR.String'")
+bad(replaced(CBOR.Int(1), CBOR.Int(1)), 
+    "Expected 'CBOR.String', got 'CBOR.Int'")
+bad(replaced(CBOR.Int(4), CBOR.Array()), 
+    "Expected 'CBOR.Map', got 'CBOR.Array'")
+bad(replaced(CBOR.Int(3), CBOR.Map()), 
+    "Expected 'CBOR.Array', got 'CBOR.Map'")
+bad(replaced(CBOR.Int(6), CBOR.Float(1.0e+10)), 
+    'Value out of range for "float16"')
+bad(replaced(CBOR.Int(6), CBOR.Float.create_extended_float(float("nan"))), 
+    "Expected 'CBOR.Float', got 'CBOR.NonFinite'")
+# NaN with payload
+for schema, expected in [("float64", "Float"), ("int32", "Int")]:
+  try:
+    CBOR.compile_schema(schema)(CBOR.NonFinite(0x7c01).encode())
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, "Expected 'CBOR." + expected + 
+                       "', got 'CBOR.NonFinite'")
+bad(replaced(CBOR.Int(-1), CBOR.Boolean(False)), 
+    "Expected 'CBOR.Null', got 'CBOR.Boolean'")
+bad(replaced(CBOR.Int(5), CBOR.String("2025")), 'Invalid ISO format')
+bad(replaced(CBOR.Int(9), CBOR.Int(9)), 'Unexpected map key: 9')
+missing = token()
+missing.remove(CBOR.Int(2))
+bad(missing, 'Missing key: 2')
+# Optional entries must not make up for missing required ones
+optional = CBOR.compile_schema(CBOR.SchemaMap()
+    .required(CBOR.Int(1), 'int32')
+    .required(CBOR.Int(2), 'int32')
+    .optional(CBOR.Int(3), 'boolean'))
+try:
+  optional(CBOR.from_diagnostic('{1: 5, 3: true}').encode())
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Missing key: 2')
+assert_true("optional", optional(CBOR.from_diagnostic('{1: 5, 2: 6}').encode())
+            == {1: 5, 2: 6})
+bad(token(), 'Unexpected data', token().encode() + bytes([0]))
+bad(token(), 'Non-deterministic', bytes.fromhex("a11801f6"))
+bad(token(), 'Non-deterministic order', bytes.fromhex("a20205016161"))
+bad(token(), 'Duplicate key', bytes.fromhex("a2016161016161"))
+bad(token(), 'EOF', token().encode()[:-1])
+
+for schema, error in [("int7", "Unknown schema type"),
+                      (CBOR.SchemaMap().required(CBOR.Int(1), "int8")
+                                       .optional(CBOR.Int(1), "int8"),
+                       "Duplicate key")]:
+  try:
+    CBOR.compile_schema(schema)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+try:
+  CBOR.SchemaMap().required(1, "int8")
+  fail("Should not")
+except Exception as e:
+  check_exception(e, "CBOR.*")
+
+# Accessors overridden by CBOR.Tag
+instant = CBOR.compile_schema("date_time")(
+    CBOR.Tag(0, CBOR.String("2025-01-01T00:00:00Z")).encode())
+assert_true("tag0", instant == 
+    datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc))
+instant = CBOR.compile_schema("epoch_time")(
+    CBOR.Tag(1, CBOR.Int(1700000000)).encode())
+assert_true("tag1", instant.timestamp() == 1700000000)
+
+assert_true("array", CBOR.compile_schema(CBOR.SchemaArray("int16"))(
+    CBOR.Array().add(CBOR.Int(-300)).encode()) == [-300])
+
+success()
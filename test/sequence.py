@@ -27,5 +27,29 @@ while True:
   if object is None: break
   array_sequence.add(object)
 assert_true("Comp5", array_sequence.encode_as_sequence() == cbor)
+total = bytearray()
+for object in CBOR.decode_sequence(cbor):
+  total += object.encode()
+assert_true("Comp6", total == cbor)
+assert_true("Comp7", list(CBOR.decode_sequence(bytes())) == [])
+offsets = list()
+for object, start, end in CBOR.decode_sequence(memoryview(cbor), True):
+  assert_true("Comp8", object.encode() == cbor[start:end])
+  offsets.append((start, end))
+assert_true("Comp9", offsets == [(0, 1), (1, 6)])
+try:
+  list(CBOR.decode_sequence(cbor[:-1]))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'max_length')
+# Nested containers encode into the same buffer
+nested = CBOR.from_diagnostic('[[{"a": [1(1.5)]}, h\'010203\'], ' + 
+                              '{1: [[], {}], 2: 8("x")}, -5]')
+expected = bytes.fromhex("82a1616181c1f93e0043010203" + 
+                         "a2018280a002c8617824")
+assert_true("Comp10", nested.encode_as_sequence() == expected)
+assert_true("Comp11", nested.encode() == b'\x83' + expected)
+lazy = CBOR.decode_lazy(nested.encode())
+assert_true("Comp12", lazy.encode_as_sequence() == expected)
 
 success()
@@ -2,6 +2,10 @@ from org.webpki.cbor import CBOR
 import math
 import struct
 import io
+import asyncio
+import os
+import tempfile
+import datetime
 
 def assert_true(text, expression):
   if not expression:
@@ -118,6 +122,37 @@ mutableValue.add(CBOR.Map())
 CBOR.Map().set(CBOR.Array().add(immutableKey2), CBOR.Int(5))
 badKey("immutableKey2.add(CBOR.Int(6))")
 
+# Decoded keys (raw input is used for ordering in deterministic mode)
+keys = [CBOR.Int(10), CBOR.Int(-1), CBOR.String("a"), CBOR.String("aa"),
+        CBOR.Float(2.5), CBOR.Array().add(CBOR.Int(1)), CBOR.Boolean(False)]
+map = CBOR.Map()
+for key in keys:
+  map.set(key, CBOR.Int(1))
+cbor = map.encode()
+for buffer in [cbor, io.BytesIO(cbor)]:
+  decoded = CBOR.init_decoder(buffer, 0, 1000).decode_with_options()
+  assert_true("raw-0", decoded.encode() == cbor)
+  for key in keys:
+    assert_true("raw-1", decoded.contains_key(key))
+  for entry in decoded._entries:
+    assert_true("raw-2", entry._encoded_key == entry._key.encode())
+
+def badMap(hex, error, options=0):
+  try:
+    CBOR.init_decoder(bytes.fromhex(hex), options, 100).decode_with_options()
+    fail("Must fail!")
+  except Exception as e:
+    check_exception(e, error)
+
+badMap("a2616201616101", "Non-deterministic order")
+badMap("a2616101616101", "Duplicate key")
+badMap("a28101018101f6", "Duplicate key")
+badMap("a219000101180101", "Duplicate key", CBOR.LENIENT_NUMBER_DECODING)
+assert_true("lenient-0", 
+    CBOR.init_decoder(bytes.fromhex("a1190001f6"), 
+                      CBOR.LENIENT_NUMBER_DECODING, 100).decode_with_options()
+        .get(CBOR.Int(1)).is_null())
+
 success()
 """],
 ['float.py',
@@ -396,6 +431,18 @@ reducedOneTurn(False, 4, 3.4028234663852886e+38, 3.4028234663852886e+38)
 reducedOneTurn(False, 4, 3.4028235e+38, 3.4028234663852886e+38)
 reducedOneTurn(False, None, 3.40282358e+38, 3.4028234663852886e+38)
 
+# The encoding is computed on first use
+lazy = CBOR.Float(2.5)
+assert_true("lazy-0", lazy._encoded is None)
+assert_true("lazy-1", lazy.length == 2 and lazy._encoded.hex() == "4100")
+for value, expected in [(1.0, "f93c00"), (-1.0, "f9bc00"), (0.0, "f90000"),
+                        (-0.0, "f98000"), (0.5, "f93800"), (-64.0, "f9d400"),
+                        (0.1, "fb3fb999999999999a"), (65505.0, "fa477fe100"),
+                        (1.401298464324817e-45, "fa00000001"),
+                        (2.9802322387695312e-08, "fa33000000"),
+                        (3.4028234663852886e+38, "fa7f7fffff"),
+                        (3.402823466385289e+38, "fb47efffffe0000001")]:
+  assert_true("short", CBOR.Float(value).encode().hex() == expected)
 
 success()
 """],
@@ -432,6 +479,23 @@ one_turn(18446744073709551615, '1bffffffffffffffff')
 one_turn(18446744073709551616, 'c249010000000000000000')
 one_turn(-18446744073709551616, '3bffffffffffffffff')
 one_turn(-18446744073709551617, 'c349010000000000000000')
+one_turn(23, '17')
+one_turn(24, '1818')
+one_turn(-24, '37')
+one_turn(-25, '3818')
+one_turn(65535, '19ffff')
+one_turn(65536, '1a00010000')
+one_turn(4294967295, '1affffffff')
+one_turn(4294967296, '1b0000000100000000')
+one_turn(1 << 72, 'c24a01000000000000000000')
+
+# Headers of lengths and tag numbers
+assert_true("hdr-0", CBOR.Bytes(bytes(24)).encode()[:2].hex() == '5818')
+assert_true("hdr-1", CBOR.String('x' * 256).encode()[:3].hex() == '790100')
+assert_true("hdr-2", CBOR.Tag(65536, CBOR.Null()).encode().hex() == 
+            'da00010000f6')
+assert_true("hdr-3", CBOR.Tag(0xffffffffffffffff, CBOR.Null()).encode().hex()
+            == 'dbfffffffffffffffff6')
 
 try:
   CBOR.Int(1.1)
@@ -750,6 +814,1391 @@ while True:
   if object is None: break
   array_sequence.add(object)
 assert_true("Comp5", array_sequence.encode_as_sequence() == cbor)
+total = bytearray()
+for object in CBOR.decode_sequence(cbor):
+  total += object.encode()
+assert_true("Comp6", total == cbor)
+assert_true("Comp7", list(CBOR.decode_sequence(bytes())) == [])
+offsets = list()
+for object, start, end in CBOR.decode_sequence(memoryview(cbor), True):
+  assert_true("Comp8", object.encode() == cbor[start:end])
+  offsets.append((start, end))
+assert_true("Comp9", offsets == [(0, 1), (1, 6)])
+try:
+  list(CBOR.decode_sequence(cbor[:-1]))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'max_length')
+# Nested containers encode into the same buffer
+nested = CBOR.from_diagnostic('[[{"a": [1(1.5)]}, h\\'010203\\'], ' + 
+                              '{1: [[], {}], 2: 8("x")}, -5]')
+expected = bytes.fromhex("82a1616181c1f93e0043010203" + 
+                         "a2018280a002c8617824")
+assert_true("Comp10", nested.encode_as_sequence() == expected)
+assert_true("Comp11", nested.encode() == b'\\x83' + expected)
+lazy = CBOR.decode_lazy(nested.encode())
+assert_true("Comp12", lazy.encode_as_sequence() == expected)
+
+success()
+"""],
+['buffer-decoder.py',
+"""
+# Testing the buffer-based decoder
+
+cbor = CBOR.Map().set(CBOR.Int(1), CBOR.String("Hi!"))\\
+                 .set(CBOR.Int(2), CBOR.Bytes(bytes([1, 2, 3])))\\
+                 .set(CBOR.Int(3), CBOR.Array().add(CBOR.Float(2.5))).encode()
+
+for buffer in [bytes(cbor), bytearray(cbor), memoryview(cbor)]:
+  object = CBOR.decode(buffer)
+  assert_true("buf1", object.encode() == cbor)
+  assert_true("buf2", type(object.get(CBOR.Int(2)).get_bytes()) == bytes)
+
+# memoryview slices should not need to be copied
+padded = bytes([0xff]) + cbor + bytes([0xff])
+assert_true("slice", CBOR.decode(memoryview(padded)[1:-1]).encode() == cbor)
+
+def bad_decode(cbor, options, max_length, error):
+  try:
+    CBOR.init_decoder(cbor, options, max_length).decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_decode(cbor[:-1], 0, 100, 'EOF')
+bad_decode(cbor, 0, len(cbor) - 1, 'max_length')
+bad_decode(bytes([0x59, 0x01, 0x00]), 0, 10, 'max_length')
+bad_decode(bytes([0x45, 0x01]), 0, 10, 'EOF')
+bad_decode(cbor + bytes([0]), 0, 100, 'Unexpected data')
+bad_decode(bytes(), 0, 100, 'EOF')
+bad_decode("text", 0, 100, 'Unexpected stream')
+try:
+  CBOR.decode("text")
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'memoryview')
+
+sequence = bytearray(cbor) + bytes([0x05])
+decoder = CBOR.init_decoder(memoryview(sequence), CBOR.SEQUENCE_MODE, 1000)
+assert_true("seq1", decoder.decode_with_options().encode() == cbor)
+assert_true("seq2", decoder.get_byte_count() == len(cbor))
+assert_true("seq3", decoder.decode_with_options().get_int8() == 5)
+assert_true("seq4", decoder.decode_with_options() is None)
+assert_true("seq5", decoder.get_byte_count() == len(sequence))
+
+# Reusable decoders
+decoder = CBOR.init_decoder(cbor, 0, 1000)
+assert_true("reset1", decoder.decode_with_options().encode() == cbor)
+for buffer in [bytes([0x05]), bytearray(cbor), memoryview(cbor)]:
+  assert_true("reset2", decoder.reset(buffer).decode_with_options()
+                                .encode() == bytes(buffer))
+  assert_true("reset3", decoder.get_byte_count() == len(buffer))
+try:
+  decoder.reset(cbor[:-1]).decode_with_options()
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'EOF')
+assert_true("reset4", decoder.reset(cbor).decode_with_options().encode() == cbor)
+decoder = CBOR.init_decoder(io.BytesIO(cbor), CBOR.SEQUENCE_MODE, 1000)
+assert_true("reset5", decoder.decode_with_options().encode() == cbor)
+assert_true("reset6", decoder.decode_with_options() is None)
+assert_true("reset7", decoder.reset(io.BytesIO(bytes([0x05])))
+                             .decode_with_options().get_int8() == 5)
+
+# Lazy results remain bound to their own input
+first = CBOR.from_diagnostic('[1, "hello", {"a": 2}]').encode()
+decoder = CBOR.init_decoder(first, CBOR.LAZY_DECODING, 1000)
+lazy = decoder.decode_with_options()
+assert_true("reset8", decoder.reset(CBOR.from_diagnostic('[2, 99]').encode())
+                             .decode_with_options().get(1).get_int8() == 99)
+assert_true("reset9", lazy.encode() == first)
+assert_true("reset10", lazy.get(2).get(CBOR.String("a")).get_int8() == 2)
+
+# The per-thread default decoder
+CBOR.decode(cbor)
+try:
+  CBOR.decode(cbor + bytes([0]))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Unexpected data')
+assert_true("default1", CBOR.decode(cbor).encode() == cbor)
+assert_true("default2", CBOR.decode(bytes([0x05])).get_int8() == 5)
+assert_true("default3", CBOR.decode(cbor).clone().encode() == cbor)
+
+success()
+"""],
+['lazy.py',
+"""
+# Testing lazy decoding
+
+inner = CBOR.Array().add(CBOR.String("deep")).add(CBOR.Map().set(
+    CBOR.String("x"), CBOR.Float(1.5)))
+map = CBOR.Map()
+for i in range(200):
+  map.set(CBOR.Int(i), CBOR.String("v" + str(i)))
+map.set(CBOR.String("inner"), inner)
+map.set(CBOR.String("tagged"), CBOR.Tag(500, CBOR.Array().add(CBOR.Int(5))))
+cbor = map.encode()
+
+lazy = CBOR.decode_lazy(cbor)
+assert_true("lazy1", lazy.length == 202)
+assert_true("lazy2", lazy._entries[5]._object is None)
+assert_true("lazy3", lazy.get(CBOR.Int(5)).get_string() == "v5")
+assert_true("lazy4", lazy._entries[6]._object is None)
+array = lazy.get(CBOR.String("inner"))
+assert_true("lazy5", array._objects[0] is None)
+assert_true("lazy6", array.get(1).get(CBOR.String("x")).get_float64() == 1.5)
+assert_true("lazy7", lazy.get_conditionally(CBOR.Int(500), CBOR.Int(3)).get_int8() == 3)
+assert_true("lazy8", lazy.contains_key(CBOR.Int(199)))
+
+# Materialization through encoding and printing
+assert_true("enc", lazy.encode() == cbor)
+assert_true("enc2", CBOR.decode_lazy(cbor).equals(map))
+assert_true("diag", CBOR.decode_lazy(cbor).to_string() == map.to_string())
+assert_true("arr", len(CBOR.decode_lazy(cbor).get(CBOR.String("inner")).to_array()) == 2)
+
+# check_for_unread() semantics are preserved
+lazy = CBOR.decode_lazy(CBOR.Array().add(CBOR.Int(1)).add(CBOR.Int(2)).encode())
+lazy.get(0).get_int8()
+try:
+  lazy.check_for_unread()
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Array element of type=CBOR.Int with value=2 was never read')
+lazy.get(1).get_int8()
+lazy.check_for_unread()
+
+# Deterministic checks are applied on materialization
+bad = bytes([0x82, 0x01, 0x18, 0x02])
+lazy = CBOR.decode_lazy(bad)
+assert_true("first", lazy.get(0).get_int8() == 1)
+try:
+  lazy.get(1)
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Non-deterministically encoded primitive')
+try:
+  CBOR.decode_lazy(bytes.fromhex('a2026374776f01636f6e65'))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Non-deterministic order for key')
+lenient = CBOR.init_decoder(bytes.fromhex('a2026374776f01636f6e65'), 
+    CBOR.LAZY_DECODING | CBOR.LENIENT_MAP_DECODING, 100).decode_with_options()
+assert_true("lenient", lenient.to_diagnostic(False) == '{1:"one",2:"two"}')
+
+# Framing errors are still found up-front
+def bad_lazy(cbor, error):
+  try:
+    CBOR.decode_lazy(cbor)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_lazy(bytes([0x82, 0x01]), 'EOF')
+bad_lazy(bytes([0x82, 0x01, 0x41]), 'max_length')
+bad_lazy(bytes([0x81, 0x01, 0x01]), 'Unexpected data')
+bad_lazy(bytes([0x81, 0x1c]), 'Unsupported tag')
+try:
+  CBOR.init_decoder(io.BytesIO(cbor), CBOR.LAZY_DECODING, 10000)
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'requires buffer')
+
+# Nesting limits are checked at materialization
+nested = CBOR.Array()
+last = nested
+for i in range(3):
+  last.add(last := CBOR.Array())
+decoder = CBOR.init_decoder(nested.encode(), CBOR.LAZY_DECODING, 100)
+lazy = decoder.set_max_nesting_level(3).decode_with_options()
+try:
+  lazy.get(0).get(0).get(0)
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'nesting level')
+
+# Containers in map keys are decoded and checked immediately
+for hex in ['a1c581180101', 'a18118010f']:
+  try:
+    CBOR.decode_lazy(bytes.fromhex(hex))
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'Non-deterministically encoded primitive')
+key = CBOR.Tag(5, CBOR.Array().add(CBOR.Int(1)))
+lazy = CBOR.decode_lazy(CBOR.Map().set(key, CBOR.Int(1)).encode())
+assert_true("tagged key", lazy.get(key).get_int32() == 1)
+
+success()
+"""],
+['tokenizer.py',
+"""
+# Testing the tokenizer
+
+cbor = CBOR.from_diagnostic('''{
+  1: [5, -3, 18446744073709551616, 2.5, "hi", h'0102', true, null, simple(99)],
+  2: 1010(["a", {}]),
+  3: [],
+  4: [NaN, -Infinity]
+}''').encode()
+
+T = CBOR
+expected = [
+  (T.TOKEN_START_MAP, 4),
+  (T.TOKEN_INT, 1), (T.TOKEN_START_ARRAY, 9),
+    (T.TOKEN_INT, 5), (T.TOKEN_INT, -3), (T.TOKEN_INT, 18446744073709551616),
+    (T.TOKEN_FLOAT, 2.5), (T.TOKEN_STRING, "hi"), (T.TOKEN_BYTES, bytes([1, 2])),
+    (T.TOKEN_BOOLEAN, True), (T.TOKEN_NULL, None), (T.TOKEN_SIMPLE, 99),
+  (T.TOKEN_END, None),
+  (T.TOKEN_INT, 2), (T.TOKEN_TAG, 1010), (T.TOKEN_START_ARRAY, 2),
+    (T.TOKEN_STRING, "a"), (T.TOKEN_START_MAP, 0), (T.TOKEN_END, None),
+  (T.TOKEN_END, None),
+  (T.TOKEN_INT, 3), (T.TOKEN_START_ARRAY, 0), (T.TOKEN_END, None),
+  (T.TOKEN_INT, 4), (T.TOKEN_START_ARRAY, 2),
+    (T.TOKEN_NON_FINITE, 0x7e00), (T.TOKEN_NON_FINITE, 0xfc00),
+  (T.TOKEN_END, None),
+  (T.TOKEN_END, None)]
+
+for input in [cbor, io.BytesIO(cbor)]:
+  tokens = list(CBOR.init_tokenizer(input, 0, 1000))
+  assert_true("tokens", tokens == expected)
+
+# Sequences
+sequence = bytes([0x05, 0x81, 0x06, 0x07])
+tokenizer = CBOR.init_tokenizer(sequence, CBOR.SEQUENCE_MODE, 1000)
+assert_true("seq", list(tokenizer) == [(T.TOKEN_INT, 5), (T.TOKEN_START_ARRAY, 1),
+                                       (T.TOKEN_INT, 6), (T.TOKEN_END, None),
+                                       (T.TOKEN_INT, 7)])
+assert_true("seqc", tokenizer.get_byte_count() == 4)
+assert_true("seqe", list(CBOR.init_tokenizer(bytes(), CBOR.SEQUENCE_MODE, 10)) == [])
+
+def bad_tokens(hex, error, options=0):
+  try:
+    list(CBOR.init_tokenizer(bytes.fromhex(hex), options, 100))
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_tokens('1817', 'Non-deterministically encoded primitive')
+bad_tokens('fb3ff0000000000000', 'Non-deterministically encoded "float"')
+bad_tokens('fa3f800000', 'Non-deterministically encoded "float"')
+bad_tokens('fa7fc00000', 'Non-deterministically encoded "float"')
+bad_tokens('c2480100000000000000', 'Non-deterministically encoded "bigint"')
+bad_tokens('c201', "Expected 'CBOR.Bytes'")
+bad_tokens('f818', 'Simple value out of range')
+bad_tokens('8201', 'EOF')
+bad_tokens('0101', 'Unexpected data')
+bad_tokens('1c', 'Unsupported tag')
+
+# Lenient mode normalizes as the decoder does
+tokens = list(CBOR.init_tokenizer(bytes.fromhex('82fb3ff0000000000000fa7fc00000'), 
+                                  CBOR.LENIENT_NUMBER_DECODING, 100))
+assert_true("lenient", tokens == [(T.TOKEN_START_ARRAY, 2), (T.TOKEN_FLOAT, 1.0), 
+                                  (T.TOKEN_NON_FINITE, 0x7e00), (T.TOKEN_END, None)])
+
+# Nesting is limited, but not by the interpreter's recursion limit
+def nested(levels):
+  return bytes([0x81] * (levels - 1) + [0x80])
+
+try:
+  list(CBOR.init_tokenizer(nested(3), 0, 100).set_max_nesting_level(2))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'nesting level')
+count = 0
+for token in CBOR.init_tokenizer(nested(5000), 0, 10000).set_max_nesting_level(5000):
+  count += 1
+assert_true("deep", count == 10000)
+
+success()
+"""],
+['async-decoder.py',
+"""
+# Testing the asyncio decoder
+
+cbor = CBOR.Map().set(CBOR.Int(1), CBOR.Array().add(CBOR.String("Hi!"))
+                                               .add(CBOR.Tag(9, CBOR.Float(2.5)))
+                                               .add(CBOR.Int(1 << 70)))\\
+                 .set(CBOR.Int(2), CBOR.Bytes(bytes(300))).encode()
+
+def reader_for(data, chunk_size=7):
+  reader = asyncio.StreamReader()
+  for i in range(0, len(data), chunk_size):
+    reader.feed_data(data[i:i + chunk_size])
+  reader.feed_eof()
+  return reader
+
+async def run_single():
+  decoder = CBOR.init_async_decoder(reader_for(cbor), 0, 1000)
+  object = await decoder.decode_with_options()
+  assert_true("single", object.encode() == cbor)
+  assert_true("count", decoder.get_byte_count() == len(cbor))
+
+async def run_sequence():
+  sequence = cbor + bytes([0x05]) + cbor
+  decoder = CBOR.init_async_decoder(reader_for(sequence), CBOR.SEQUENCE_MODE, 10000)
+  total = bytearray()
+  async for object in decoder:
+    total += object.encode()
+  assert_true("sequence", total == sequence)
+  assert_true("seqcount", decoder.get_byte_count() == len(sequence))
+
+async def run_remainder():
+  # The stream must not be read beyond the object
+  reader = reader_for(bytes([0x82, 0x01, 0x02]) + b'raw data')
+  decoder = CBOR.init_async_decoder(reader, CBOR.SEQUENCE_MODE, 100)
+  assert_true("rem1", (await decoder.decode_with_options()).to_diagnostic(False) == '[1,2]')
+  assert_true("rem2", await reader.read() == b'raw data')
+
+async def run_bad(data, options, max_length, error, max_level=None):
+  try:
+    decoder = CBOR.init_async_decoder(reader_for(data), options, max_length)
+    if max_level:
+      decoder.set_max_nesting_level(max_level)
+    await decoder.decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+async def run_all():
+  await run_single()
+  await run_sequence()
+  await run_remainder()
+  await run_bad(cbor[:-1], 0, 1000, 'EOF')
+  await run_bad(bytes(), 0, 1000, 'EOF')
+  await run_bad(cbor, 0, len(cbor) - 1, 'max_length')
+  await run_bad(cbor + bytes([0]), 0, 1000, 'Unexpected data')
+  await run_bad(bytes([0x18, 0x01]), 0, 100, 'Non-deterministically')
+  await run_bad(bytes([0x81, 0x81, 0x80]), 0, 100, 'nesting level', 2)
+  await run_bad(bytes([0x1f]), 0, 100, 'Unsupported tag')
+  try:
+    CBOR.init_async_decoder(reader_for(cbor), 0, 100).__aiter__()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'SEQUENCE_MODE')
+  try:
+    CBOR.init_async_decoder(cbor, 0, 100)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'Unexpected stream')
+  # Nested "bigint" at the maximum nesting level
+  nested = CBOR.Array().add(CBOR.Array().add(CBOR.Int(1 << 70))).encode()
+  decoder = CBOR.init_async_decoder(reader_for(nested), 0, 100).set_max_nesting_level(2)
+  assert_true("bigint", (await decoder.decode_with_options()).encode() == nested)
+
+asyncio.run(run_all())
+
+success()
+"""],
+['parallel.py',
+"""
+# Testing parallel decoding of sequences
+
+# Guard needed for platforms starting worker processes through "spawn"
+if __name__ == '__main__':
+  items = list()
+  for i in range(500):
+    items.append(CBOR.Map().set(CBOR.Int(1), CBOR.Int(i))
+                           .set(CBOR.Int(2), CBOR.Array().add(CBOR.String("s" + str(i)))
+                                                         .add(CBOR.Float(i + 0.5))))
+  items.append(CBOR.Map().set(CBOR.Array().add(CBOR.Int(1)), 
+                              CBOR.Tag(7, CBOR.Simple(99)))
+                         .set(CBOR.Map().set(CBOR.Int(1), CBOR.Null()), 
+                              CBOR.Array().add(CBOR.Float.create_extended_float(math.inf))
+                                          .add(CBOR.NonFinite(0x7e01))
+                                          .add(CBOR.Bytes(bytes([1])))
+                                          .add(CBOR.Boolean(True))))
+  sequence = bytearray()
+  for item in items:
+    sequence += item.encode()
+
+  encoded = CBOR.decode_parallel(sequence, max_workers=3)
+  assert_true("len", len(encoded) == len(items))
+  for i in range(len(items)):
+    assert_true("enc", encoded[i] == items[i].encode())
+
+  native = CBOR.decode_parallel(memoryview(sequence), True, 2)
+  assert_true("nat1", native[7] == {1: 7, 2: ["s7", 7.5]})
+  assert_true("nat2", native[-1] == {
+      (1,): CBOR.NativeTag(7, CBOR.NativeSimple(99)),
+      CBOR.FrozenMap({1: None}): [math.inf, CBOR.NativeNonFinite(0x7e01), bytes([1]), True]})
+
+  with tempfile.TemporaryDirectory() as directory:
+    file_name = os.path.join(directory, 'sequence.cbor')
+    with open(file_name, 'wb') as file:
+      file.write(sequence)
+    assert_true("file", CBOR.decode_parallel(file_name, max_workers=2) == encoded)
+    with open(file_name, 'wb') as file:
+      file.write(sequence + bytes([0x82, 0x01]))
+    try:
+      CBOR.decode_parallel(file_name, max_workers=2)
+      fail("Should not")
+    except Exception as e:
+      check_exception(e, 'EOF')
+    with open(file_name, 'wb') as file:
+      pass
+    assert_true("empty", CBOR.decode_parallel(file_name) == [])
+
+  try:
+    CBOR.decode_parallel(sequence + bytes([0x18, 0x01]), max_workers=2)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'Non-deterministically')
+
+success()
+"""],
+['validate.py',
+"""
+# Testing validation without decoding
+
+def outcome(function):
+  try:
+    function()
+    return None
+  except Exception as e:
+    return repr(e)
+
+# The validator must agree with the decoder
+def compare(hex, options=0):
+  cbor = bytes.fromhex(hex)
+  expected = outcome(lambda: CBOR.init_decoder(cbor, options, len(cbor)).decode_with_options())
+  actual = outcome(lambda: CBOR.validate(cbor, options))
+  if (expected is None) != (actual is None):
+    fail(hex + " " + str(expected) + " " + str(actual))
+  return actual
+
+LENIENT = CBOR.LENIENT_MAP_DECODING | CBOR.LENIENT_NUMBER_DECODING
+
+valid = [
+  'a5 01 d9 01 f4 81 18 2d 02 f9 80 10 04 64 53 75 72 65 05 a2 08 69 59 65 0a 01 61 68 e2 82 ac' +
+  '09 85 66 42 79 74 65 73 21 45 01 02 03 04 05 f5 f4 f6 06 c2 4b 66 1e fd f2 e3 b1 9f 7c 04 5f 15',
+  'a3 01 80 61 61 a0 81 01 f6',
+  'a2 a1 01 02 03 a1 01 03 04',
+  'c0 74 32 30 32 35 2d 30 31 2d 30 31 54 31 30 3a 30 30 3a 30 30 5a',
+  'c1 1a 5f 5e 10 00',
+  'd9 03 f2 82 63 61 62 63 a0',
+  'f9 7e 00', 'fa 47 80 00 00', 'fb 7f ef ff ff ff ff ff ff', 'f8 20', 'c3 49 01 00 00 00 00 00 00 00 00'
+]
+invalid = [
+  '18 17', '19 00 ff', 'f8 17', 'f8 18', 'fa 3f 80 00 00', 'fb 3f f0 00 00 00 00 00 00',
+  'fa 7f c0 00 00', 'fb 7f f8 00 00 00 00 00 00', 'c2 48 01 00 00 00 00 00 00 00', 'c2 01',
+  'a2 02 00 01 00', 'a2 01 00 01 00', 'a2 a1 01 03 03 a1 01 02 04', 'a2 18 18 00 02 00',
+  'c0 63 61 62 63', 'c1 3a 00 00 00 01', 'd9 03 f2 81 01', 'd8 02 40',
+  '62 ff fe', '82 01', '81 01 01', '1c', 'ff', '5f', '59 01 00', ''
+]
+for hex in valid:
+  assert_true("valid " + hex, compare(hex) is None)
+for hex in invalid:
+  assert_false("invalid " + hex, compare(hex) is None)
+# Lenient modes
+for hex in ['a2 02 00 01 00', '18 17', 'fa 3f 80 00 00', 'a2 18 18 00 02 00', 'c2 48 01 00 00 00 00 00 00 00']:
+  assert_true("lenient " + hex, compare(hex, LENIENT) is None)
+for hex in ['a2 01 00 01 00', 'a2 01 00 18 01 00', 'a2 81 01 00 81 18 01 00']:
+  check_exception(compare(hex, LENIENT), 'Duplicate key')
+
+# Nesting
+deep = bytes([0x81] * 100 + [0x80])
+check_exception(outcome(lambda: CBOR.validate(deep, 0)), 'nesting level')
+assert_true("deep", outcome(lambda: CBOR.validate(deep[1:], 0)) is None)
+
+# Sequences
+sequence = bytes.fromhex('05 a1 05 42 6a 6a')
+CBOR.validate(sequence, CBOR.SEQUENCE_MODE)
+CBOR.validate(bytes(), CBOR.SEQUENCE_MODE)
+CBOR.validate(memoryview(sequence)[1:], 0)
+check_exception(outcome(lambda: CBOR.validate(sequence, 0)), 'Unexpected data')
+check_exception(outcome(lambda: CBOR.validate(sequence + bytes([0x18]), CBOR.SEQUENCE_MODE)), 'EOF')
+
+success()
+"""],
+['zero-copy.py',
+"""
+# Testing zero-copy decoding
+
+payload = bytes(range(256)) * 4
+cbor = CBOR.Map().set(CBOR.Int(1), CBOR.String("Hi!"))\\
+                 .set(CBOR.Int(2), CBOR.Bytes(payload))\\
+                 .set(CBOR.String("å€"), 
+                      CBOR.Array().add(CBOR.String("€"))).encode()
+
+for buffer in [bytes(cbor), bytearray(cbor), memoryview(cbor)]:
+  object = CBOR.init_decoder(buffer, 
+                             CBOR.ZERO_COPY_DECODING, 
+                             len(cbor)).decode_with_options()
+  assert_true("zc1", object.encode() == cbor)
+  byte_string = object.get(CBOR.Int(2)).get_bytes()
+  assert_true("zc2", type(byte_string) == memoryview)
+  assert_true("zc3", byte_string == payload)
+  assert_true("zc4", byte_string.obj is 
+      (buffer.obj if type(buffer) == memoryview else buffer))
+  text_string = object.get(CBOR.Int(1))
+  assert_false("zc5", "_string" in text_string.__dict__)
+  assert_true("zc6", text_string.get_string() == "Hi!")
+  assert_true("zc7", text_string.get_string() == "Hi!")
+  assert_true("zc8", object.get(CBOR.String("å€"))
+                           .get(0).get_string() == "€")
+  assert_true("zc9", object.to_string() == CBOR.decode(cbor).to_string())
+  assert_true("zc10", object.clone().encode() == cbor)
+  object.check_for_unread()
+  # Byte strings can be reused as they are
+  copy = CBOR.Bytes(byte_string)
+  assert_true("zc11", copy.get_bytes() == payload and
+              copy.equals(object.get(CBOR.Int(2))))
+  assert_true("zc12", CBOR.decode(CBOR.Array().add(copy).encode())
+              .get(0).get_bytes() == payload)
+
+# Big numbers are based on byte strings as well
+big = CBOR.Int(-0x1234567890abcdef1234567890).encode()
+assert_true("big", CBOR.init_decoder(big, CBOR.ZERO_COPY_DECODING, 100)
+    .decode_with_options().get_bigint() == -0x1234567890abcdef1234567890)
+
+def bad_decode(cbor, options, error):
+  try:
+    CBOR.init_decoder(cbor, options, 100).decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+# Invalid UTF-8 must still be detected
+bad_decode(bytes([0x62, 0xc3, 0x28]), CBOR.ZERO_COPY_DECODING, 'invalid')
+bad_decode(bytes([0x81, 0x61, 0xff]), CBOR.ZERO_COPY_DECODING, 'invalid')
+bad_decode(bytes([0x45, 0x01]), CBOR.ZERO_COPY_DECODING, 'EOF')
+bad_decode(io.BytesIO(cbor), CBOR.ZERO_COPY_DECODING, 'buffer input')
+
+success()
+"""],
+['projection.py',
+"""
+# Testing projection decoding
+
+HEADER = CBOR.String("header")
+ROUTE = CBOR.String("route")
+BODY = CBOR.String("body")
+
+message = CBOR.Map()\\
+    .set(HEADER, CBOR.Map()
+        .set(CBOR.Int(1), CBOR.Int(500))
+        .set(ROUTE, CBOR.Array()
+            .add(CBOR.Int(7))
+            .add(CBOR.Map().set(CBOR.Int(2), CBOR.Int(-3)))))\\
+    .set(BODY, CBOR.Bytes(bytes(1000)))\\
+    .set(CBOR.Float(2.5), CBOR.Array().add(CBOR.String("x" * 100)))
+cbor = message.encode()
+
+results = CBOR.decode_projection(cbor, [
+    [HEADER, CBOR.Int(1)],
+    [HEADER, ROUTE, 1, CBOR.Int(2)],
+    [HEADER, ROUTE, 2],
+    [BODY, 0],
+    [CBOR.String("missing")],
+    [CBOR.Float(2.5)],
+    [CBOR.Float(2.5), 0],
+    [HEADER, ROUTE],
+    [HEADER, ROUTE, 0],
+    []])
+assert_true("p1", results[0].get_int32() == 500)
+assert_true("p2", results[1].get_int32() == -3)
+assert_true("p3", results[2] is None)
+assert_true("p4", results[3] is None)
+assert_true("p5", results[4] is None)
+assert_true("p6", results[5].get(0).get_string() == "x" * 100)
+assert_true("p7", results[6].get_string() == "x" * 100)
+assert_true("p8", results[7].length == 2)
+assert_true("p9", results[8].get_int32() == 7)
+assert_true("p10", results[9].encode() == cbor)
+assert_true("p11", CBOR.decode_projection(cbor, []) == [])
+
+# Sequences
+sequence = bytearray(cbor) + CBOR.Array().add(CBOR.Int(9)).encode()
+decoder = CBOR.init_decoder(sequence, CBOR.SEQUENCE_MODE, len(sequence))
+assert_true("seq1", decoder.decode_projection([[0]])[0] is None)
+assert_true("seq2", decoder.decode_projection([[0]])[0].get_int32() == 9)
+assert_true("seq3", decoder.decode_projection([[0]]) is None)
+
+def bad_projection(cbor, paths, error, options=0):
+  try:
+    CBOR.init_decoder(cbor, options, 2000).decode_projection(paths)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_projection(cbor[:-1], [[HEADER, CBOR.Int(1)]], 'EOF')
+bad_projection(cbor + bytes([0]), [[BODY]], 'Unexpected data')
+bad_projection(bytes.fromhex("a2616201616101"), [[CBOR.String("a")]], 
+               'Non-deterministic order')
+bad_projection(bytes.fromhex("a2616101616101"), [[CBOR.String("b")]],
+               'Duplicate key')
+bad_projection(bytes.fromhex("a1190001f6"), [[CBOR.Int(1)]], 'Non-deterministic')
+bad_projection(cbor, [["header"]], 'Path elements')
+bad_projection(cbor, [[-1]], 'Path elements')
+bad_projection(io.BytesIO(cbor), [[BODY]], 'buffer input')
+assert_true("lenient", CBOR.init_decoder(bytes.fromhex("a1190001f6"), 
+    CBOR.LENIENT_NUMBER_DECODING, 5).decode_projection([[CBOR.Int(1)]])[0]
+        .is_null())
+
+success()
+"""],
+['push-decoder.py',
+"""
+# Testing the push-mode decoder
+
+objects = [CBOR.Map().set(CBOR.Int(1), CBOR.String("Hi!"))
+                     .set(CBOR.Int(2), CBOR.Bytes(bytes(300))),
+           CBOR.Int(-0x1234567890abcdef1234567890),
+           CBOR.Float(2.5),
+           CBOR.Array().add(CBOR.Array()).add(CBOR.String("")),
+           CBOR.Tag(1234, CBOR.Int(5)),
+           CBOR.Int(0)]
+sequence = bytearray()
+for object in objects:
+  sequence += object.encode()
+
+def feed_all(fragment_size):
+  decoder = CBOR.init_push_decoder(CBOR.SEQUENCE_MODE, len(sequence))
+  decoded = []
+  for q in range(0, len(sequence), fragment_size):
+    decoded += decoder.feed(sequence[q:q + fragment_size])
+  decoder.close()
+  assert_true("count", decoder.get_byte_count() == len(sequence))
+  return decoded
+
+for fragment_size in [1, 2, 3, 7, 100, len(sequence)]:
+  decoded = feed_all(fragment_size)
+  assert_true("length", len(decoded) == len(objects))
+  for q in range(len(objects)):
+    assert_true("object", decoded[q].equals(objects[q]))
+
+# Fragments are only returned when complete
+decoder = CBOR.init_push_decoder(0, 100)
+cbor = CBOR.Array().add(CBOR.Int(300)).encode()
+assert_true("part1", decoder.feed(cbor[:2]) == [])
+assert_true("part2", decoder.feed(memoryview(cbor)[2:])[0].equals(
+    CBOR.Array().add(CBOR.Int(300))))
+decoder.close()
+
+def bad_feed(fragments, options, max_length, error, close=False):
+  try:
+    decoder = CBOR.init_push_decoder(options, max_length)
+    for fragment in fragments:
+      decoder.feed(fragment)
+    if close:
+      decoder.close()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_feed([bytes([0x82, 0x01])], 0, 100, 'EOF', True)
+bad_feed([bytes([0x19, 0x01])], CBOR.SEQUENCE_MODE, 100, 'EOF', True)
+bad_feed([], 0, 100, 'EOF', True)
+bad_feed([bytes([0x01]), bytes([0x01])], 0, 100, 'Unexpected data')
+bad_feed([bytes([0x1c])], 0, 100, 'Unsupported tag')
+bad_feed([bytes([0x18]), bytes([0x01])], 0, 100, 'Non-deterministic')
+bad_feed([bytes([0x59, 0x01, 0x00])], 0, 100, 'max_length')
+bad_feed([bytes([0x81] * 101)], 0, 200, 'nesting level')
+bad_feed(["text"], 0, 100, 'memoryview')
+
+# Empty sequence is fine
+CBOR.init_push_decoder(CBOR.SEQUENCE_MODE, 100).close()
+
+success()
+"""],
+['key-cache.py',
+"""
+# Testing the map key interning cache
+
+def message(i):
+  cbor_map = CBOR.Map()
+  for key in range(1, 31):
+    cbor_map.set(CBOR.Int(key), CBOR.Int(i + key))
+  for label in ["alpha", "beta", "gamma", "x" * 300]:
+    cbor_map.set(CBOR.String(label), CBOR.String(label + str(i)))
+  cbor_map.set(CBOR.Bytes(bytes([1, 2])), CBOR.Map().set(CBOR.Int(-1000), 
+                                                         CBOR.Null()))
+  cbor_map.set(CBOR.Int(1 << 70), CBOR.Int(i))
+  cbor_map.set(CBOR.Float(2.5), CBOR.Int(i))
+  return cbor_map.encode()
+
+messages = [message(i) for i in range(10)]
+
+cache = CBOR.KeyCache()
+assert_true("empty", len(cache) == 0)
+decoder = CBOR.init_decoder(messages[0], 0, 1000).set_key_cache(cache)
+for cbor in messages:
+  decoded = decoder.reset(cbor).decode_with_options()
+  assert_true("dec1", decoded.encode() == cbor)
+  assert_true("dec2", decoded.get(CBOR.Int(5)).get_int32() == 
+      CBOR.decode(cbor).get(CBOR.Int(5)).get_int32())
+# Bigint and float keys are not cached
+assert_true("size", len(cache) == 36)
+assert_true("hits", cache.get_hits() == 36 * 9)
+assert_true("misses", cache.get_misses() == 36)
+
+# Shared cache, keys are shared as well
+other = CBOR.init_decoder(messages[1], 0, 1000).set_key_cache(cache)
+first = decoder.reset(messages[0]).decode_with_options()
+second = other.decode_with_options()
+assert_true("shared", first.get_keys()[0] is second.get_keys()[0])
+assert_true("immutable", first.get_keys()[0]._immutable_flag)
+
+# Limited size
+small = CBOR.KeyCache(5)
+decoder.set_key_cache(small).reset(messages[0]).decode_with_options()
+assert_true("small", len(small) == 5)
+assert_true("clear", len(small.clear()) == 0 and small.get_hits() == 0)
+
+# Not used in lenient mode, errors are still detected
+lenient = CBOR.init_decoder(bytes.fromhex("a1190001f6"), 
+                            CBOR.LENIENT_NUMBER_DECODING, 100)
+lenient.set_key_cache(cache).decode_with_options()
+decoder.set_key_cache(cache)
+for bad, error in [("a2616201616101", "Non-deterministic order"),
+                   ("a2616101616101", "Duplicate key"),
+                   ("a20101", "EOF"),
+                   ("a2190001f6", "Non-deterministic")]:
+  try:
+    decoder.reset(bytes.fromhex(bad)).decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+decoder.set_key_cache(None)
+
+try:
+  decoder.set_key_cache(dict())
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'CBOR.KeyCache')
+
+success()
+"""],
+['native.py',
+"""
+# Testing decoding to native Python values
+
+cbor_map = CBOR.Map()\\
+    .set(CBOR.Int(1), CBOR.Array().add(CBOR.Float(2.5))
+                                  .add(CBOR.Null())
+                                  .add(CBOR.Boolean(True))
+                                  .add(CBOR.Boolean(False)))\\
+    .set(CBOR.Int(-1), CBOR.Int(-1 << 80))\\
+    .set(CBOR.Int(2), CBOR.Tag(99, CBOR.Simple(99)))\\
+    .set(CBOR.Int(3), CBOR.Array().add(CBOR.NonFinite(0x7e00))
+                                  .add(CBOR.NonFinite(0x7c00))
+                                  .add(CBOR.NonFinite(0xfc00))
+                                  .add(CBOR.NonFinite(0x7c01)))\\
+    .set(CBOR.Int(4), CBOR.Tag(0, CBOR.String("2025-01-01T00:00:00Z")))\\
+    .set(CBOR.String("bytes"), CBOR.Bytes(bytes([1, 2, 3])))\\
+    .set(CBOR.String("€"), CBOR.Map())\\
+    .set(CBOR.Array().add(CBOR.Int(3))
+                     .add(CBOR.Map().set(CBOR.Int(1), CBOR.Array())), 
+         CBOR.Array())\\
+    .set(CBOR.Tag(7, CBOR.Array()), CBOR.Int(1 << 64))
+cbor = cbor_map.encode()
+
+native = CBOR.decode_native(cbor)
+assert_true("n1", native[1] == [2.5, None, True, False])
+assert_true("n2", native[-1] == -1 << 80)
+assert_true("n3", native[2] == CBOR.NativeTag(99, CBOR.NativeSimple(99)))
+assert_true("n4", math.isnan(native[3][0]))
+assert_true("n5", native[3][1:3] == [math.inf, -math.inf])
+assert_true("n6", native[3][3] == CBOR.NativeNonFinite(0x7c01))
+assert_true("n7", native[4] == CBOR.NativeTag(0, "2025-01-01T00:00:00Z"))
+assert_true("n8", native["bytes"] == bytes([1, 2, 3]))
+assert_true("n9", native["€"] == {})
+assert_true("n10", native[(3, CBOR.FrozenMap({1: ()}))] == [])
+assert_true("n11", native[CBOR.NativeTag(7, ())] == 1 << 64)
+assert_true("n12", list(native.keys())[0:3] == [1, 2, 3])
+assert_true("n13", CBOR.decode_native(bytes([0xf6])) is None)
+assert_true("n14", CBOR.decode_native(memoryview(CBOR.Float(-0.0).encode()))
+                       == 0.0)
+
+# Same determinism checks as CBOR.decode()
+for hex in ["a2f5010101", "a201010101", "c06161", "c24101", "c20101", 
+            "f818", "fa3fc00000", "f97e01" + "00", "1801", "8201", "0000",
+            "5b0000000000000001ff", "a10001", "c1fb7ff8000000000000",
+            "fb3ff0000000000000", "f9fe00" + "a0"]:
+  cbor = bytes.fromhex(hex)
+  try:
+    CBOR.decode_native(cbor)
+    fail("Should not: " + hex)
+  except Exception as e:
+    decode_error = None
+    try:
+      CBOR.decode(cbor)
+    except Exception as wrapper_error:
+      decode_error = wrapper_error
+    if hex in ["c20101", "a10001"]:
+      # Native-only error messages
+      continue
+    assert_true("error: " + hex, repr(e) == repr(decode_error))
+
+# Python map key collisions
+for hex in ["a20001f401", "a20100f93c0001"]:
+  try:
+    CBOR.decode_native(bytes.fromhex(hex))
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, 'not distinct')
+
+# Nesting
+try:
+  CBOR.decode_native(bytes([0x81] * 101 + [0x01]))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'nesting level')
+assert_true("nest", CBOR.decode_native(bytes([0x81] * 100 + [0x01])) 
+    is not None)
+
+success()
+"""],
+['schema.py',
+"""
+# Testing schema-compiled decoders
+
+ALG = CBOR.String("alg")
+KID = CBOR.String("kid")
+
+decode = CBOR.compile_schema(CBOR.SchemaMap()
+    .required(CBOR.Int(1), "string")
+    .required(CBOR.Int(2), "uint32")
+    .optional(CBOR.Int(3), CBOR.SchemaArray("string"))
+    .required(CBOR.Int(4), CBOR.SchemaMap()
+        .required(ALG, "int8")
+        .optional(KID, "bytes"))
+    .optional(CBOR.Int(5), "date_time")
+    .optional(CBOR.Int(6), "float16")
+    .optional(CBOR.Int(7), CBOR.SchemaArray(CBOR.SchemaArray("boolean")))
+    .optional(CBOR.Int(8), "any")
+    .optional(CBOR.Int(-1), "null")
+    .optional(CBOR.Int(-2), "bigint"))
+
+def token():
+  return CBOR.Map()\\
+      .set(CBOR.Int(1), CBOR.String("issuer"))\\
+      .set(CBOR.Int(2), CBOR.Int(1700000000))\\
+      .set(CBOR.Int(4), CBOR.Map().set(ALG, CBOR.Int(-7)))
+
+assert_true("min", decode(token().encode()) == 
+    {1: "issuer", 2: 1700000000, 4: {"alg": -7}})
+
+full = token()\\
+    .set(CBOR.Int(3), CBOR.Array().add(CBOR.String("a")))\\
+    .set(CBOR.Int(5), CBOR.String("2025-01-01T00:00:00Z"))\\
+    .set(CBOR.Int(6), CBOR.Float(2.5))\\
+    .set(CBOR.Int(7), CBOR.Array().add(CBOR.Array())
+                                  .add(CBOR.Array().add(CBOR.Boolean(True))))\\
+    .set(CBOR.Int(8), CBOR.Tag(5, CBOR.Map().set(CBOR.Int(1), CBOR.Null())))\\
+    .set(CBOR.Int(-1), CBOR.Null())\\
+    .set(CBOR.Int(-2), CBOR.Int(-1 << 70))
+full.get(CBOR.Int(4)).set(KID, CBOR.Bytes(bytes([1, 2])))
+result = decode(full.encode())
+assert_true("full1", result[3] == ["a"])
+assert_true("full2", result[4] == {"alg": -7, "kid": bytes([1, 2])})
+assert_true("full3", result[5] == 
+    datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc))
+assert_true("full4", result[6] == 2.5)
+assert_true("full5", result[7] == [[], [True]])
+assert_true("full6", result[8] == CBOR.NativeTag(5, {1: None}))
+assert_true("full7", result[-1] is None)
+assert_true("full8", result[-2] == -1 << 70)
+
+def replaced(key, object):
+  cbor_map = token()
+  cbor_map.update(key, object, False)
+  return cbor_map
+
+def bad(cbor_object, error, cbor=None):
+  try:
+    decode(cbor if cbor else cbor_object.encode())
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad(replaced(CBOR.Int(2), CBOR.Int(-1)), 'Value out of range for "uint32"')
+bad(replaced(CBOR.Int(2), CBOR.String("1")), 
+    "Expected 'CBOR.Int', got 'CBOR.String'")
+bad(replaced(CBOR.Int(1), CBOR.Int(1)), 
+    "Expected 'CBOR.String', got 'CBOR.Int'")
+bad(replaced(CBOR.Int(4), CBOR.Array()), 
+    "Expected 'CBOR.Map', got 'CBOR.Array'")
+bad(replaced(CBOR.Int(3), CBOR.Map()), 
+    "Expected 'CBOR.Array', got 'CBOR.Map'")
+bad(replaced(CBOR.Int(6), CBOR.Float(1.0e+10)), 
+    'Value out of range for "float16"')
+bad(replaced(CBOR.Int(6), CBOR.Float.create_extended_float(float("nan"))), 
+    "Expected 'CBOR.Float', got 'CBOR.NonFinite'")
+# NaN with payload
+for schema, expected in [("float64", "Float"), ("int32", "Int")]:
+  try:
+    CBOR.compile_schema(schema)(CBOR.NonFinite(0x7c01).encode())
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, "Expected 'CBOR." + expected + 
+                       "', got 'CBOR.NonFinite'")
+bad(replaced(CBOR.Int(-1), CBOR.Boolean(False)), 
+    "Expected 'CBOR.Null', got 'CBOR.Boolean'")
+bad(replaced(CBOR.Int(5), CBOR.String("2025")), 'Invalid ISO format')
+bad(replaced(CBOR.Int(9), CBOR.Int(9)), 'Unexpected map key: 9')
+missing = token()
+missing.remove(CBOR.Int(2))
+bad(missing, 'Missing key: 2')
+# Optional entries must not make up for missing required ones
+optional = CBOR.compile_schema(CBOR.SchemaMap()
+    .required(CBOR.Int(1), 'int32')
+    .required(CBOR.Int(2), 'int32')
+    .optional(CBOR.Int(3), 'boolean'))
+try:
+  optional(CBOR.from_diagnostic('{1: 5, 3: true}').encode())
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'Missing key: 2')
+assert_true("optional", optional(CBOR.from_diagnostic('{1: 5, 2: 6}').encode())
+            == {1: 5, 2: 6})
+bad(token(), 'Unexpected data', token().encode() + bytes([0]))
+bad(token(), 'Non-deterministic', bytes.fromhex("a11801f6"))
+bad(token(), 'Non-deterministic order', bytes.fromhex("a20205016161"))
+bad(token(), 'Duplicate key', bytes.fromhex("a2016161016161"))
+bad(token(), 'EOF', token().encode()[:-1])
+
+for schema, error in [("int7", "Unknown schema type"),
+                      (CBOR.SchemaMap().required(CBOR.Int(1), "int8")
+                                       .optional(CBOR.Int(1), "int8"),
+                       "Duplicate key")]:
+  try:
+    CBOR.compile_schema(schema)
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+try:
+  CBOR.SchemaMap().required(1, "int8")
+  fail("Should not")
+except Exception as e:
+  check_exception(e, "CBOR.*")
+
+# Accessors overridden by CBOR.Tag
+instant = CBOR.compile_schema("date_time")(
+    CBOR.Tag(0, CBOR.String("2025-01-01T00:00:00Z")).encode())
+assert_true("tag0", instant == 
+    datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc))
+instant = CBOR.compile_schema("epoch_time")(
+    CBOR.Tag(1, CBOR.Int(1700000000)).encode())
+assert_true("tag1", instant.timestamp() == 1700000000)
+
+assert_true("array", CBOR.compile_schema(CBOR.SchemaArray("int16"))(
+    CBOR.Array().add(CBOR.Int(-300)).encode()) == [-300])
+
+success()
+"""],
+['chunk-sink.py',
+"""
+# Testing chunked delivery of large strings
+
+class Collector(CBOR.ChunkSink):
+  def start(self, text, length):
+    self.text = text
+    self.length = length
+    self.chunks = []
+
+  def write(self, chunk):
+    self.chunks.append(bytes(chunk))
+
+  def finish(self):
+    return CBOR.Int(len(self.chunks))
+
+blob = bytes(range(256)) * 1000
+text = "€" * 50000
+sequence = (CBOR.Array().add(CBOR.Bytes(blob)).add(CBOR.String("small"))
+    .encode() + CBOR.String(text).encode() + CBOR.Bytes(bytes(10)).encode())
+
+for buffer in [True, False]:
+  sink = Collector()
+  decoder = CBOR.init_decoder(sequence if buffer else io.BytesIO(sequence),
+                              CBOR.SEQUENCE_MODE, len(sequence))
+  decoder.set_chunk_sink(sink, 1000, 4096)
+  array = decoder.decode_with_options()
+  assert_true("bin", array.get(0).get_int32() == 63 and not sink.text)
+  assert_true("bindata", b''.join(sink.chunks) == blob and 
+              sink.length == len(blob))
+  assert_true("size", max(len(chunk) for chunk in sink.chunks) == 4096)
+  assert_true("small", array.get(1).get_string() == "small")
+  assert_true("txt", decoder.decode_with_options().get_int32() == 37)
+  assert_true("txtdata", b''.join(sink.chunks).decode() == text and sink.text)
+  assert_true("below", decoder.decode_with_options().get_bytes() == bytes(10))
+  assert_true("end", decoder.decode_with_options() is None)
+
+# Default sink returns null
+decoder = CBOR.init_decoder(CBOR.Bytes(bytes(100)).encode(), 0, 200)
+assert_true("default", decoder.set_chunk_sink(CBOR.ChunkSink(), 100)
+    .decode_with_options().equals(CBOR.Null()))
+
+# Multi-byte characters split between chunks
+split = CBOR.String("a€€").encode()
+for chunk_size in range(1, 8):
+  sink = Collector()
+  CBOR.init_decoder(split, 0, 100).set_chunk_sink(sink, 0, chunk_size)\\
+      .decode_with_options()
+  assert_true("split", b''.join(sink.chunks).decode() == "a€€")
+
+# Invalid UTF-8 is detected, including truncated sequences
+for bad in ["63e282e2", "6361ff62", "6261e2"]:
+  try:
+    CBOR.init_decoder(bytes.fromhex(bad), 0, 100)\\
+        .set_chunk_sink(Collector(), 0, 2).decode_with_options()
+    fail("utf8")
+  except Exception as e:
+    check_exception(e, "UnicodeDecodeError('utf-8'")
+
+# Map keys are never passed to the sink
+key = "k" * 2000
+cbor_map = CBOR.Map().set(CBOR.String(key), CBOR.Bytes(bytes(2000)))\\
+    .set(CBOR.Array().add(CBOR.Bytes(bytes(3000))), CBOR.String(key))
+cbor = cbor_map.encode()
+cache = CBOR.KeyCache()
+for options, cbor_input in [(0, cbor), (0, io.BytesIO(cbor)), 
+                            (CBOR.LAZY_DECODING, cbor)]:
+  for q in range(2):
+    decoder = CBOR.init_decoder(cbor_input, options, len(cbor))
+    if options == 0 and not isinstance(cbor_input, io.BytesIO):
+      decoder.set_key_cache(cache)
+    if q == 0:
+      decoder.set_chunk_sink(Collector(), 1000)
+    decoded = decoder.decode_with_options()
+    if isinstance(cbor_input, io.BytesIO):
+      cbor_input.seek(0)
+    keys = decoded.get_keys()
+    assert_true("key", keys[0].get_string() == key and 
+                keys[1].get(0).get_bytes() == bytes(3000))
+    values = [decoded.get(key) for key in keys]
+    if q == 0:
+      assert_true("sunk", values[0].get_int32() == 1 and 
+                  values[1].get_int32() == 1)
+    else:
+      assert_true("nosink", decoded.encode() == cbor)
+
+# Big integers and the contents of verified tags are not passed either
+big = 1 << 80
+cotx_id = "https://example.com/" + "x" * 100
+cbor = CBOR.Array()\\
+    .add(CBOR.Int(big))\\
+    .add(CBOR.Int(-big))\\
+    .add(CBOR.Tag(CBOR.Tag.TAG_DATE_TIME,
+                  CBOR.String("2025-01-01T00:00:00Z")))\\
+    .add(CBOR.Tag(CBOR.Tag.TAG_EPOCH_TIME, CBOR.Int(1700000000)))\\
+    .add(CBOR.Tag(CBOR.Tag.TAG_COTX,
+                  CBOR.Array().add(CBOR.String(cotx_id))
+                              .add(CBOR.Bytes(bytes(20)))))\\
+    .add(CBOR.Tag(8, CBOR.String("tagged"))).encode()
+for options, cbor_input in [(0, cbor), (0, io.BytesIO(cbor)), 
+                            (CBOR.LAZY_DECODING, cbor)]:
+  decoded = CBOR.init_decoder(cbor_input, options, len(cbor))\\
+      .set_chunk_sink(Collector(), 0).decode_with_options()
+  assert_true("bigint", decoded.get(0).get_bigint() == big and
+              decoded.get(1).get_bigint() == -big)
+  assert_true("date", decoded.get(2).get_date_time().year == 2025)
+  assert_true("epoch", decoded.get(3).get_epoch_time().year == 2023)
+  cotx = decoded.get(4).get()
+  assert_true("cotx", cotx.get(0).get_string() == cotx_id and
+              cotx.get(1).get_int32() == 1)
+  assert_true("tag", decoded.get(5).get().get_int32() == 1)
+
+# Arguments
+for sink, threshold, chunk_size, error in [
+    ("sink", 0, 1, "Expected 'CBOR.ChunkSink' argument, got 'str'"),
+    (Collector(), 0, 0, "Invalid chunk size: 0"),
+    (Collector(), 1.0, 1, "Expected 'int', got 'float'")]:
+  try:
+    CBOR.init_decoder(bytes(1), 0, 10).set_chunk_sink(sink, threshold, 
+                                                      chunk_size)
+    fail("arg")
+  except Exception as e:
+    check_exception(e, error)
+
+class Bad(CBOR.ChunkSink):
+  def finish(self):
+    return "text"
+
+try:
+  CBOR.init_decoder(CBOR.Bytes(bytes(5)).encode(), 0, 10)\\
+      .set_chunk_sink(Bad(), 0).decode_with_options()
+  fail("finish")
+except Exception as e:
+  check_exception(e, "Expected CBOR.* argument, got 'str'")
+
+success()
+"""],
+['decoder-stats.py',
+"""
+# Testing decoder statistics and limit hooks
+
+class Recorder(CBOR.DecoderStats):
+  def __init__(self):
+    super().__init__()
+    self.limits = []
+
+  def on_limit(self, limit, value):
+    self.limits.append((limit, value))
+
+# [1, -2, h'01', "s", [], {1: 1(1.5)}, 2^70, true]
+cbor = CBOR.from_diagnostic('[1, -2, h\\'01\\', "s", [], {1: 1(1.5)}, ' +
+                            '1180591620717411303424, true]').encode()
+
+for buffer in [True, False]:
+  stats = Recorder()
+  decoder = CBOR.init_decoder(cbor if buffer else io.BytesIO(cbor), 
+                              CBOR.SEQUENCE_MODE, 1000).set_stats(stats)
+  decoder.decode_with_options()
+  assert_true("end", decoder.decode_with_options() is None)
+  counts = [stats.get_object_count(major_type) for major_type in range(8)]
+  assert_true("counts", counts == [2, 1, 2, 1, 2, 1, 2, 2])
+  assert_true("bytes", stats.get_byte_count() == len(cbor))
+  assert_true("depth", stats.get_max_depth() == 3)
+  assert_true("calls", stats.get_decode_count() == 2)
+  assert_true("time", stats.get_decode_time() >= stats.get_last_decode_time()
+              and stats.get_last_decode_time() >= 0)
+  assert_true("nolimit", not stats.limits)
+
+  # Accumulated over decoders
+  CBOR.init_decoder(bytes.fromhex("8180"), 0, 10).set_stats(stats)\\
+      .decode_with_options()
+  assert_true("acc", stats.get_object_count(4) == 4 and
+              stats.get_byte_count() == len(cbor) + 2)
+  assert_true("clear", stats.clear().get_object_count(4) == 0 and
+              stats.get_max_depth() == 0)
+  CBOR.init_decoder(bytes.fromhex("8180"), 0, 10).set_stats(stats)\\
+      .decode_with_options()
+  assert_true("shared", stats.get_object_count(4) == 2 and 
+              stats.get_max_depth() == 2)
+
+# Limits
+for cbor, max_length, max_level, limit in [
+    ("818181818100", 100, 3, ("max_nesting_level", 3)),
+    ("4a00000000000000000000", 5, 100, ("max_length", 5)),
+    ("8181818100", 4, 100, ("max_length", 4))]:
+  for buffer in [True, False]:
+    stats = Recorder()
+    cbor_bytes = bytes.fromhex(cbor)
+    try:
+      CBOR.init_decoder(cbor_bytes if buffer else io.BytesIO(cbor_bytes), 0, 
+                        max_length).set_max_nesting_level(max_level)\\
+          .set_stats(stats).decode_with_options()
+      fail("limit")
+    except Exception as e:
+      pass
+    assert_true("hook", stats.limits == [limit])
+    assert_true("failed", stats.get_decode_count() == 1)
+
+# Incremental decoders use the same limit checks
+async def decode_async(cbor_bytes, max_length, max_level, stats):
+  reader = asyncio.StreamReader()
+  reader.feed_data(cbor_bytes)
+  reader.feed_eof()
+  await CBOR.init_async_decoder(reader, 0, max_length)\\
+      .set_max_nesting_level(max_level).set_stats(stats).decode_with_options()
+
+for cbor, max_length, max_level, limit, error in [
+    ("818181818100", 100, 3, ("max_nesting_level", 3), 
+     "Structure nesting level exceeding: 3"),
+    ("4a00000000000000000000", 5, 100, ("max_length", 5),
+     "Exceeded set limit: max_length=5")]:
+  for push in [True, False]:
+    stats = Recorder()
+    cbor_bytes = bytes.fromhex(cbor)
+    try:
+      if push:
+        CBOR.init_push_decoder(0, max_length).set_max_nesting_level(max_level)\\
+            .set_stats(stats).feed(cbor_bytes)
+      else:
+        asyncio.run(decode_async(cbor_bytes, max_length, max_level, stats))
+      fail("incremental")
+    except Exception as e:
+      check_exception(e, error)
+    assert_true("inchook", stats.limits == [limit])
+stats = CBOR.DecoderStats()
+CBOR.init_push_decoder(CBOR.SEQUENCE_MODE, 100).set_stats(stats)\\
+    .feed(bytes.fromhex("8180820102"))
+assert_true("inccount", stats.get_decode_count() == 2 and 
+            stats.get_object_count(4) == 3 and stats.get_byte_count() == 5)
+
+# Keys served by a key cache are counted as well
+cbor = CBOR.from_diagnostic('{1: 2, "a": 3}').encode()
+stats = CBOR.DecoderStats()
+decoder = CBOR.init_decoder(cbor, 0, 100).set_key_cache(CBOR.KeyCache())\\
+    .set_stats(stats)
+for q in range(2):
+  decoder.reset(cbor).decode_with_options()
+  assert_true("cached", [stats.get_object_count(major_type) 
+      for major_type in range(8)] == [3, 0, 0, 1, 0, 1, 0, 0])
+  stats.clear()
+
+# Disabling restores the class dispatch table
+decoder = CBOR.init_decoder(bytes(1), 0, 10).set_stats(CBOR.DecoderStats())
+assert_true("table", "_DISPATCH" in decoder.__dict__)
+decoder.set_stats(None).reset(bytes(1)).decode_with_options()
+assert_true("restored", "_DISPATCH" not in decoder.__dict__)
+
+for argument, error in [(5, "Expected 'CBOR.DecoderStats' argument, got 'int'")]:
+  try:
+    decoder.set_stats(argument)
+    fail("arg")
+  except Exception as e:
+    check_exception(e, error)
+try:
+  CBOR.DecoderStats().get_object_count(8)
+  fail("major")
+except Exception as e:
+  check_exception(e, "Invalid major type: 8")
+
+success()
+"""],
+['encode-to.py',
+"""
+# Testing streamed encoding
+
+class Recorder(io.BytesIO):
+  def __init__(self):
+    super().__init__()
+    self.sizes = []
+
+  def write(self, data):
+    self.sizes.append(len(data))
+    return super().write(data)
+
+document = CBOR.Map()
+for i in range(200):
+  document.set(CBOR.Int(i), CBOR.Array()
+      .add(CBOR.String("value-{:d}".format(i)))
+      .add(CBOR.Float(i + 0.5))
+      .add(CBOR.Tag(9999, CBOR.Bytes(bytes(i))))
+      .add(CBOR.Boolean(i & 1 == 0))
+      .add(CBOR.Null()))
+document.set(CBOR.String("blob"), CBOR.Bytes(bytes(5000)))
+cbor = document.encode()
+
+for chunk_size in [1, 100, 1024, 0x10000]:
+  stream = Recorder()
+  assert_true("count", document.encode_to(stream, chunk_size) == len(cbor))
+  assert_true("data", stream.getvalue() == cbor)
+  # Chunks are bounded, except for large strings written as they are
+  assert_true("sizes", all(size < chunk_size + 256 or size == 5000
+                           for size in stream.sizes))
+stream = Recorder()
+document.encode_to(stream, 1024)
+assert_true("blob", 5000 in stream.sizes)
+# Objects encoded by single bytes
+nulls = CBOR.Array()
+for i in range(100000):
+  nulls.add(CBOR.Null())
+stream = Recorder()
+nulls.encode_to(stream, 1000)
+assert_true("leaves", max(stream.sizes) <= 1000 and 
+            stream.getvalue() == nulls.encode())
+stream = Recorder()
+CBOR.Int(5).encode_to(stream)
+assert_true("small", stream.getvalue() == bytes([5]) and stream.sizes == [1])
+
+# Zero-copy and lazy input
+for options in [CBOR.ZERO_COPY_DECODING, CBOR.LAZY_DECODING]:
+  stream = io.BytesIO()
+  CBOR.init_decoder(bytes(cbor), options, len(cbor))\\
+      .decode_with_options().encode_to(stream, 64)
+  assert_true("decoded", stream.getvalue() == cbor)
+
+# Sequences
+stream = Recorder()
+writer = CBOR.init_sequence_writer(stream, 1000)
+sequence = bytearray()
+for i in range(100):
+  cbor_object = CBOR.Array().add(CBOR.Int(i)).add(CBOR.String("x" * i))
+  writer.write(cbor_object)
+  sequence += cbor_object.encode()
+assert_true("pending", writer.get_byte_count() == len(sequence))
+assert_true("written", len(stream.getvalue()) < len(sequence))
+writer.flush()
+assert_true("seq", stream.getvalue() == sequence)
+assert_true("seqsizes", max(stream.sizes) < 2000)
+assert_true("decode", [cbor_object.encode() for cbor_object in 
+    CBOR.decode_sequence(stream.getvalue())] == 
+    [cbor_object.encode() for cbor_object in CBOR.decode_sequence(sequence)])
+
+for stream, chunk_size, error in [
+    (bytearray(), 100, "Unexpected stream type: bytearray"),
+    (io.BytesIO(), 0, "Invalid chunk size: 0"),
+    (io.BytesIO(), "10", "Expected 'int', got 'str'")]:
+  try:
+    CBOR.Int(1).encode_to(stream, chunk_size)
+    fail("arg")
+  except Exception as e:
+    check_exception(e, error)
+try:
+  CBOR.init_sequence_writer(io.BytesIO()).write(5)
+  fail("seqarg")
+except Exception as e:
+  check_exception(e, "Expected CBOR.* argument, got 'int'")
+
+success()
+"""],
+['freeze.py',
+"""
+# Testing frozen objects and their cached encoding
+
+def static_part():
+  cbor_map = CBOR.Map()
+  for i in range(50):
+    cbor_map.set(CBOR.String("key{:d}".format(i)), CBOR.Array()
+        .add(CBOR.Int(i)).add(CBOR.Tag(500, CBOR.Map()
+            .set(CBOR.Int(1), CBOR.Float(i + 0.5)))))
+  return cbor_map
+
+static = static_part()
+expected = static.encode()
+assert_true("same", static.freeze() is static)
+assert_true("enc", static.encode() == expected)
+assert_true("cached", static._encoding == expected)
+tag = static.get(CBOR.String("key7")).get(1)
+assert_true("nested", tag._encoding is not None and 
+            tag.get()._encoding is not None)
+assert_true("equals", static.equals(static_part()))
+clone = static.clone()
+assert_true("clone", clone.encode() == expected and clone._encoding is None)
+clone.set(CBOR.Int(0), CBOR.Null())
+
+# Mutable container holding frozen parts
+response = CBOR.Map().set(CBOR.Int(1), static)
+for counter in range(3):
+  response.update(CBOR.Int(2), CBOR.Int(counter), False)
+  assert_true("resp", response.encode() == CBOR.Map()
+      .set(CBOR.Int(1), static_part())
+      .set(CBOR.Int(2), CBOR.Int(counter)).encode())
+
+# Frozen objects cannot be changed
+def frozen(operation):
+  try:
+    operation()
+    fail("frozen")
+  except Exception as e:
+    check_exception(e, "Frozen objects are immutable")
+
+frozen(lambda: static.set(CBOR.Int(5), CBOR.Int(6)))
+frozen(lambda: static.remove(CBOR.String("key0")))
+frozen(lambda: static.update(CBOR.String("key0"), CBOR.Int(6)))
+frozen(lambda: static.merge(CBOR.Map()))
+frozen(lambda: static.get(CBOR.String("key1")).add(CBOR.Int(6)))
+frozen(lambda: static.get(CBOR.String("key1")).update(0, CBOR.Int(6)))
+frozen(lambda: tag.get().set(CBOR.Int(2), CBOR.Int(6)))
+infinity = CBOR.Array().add(CBOR.Float.create_extended_float(float("inf")))
+infinity.freeze()
+frozen(lambda: infinity.get(0).set_sign(True))
+assert_true("sign", infinity.encode().hex() == "81f97c00" and
+            str(infinity.get(0)) == "Infinity")
+try:
+  CBOR.Map().set(CBOR.Array(), CBOR.Int(1)).get_keys()[0].add(CBOR.Int(1))
+  fail("key")
+except Exception as e:
+  check_exception(e, "Map keys are immutable")
+
+# Lazily decoded and primitive objects
+lazy = CBOR.decode_lazy(expected).freeze()
+assert_true("lazy", lazy.encode() == expected and lazy._encoding == expected)
+assert_true("leaf", CBOR.Int(5).freeze().encode() == bytes([5]))
 
 success()
 """],
@@ -848,6 +2297,32 @@ nest(None, 101, False)
 nest(2, 2, True)
 nest(2, 3, False)
 
+# Deeper than the Python recursion limit
+levels = 5000
+cbor = bytes([0x81] * (levels - 1) + [0x80])
+deep = CBOR.init_decoder(io.BytesIO(cbor), 0, 10000)\\
+    .set_max_nesting_level(levels).decode_with_options()
+object = deep
+while object.length:
+  object = object.get(0)
+  levels -= 1
+assert_true("deep", levels == 1)
+# Encoding and printing are recursive and not covered by the limit
+for method in [lambda: deep.encode(), lambda: deep.to_string(),
+               lambda: deep.clone(), lambda: deep.equals(deep),
+               lambda: deep.encode_to(io.BytesIO())]:
+  try:
+    method()
+    fail("recursion")
+  except Exception as e:
+    check_exception(e, "Nesting exceeds the Python recursion limit")
+object = CBOR.init_decoder(
+    bytes([0xd8, 0x40] * 3000 + [0xc2, 0x49, 1] + [0] * 8), 0, 10000)\\
+    .set_max_nesting_level(3000).decode_with_options()
+while type(object).__name__ == "Tag":
+  object = object.get()
+assert_true("bigint", object.get_bigint() == 1 << 64)
+
 success()
 """],
 ['base64url.py',
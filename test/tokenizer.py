@@ -0,0 +1,81 @@
+# Testing the tokenizer
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+cbor = CBOR.from_diagnostic('''{
+  1: [5, -3, 18446744073709551616, 2.5, "hi", h'0102', true, null, simple(99)],
+  2: 1010(["a", {}]),
+  3: [],
+  4: [NaN, -Infinity]
+}''').encode()
+
+T = CBOR
+expected = [
+  (T.TOKEN_START_MAP, 4),
+  (T.TOKEN_INT, 1), (T.TOKEN_START_ARRAY, 9),
+    (T.TOKEN_INT, 5), (T.TOKEN_INT, -3), (T.TOKEN_INT, 18446744073709551616),
+    (T.TOKEN_FLOAT, 2.5), (T.TOKEN_STRING, "hi"), (T.TOKEN_BYTES, bytes([1, 2])),
+    (T.TOKEN_BOOLEAN, True), (T.TOKEN_NULL, None), (T.TOKEN_SIMPLE, 99),
+  (T.TOKEN_END, None),
+  (T.TOKEN_INT, 2), (T.TOKEN_TAG, 1010), (T.TOKEN_START_ARRAY, 2),
+    (T.TOKEN_STRING, "a"), (T.TOKEN_START_MAP, 0), (T.TOKEN_END, None),
+  (T.TOKEN_END, None),
+  (T.TOKEN_INT, 3), (T.TOKEN_START_ARRAY, 0), (T.TOKEN_END, None),
+  (T.TOKEN_INT, 4), (T.TOKEN_START_ARRAY, 2),
+    (T.TOKEN_NON_FINITE, 0x7e00), (T.TOKEN_NON_FINITE, 0xfc00),
+  (T.TOKEN_END, None),
+  (T.TOKEN_END, None)]
+
+for input in [cbor, io.BytesIO(cbor)]:
+  tokens = list(CBOR.init_tokenizer(input, 0, 1000))
+  assert_true("tokens", tokens == expected)
+
+# Sequences
+sequence = bytes([0x05, 0x81, 0x06, 0x07])
+tokenizer = CBOR.init_tokenizer(sequence, CBOR.SEQUENCE_MODE, 1000)
+assert_true("seq", list(tokenizer) == [(T.TOKEN_INT, 5), (T.TOKEN_START_ARRAY, 1),
+                                       (T.TOKEN_INT, 6), (T.TOKEN_END, None),
+                                       (T.TOKEN_INT, 7)])
+assert_true("seqc", tokenizer.get_byte_count() == 4)
+assert_true("seqe", list(CBOR.init_tokenizer(bytes(), CBOR.SEQUENCE_MODE, 10)) == [])
+
+def bad_tokens(hex, error, options=0):
+  try:
+    list(CBOR.init_tokenizer(bytes.fromhex(hex), options, 100))
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+bad_tokens('1817', 'Non-deterministically encoded primitive')
+bad_tokens('fb3ff0000000000000', 'Non-deterministically encoded "float"')
+bad_tokens('fa3f800000', 'Non-deterministically encoded "float"')
+bad_tokens('fa7fc00000', 'Non-deterministically encoded "float"')
+bad_tokens('c2480100000000000000', 'Non-deterministically encoded "bigint"')
+bad_tokens('c201', "Expected 'CBOR.Bytes'")
+bad_tokens('f818', 'Simple value out of range')
+bad_tokens('8201', 'EOF')
+bad_tokens('0101', 'Unexpected data')
+bad_tokens('1c', 'Unsupported tag')
+
+# Lenient mode normalizes as the decoder does
+tokens = list(CBOR.init_tokenizer(bytes.fromhex('82fb3ff0000000000000fa7fc00000'), 
+                                  CBOR.LENIENT_NUMBER_DECODING, 100))
+assert_true("lenient", tokens == [(T.TOKEN_START_ARRAY, 2), (T.TOKEN_FLOAT, 1.0), 
+                                  (T.TOKEN_NON_FINITE, 0x7e00), (T.TOKEN_END, None)])
+
+# Nesting is limited, but not by the interpreter's recursion limit
+def nested(levels):
+  return bytes([0x81] * (levels - 1) + [0x80])
+
+try:
+  list(CBOR.init_tokenizer(nested(3), 0, 100).set_max_nesting_level(2))
+  fail("Should not")
+except Exception as e:
+  check_exception(e, 'nesting level')
+count = 0
+for token in CBOR.init_tokenizer(nested(5000), 0, 10000).set_max_nesting_level(5000):
+  count += 1
+assert_true("deep", count == 10000)
+
+success()
@@ -0,0 +1,63 @@
+# Testing validation without decoding
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+
+def outcome(function):
+  try:
+    function()
+    return None
+  except Exception as e:
+    return repr(e)
+
+# The validator must agree with the decoder
+def compare(hex, options=0):
+  cbor = bytes.fromhex(hex)
+  expected = outcome(lambda: CBOR.init_decoder(cbor, options, len(cbor)).decode_with_options())
+  actual = outcome(lambda: CBOR.validate(cbor, options))
+  if (expected is None) != (actual is None):
+    fail(hex + " " + str(expected) + " " + str(actual))
+  return actual
+
+LENIENT = CBOR.LENIENT_MAP_DECODING | CBOR.LENIENT_NUMBER_DECODING
+
+valid = [
+  'a5 01 d9 01 f4 81 18 2d 02 f9 80 10 04 64 53 75 72 65 05 a2 08 69 59 65 0a 01 61 68 e2 82 ac' +
+  '09 85 66 42 79 74 65 73 21 45 01 02 03 04 05 f5 f4 f6 06 c2 4b 66 1e fd f2 e3 b1 9f 7c 04 5f 15',
+  'a3 01 80 61 61 a0 81 01 f6',
+  'a2 a1 01 02 03 a1 01 03 04',
+  'c0 74 32 30 32 35 2d 30 31 2d 30 31 54 31 30 3a 30 30 3a 30 30 5a',
+  'c1 1a 5f 5e 10 00',
+  'd9 03 f2 82 63 61 62 63 a0',
+  'f9 7e 00', 'fa 47 80 00 00', 'fb 7f ef ff ff ff ff ff ff', 'f8 20', 'c3 49 01 00 00 00 00 00 00 00 00'
+]
+invalid = [
+  '18 17', '19 00 ff', 'f8 17', 'f8 18', 'fa 3f 80 00 00', 'fb 3f f0 00 00 00 00 00 00',
+  'fa 7f c0 00 00', 'fb 7f f8 00 00 00 00 00 00', 'c2 48 01 00 00 00 00 00 00 00', 'c2 01',
+  'a2 02 00 01 00', 'a2 01 00 01 00', 'a2 a1 01 03 03 a1 01 02 04', 'a2 18 18 00 02 00',
+  'c0 63 61 62 63', 'c1 3a 00 00 00 01', 'd9 03 f2 81 01', 'd8 02 40',
+  '62 ff fe', '82 01', '81 01 01', '1c', 'ff', '5f', '59 01 00', ''
+]
+for hex in valid:
+  assert_true("valid " + hex, compare(hex) is None)
+for hex in invalid:
+  assert_false("invalid " + hex, compare(hex) is None)
+# Lenient modes
+for hex in ['a2 02 00 01 00', '18 17', 'fa 3f 80 00 00', 'a2 18 18 00 02 00', 'c2 48 01 00 00 00 00 00 00 00']:
+  assert_true("lenient " + hex, compare(hex, LENIENT) is None)
+for hex in ['a2 01 00 01 00', 'a2 01 00 18 01 00', 'a2 81 01 00 81 18 01 00']:
+  check_exception(compare(hex, LENIENT), 'Duplicate key')
+
+# Nesting
+deep = bytes([0x81] * 100 + [0x80])
+check_exception(outcome(lambda: CBOR.validate(deep, 0)), 'nesting level')
+assert_true("deep", outcome(lambda: CBOR.validate(deep[1:], 0)) is None)
+
+# Sequences
+sequence = bytes.fromhex('05 a1 05 42 6a 6a')
+CBOR.validate(sequence, CBOR.SEQUENCE_MODE)
+CBOR.validate(bytes(), CBOR.SEQUENCE_MODE)
+CBOR.validate(memoryview(sequence)[1:], 0)
+check_exception(outcome(lambda: CBOR.validate(sequence, 0)), 'Unexpected data')
+check_exception(outcome(lambda: CBOR.validate(sequence + bytes([0x18]), CBOR.SEQUENCE_MODE)), 'EOF')
+
+success()
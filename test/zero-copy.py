@@ -0,0 +1,56 @@
+# Testing zero-copy decoding
+from org.webpki.cbor import CBOR
+from assertions import assert_true, assert_false, fail, success, check_exception
+import io
+
+payload = bytes(range(256)) * 4
+cbor = CBOR.Map().set(CBOR.Int(1), CBOR.String("Hi!"))\
+                 .set(CBOR.Int(2), CBOR.Bytes(payload))\
+                 .set(CBOR.String("å€"), 
+                      CBOR.Array().add(CBOR.String("€"))).encode()
+
+for buffer in [bytes(cbor), bytearray(cbor), memoryview(cbor)]:
+  object = CBOR.init_decoder(buffer, 
+                             CBOR.ZERO_COPY_DECODING, 
+                             len(cbor)).decode_with_options()
+  assert_true("zc1", object.encode() == cbor)
+  byte_string = object.get(CBOR.Int(2)).get_bytes()
+  assert_true("zc2", type(byte_string) == memoryview)
+  assert_true("zc3", byte_string == payload)
+  assert_true("zc4", byte_string.obj is 
+      (buffer.obj if type(buffer) == memoryview else buffer))
+  text_string = object.get(CBOR.Int(1))
+  assert_false("zc5", "_string" in text_string.__dict__)
+  assert_true("zc6", text_string.get_string() == "Hi!")
+  assert_true("zc7", text_string.get_string() == "Hi!")
+  assert_true("zc8", object.get(CBOR.String("å€"))
+                           .get(0).get_string() == "€")
+  assert_true("zc9", object.to_string() == CBOR.decode(cbor).to_string())
+  assert_true("zc10", object.clone().encode() == cbor)
+  object.check_for_unread()
+  # Byte strings can be reused as they are
+  copy = CBOR.Bytes(byte_string)
+  assert_true("zc11", copy.get_bytes() == payload and
+              copy.equals(object.get(CBOR.Int(2))))
+  assert_true("zc12", CBOR.decode(CBOR.Array().add(copy).encode())
+              .get(0).get_bytes() == payload)
+
+# Big numbers are based on byte strings as well
+big = CBOR.Int(-0x1234567890abcdef1234567890).encode()
+assert_true("big", CBOR.init_decoder(big, CBOR.ZERO_COPY_DECODING, 100)
+    .decode_with_options().get_bigint() == -0x1234567890abcdef1234567890)
+
+def bad_decode(cbor, options, error):
+  try:
+    CBOR.init_decoder(cbor, options, 100).decode_with_options()
+    fail("Should not")
+  except Exception as e:
+    check_exception(e, error)
+
+# Invalid UTF-8 must still be detected
+bad_decode(bytes([0x62, 0xc3, 0x28]), CBOR.ZERO_COPY_DECODING, 'invalid')
+bad_decode(bytes([0x81, 0x61, 0xff]), CBOR.ZERO_COPY_DECODING, 'invalid')
+bad_decode(bytes([0x45, 0x01]), CBOR.ZERO_COPY_DECODING, 'EOF')
+bad_decode(io.BytesIO(cbor), CBOR.ZERO_COPY_DECODING, 'buffer input')
+
+success()